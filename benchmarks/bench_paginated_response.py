@@ -0,0 +1,75 @@
+"""
+Per page validation cost of a paginated response
+
+Compares validating a page of customer reports the way the resources used to (``json.loads`` and
+``PaginatedResponse[CustomerReportEntity](**page)``) with the module level page type and the cached type adapter
+that validates the raw response body (:meth:`~icometrix_sdk.utils.api_client.ApiClient.get_as`), and with skipping
+the validation of the entities (``raw=True``).
+
+Usage: python benchmarks/bench_paginated_response.py [--page-size 100] [--repeat 5]
+"""
+import argparse
+import json
+import timeit
+import uuid
+
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity, CustomerReportPage
+from icometrix_sdk.utils.json_parser import parse_json_as, raw_as, loads
+
+
+def create_page(page_size: int) -> bytes:
+    results = []
+    for i in range(page_size):
+        report_id = str(uuid.uuid4())
+        results.append({
+            "id": report_id,
+            "uri": f"/customer-reports-service/api/v2/customer-reports/{report_id}",
+            "update_timestamp": "2024-03-01T10:11:12.123456",
+            "creation_timestamp": "2024-03-01T09:00:00.000000",
+            "status": "Finished",
+            "study_id": str(uuid.uuid4()),
+            "patient_id": str(uuid.uuid4()),
+            "project_id": str(uuid.uuid4()),
+            "study_date": "20240301",
+            "project_name": "Benchmark",
+            "report_files": [{"uri": f"/files/{report_id}/{n}", "name": f"report_{n}.pdf", "type": "pdf"}
+                             for n in range(3)],
+            "project_country": "BE",
+            "study_instance_uid": f"1.2.826.0.1.3680043.8.498.{i}",
+            "icobrain_report_type": "icobrain_ms",
+        })
+    page = {"meta_data": {"result_set": {"count": page_size * 10, "offset": 0, "limit": page_size}},
+            "results": results}
+    return json.dumps(page).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = create_page(args.page_size)
+    cases = {
+        "PaginatedResponse[T](**json.loads(body))":
+            lambda: PaginatedResponse[CustomerReportEntity](**json.loads(content)),
+        "CustomerReportPage(**json.loads(body))":
+            lambda: CustomerReportPage(**json.loads(content)),
+        "parse_json_as(body, CustomerReportPage)":
+            lambda: parse_json_as(content, CustomerReportPage),
+        "raw_as(loads(body), CustomerReportPage)":
+            lambda: raw_as(loads(content), CustomerReportPage),
+        "PaginatedResponse[T] (parametrisation only)":
+            lambda: PaginatedResponse[CustomerReportEntity],
+    }
+
+    print(f"Page of {args.page_size} customer reports ({len(content) / 1024:.0f} KiB)")
+    for name, func in cases.items():
+        number, _ = timeit.Timer(func).autorange()
+        best = min(timeit.repeat(func, number=number, repeat=args.repeat)) / number
+        print(f"{name:<48} {best * 1e6:>10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cost of parsing the backend timestamps of an entity
+
+Compares the strptime based parser that was used before with
+:func:`~icometrix_sdk.models.base.utc_datetime_parser`, per timestamp format and for a page of customer reports.
+
+Usage: python benchmarks/bench_utc_datetime.py [--repeat 5]
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone
+
+from bench_paginated_response import create_page
+from icometrix_sdk.models.base import utc_datetime_parser
+from icometrix_sdk.models.customer_report_entity import CustomerReportPage
+from icometrix_sdk.utils.json_parser import parse_json_as
+
+TIMESTAMPS = [
+    "2024-01-02T03:04:05.123456",
+    "2024-01-02T03:04:05.123+02:00",
+    "2024-01-02T03:04:05.1",
+]
+
+
+def strptime_utc_datetime_parser(v):
+    if not v:
+        return None
+    if isinstance(v, datetime):
+        return v.replace(tzinfo=timezone.utc)
+
+    datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
+    if "+" in v:
+        datetime_format = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+    input_datetime = datetime.strptime(v, datetime_format)
+    return input_datetime.replace(tzinfo=timezone.utc)
+
+
+def best_time(func, repeat: int) -> float:
+    number, _ = timeit.Timer(func).autorange()
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'timestamp':<36} {'strptime':>12} {'fromisoformat':>14}")
+    for timestamp in TIMESTAMPS:
+        before = best_time(lambda: strptime_utc_datetime_parser(timestamp), args.repeat)
+        after = best_time(lambda: utc_datetime_parser(timestamp), args.repeat)
+        print(f"{timestamp:<36} {before * 1e6:>9.2f} us {after * 1e6:>11.2f} us")
+
+    content = create_page(100)
+    page = best_time(lambda: parse_json_as(content, CustomerReportPage), args.repeat)
+    print(f"\nPage of 100 customer reports: {page * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from typing import Optional
 from icometrix_sdk.authentication import PasswordAuthentication, AuthenticationMethod, get_auth_method
 from icometrix_sdk.exceptions import IcometrixConfigException
 from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity
 from icometrix_sdk.models.upload_entity import StartUploadDto
 from icometrix_sdk.resources.customer_reports import CustomerReports
 from icometrix_sdk.resources.customer_results import CustomerResults
@@ -101,7 +102,7 @@ class IcometrixApi:
         :return:
         """
         # Get the project, to make sure its there (will throw a 404 in case the project is not found)
-        project = self.projects.get_one_by_id(project_id)
+        project = self.projects.get_one_by_id(project_id, raw=False)
 
         # Upload a directory of DICOMs
         upload = self.uploads.upload_dicom_dir(project.id, input_dir, params)
@@ -114,22 +115,22 @@ class IcometrixApi:
             raise Exception(f"Upload failed: {', '.join(upload.errors)}")
 
         # Get imported studies
-        studies_in_upload = self.uploads.get_studies_for_upload(upload_folder_uri=upload.folder_uri)
+        studies_in_upload = self.uploads.get_studies_for_upload(upload_folder_uri=upload.folder_uri, raw=False)
         if not studies_in_upload:
             raise Exception("No valid studies uploaded.")
 
-        for study_in_upload in studies_in_upload:
+        # Find the studies
+        studies = [result.value for result in self.studies.get_many(studies_in_upload, raw=False)]
 
-            # Find the study
-            study = self.studies.get_one(study_in_upload.project_id,
-                                         study_in_upload.patient_id,
-                                         study_in_upload.study_id)
+        # Get reports for these studies
+        customer_reports = [customer_report
+                            for result in self.customer_reports.get_all_for_studies([study.uri for study in studies],
+                                                                                    raw=False)
+                            for customer_report in result.value]
 
-            # Get reports for this study
-            customer_reports = self.customer_reports.get_all_for_study(study_uri=study.uri)
+        # Wait for the reports to finish and download the results as soon as a report is finished
+        def download(customer_report: CustomerReportEntity):
+            out_path = os.path.join(out_dir, customer_report.id)
+            self.customer_reports.download_customer_report_files(customer_report, out_path)
 
-            # Wait for the reports to finish and download the results
-            finished_customer_reports = self.customer_reports.wait_for_results(list(customer_reports))
-            for customer_report in finished_customer_reports:
-                out_path = os.path.join(out_dir, customer_report.id)
-                self.customer_reports.download_customer_report_files(customer_report, out_path)
+        self.customer_reports.wait_for_results(customer_reports, on_finished=download)
@@ -0,0 +1,131 @@
+"""An asyncio interface to the Icometrix API"""
+import asyncio
+import os
+from typing import Optional
+
+from icometrix_sdk.aio.resources.customer_reports import AsyncCustomerReports
+from icometrix_sdk.aio.resources.customer_results import AsyncCustomerResults
+from icometrix_sdk.aio.resources.patients import AsyncPatients
+from icometrix_sdk.aio.resources.pipeline_results import AsyncPipelineResults
+from icometrix_sdk.aio.resources.profile import AsyncProfile
+from icometrix_sdk.aio.resources.projects import AsyncProjects
+from icometrix_sdk.aio.resources.series import AsyncSeries
+from icometrix_sdk.aio.resources.studies import AsyncStudies
+from icometrix_sdk.aio.resources.uploads import AsyncUploads
+from icometrix_sdk.authentication import get_auth_method
+from icometrix_sdk.exceptions import IcometrixConfigException
+from icometrix_sdk.models.upload_entity import StartUploadDto
+from icometrix_sdk.utils.api_client import AsyncApiClient
+from icometrix_sdk.utils.httpx_api_client import HttpxApiClient
+from icometrix_sdk.utils.regions import Region
+
+
+def get_async_api_client(http2: bool = False) -> HttpxApiClient:
+    """
+    Create an HttpxApiClient with the 'API_HOST' environment variable as server
+    """
+
+    region = os.getenv("REGION")
+    if region in Region:
+        api_host = Region[region].value
+    else:
+        api_host = os.getenv("API_HOST")
+
+    if not api_host:
+        raise IcometrixConfigException("Please set the 'API_HOST' environment variable")
+
+    auth_method = get_auth_method()
+    return HttpxApiClient(api_host, auth_method, http2=http2)
+
+
+class AsyncIcometrixApi:
+    """
+    An asyncio interface for the icometrix API, see :class:`~icometrix_sdk.IcometrixApi`
+
+    .. code-block:: python
+
+        async with AsyncIcometrixApi() as ico_api:
+            project = await ico_api.projects.get_one_by_id(PROJECT_ID)
+
+    :param api_client:
+        An instance of an AsyncApiClient
+    """
+
+    profile: AsyncProfile
+    projects: AsyncProjects
+    patients: AsyncPatients
+    studies: AsyncStudies
+    series: AsyncSeries
+    uploads: AsyncUploads
+    customer_results: AsyncCustomerResults
+    customer_reports: AsyncCustomerReports
+
+    _api_client: AsyncApiClient
+
+    def __init__(self, api_client: Optional[AsyncApiClient] = None):
+        self._api_client = api_client
+        if not self._api_client:
+            self._api_client = get_async_api_client()
+
+        self.profile = AsyncProfile(self._api_client)
+        self.projects = AsyncProjects(self._api_client)
+        self.patients = AsyncPatients(self._api_client)
+        self.studies = AsyncStudies(self._api_client)
+        self.series = AsyncSeries(self._api_client)
+        self.uploads = AsyncUploads(self._api_client)
+        self.pipeline_results = AsyncPipelineResults(self._api_client)
+        self.customer_results = AsyncCustomerResults(self._api_client)
+        self.customer_reports = AsyncCustomerReports(self._api_client)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        await self._api_client.close()
+
+    async def process_dicom_directory(self, project_id: str, input_dir: str, out_dir: str, params: StartUploadDto):
+        """
+        Async variant of :meth:`~icometrix_sdk.IcometrixApi.process_dicom_directory`, the studies in the upload
+        are processed concurrently.
+
+        :param project_id (str): The UUID of the project to which the DICOM files belong.
+        :param input_dir (str): The path to the directory containing the DICOM files to be processed.
+        :param out_dir (str): The path to the directory where output data will be stored.
+        :param params (StartUploadDto): An instance of StartUploadDto containing parameters for the upload.
+        :return:
+        """
+        # Get the project, to make sure its there (will throw a 404 in case the project is not found)
+        project = await self.projects.get_one_by_id(project_id, raw=False)
+
+        # Upload a directory of DICOMs
+        upload = await self.uploads.upload_dicom_dir(project.id, input_dir, params)
+
+        # Wait for data to be imported
+        upload = await self.uploads.wait_for_data_import(upload.folder_uri)
+
+        # e.g. No DICOMs found in the upload
+        if upload.errors:
+            raise Exception(f"Upload failed: {', '.join(upload.errors)}")
+
+        # Get imported studies
+        studies_in_upload = await self.uploads.get_studies_for_upload(upload_folder_uri=upload.folder_uri,
+                                                                      raw=False)
+        if not studies_in_upload:
+            raise Exception("No valid studies uploaded.")
+
+        async def process_study(study_in_upload):
+            # Find the study
+            study = await self.studies.get_one(study_in_upload.project_id,
+                                               study_in_upload.patient_id,
+                                               study_in_upload.study_id, raw=False)
+
+            # Get reports for this study
+            customer_reports = await self.customer_reports.get_all_for_study(study_uri=study.uri, raw=False)
+
+            # Wait for the reports to finish and download the results
+            finished_customer_reports = await self.customer_reports.wait_for_results(list(customer_reports))
+            for customer_report in finished_customer_reports:
+                out_path = os.path.join(out_dir, customer_report.id)
+                await self.customer_reports.download_customer_report_files(customer_report, out_path)
+
+        await asyncio.gather(*[process_study(study_in_upload) for study_in_upload in studies_in_upload])
@@ -0,0 +1,175 @@
+import asyncio
+import inspect
+import logging
+import os
+from typing import Any, Callable, Optional, Dict, List
+
+from icometrix_sdk.exceptions import IcometrixDataImportException, WaitTimeoutException, IcometrixHttpException
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity, CustomerReportPage, CustomerReportFile
+from icometrix_sdk.utils.api_client import AsyncApiClient
+from icometrix_sdk.utils.paginator import get_async_paginator
+from icometrix_sdk.utils.wait import Backoff, async_wait_for, RETRY_STATUS_CODES
+
+logger = logging.getLogger(logger_name)
+
+
+class AsyncCustomerReports:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.customer_reports.CustomerReports`
+
+    :param api: An AsyncApiClient
+    :param polling_interval: Seconds between two status checks when waiting
+    :param concurrency: The maximum amount of concurrent requests made by a single call
+    """
+
+    def __init__(self, api: AsyncApiClient, polling_interval=2, concurrency: int = 10):
+        self._api = api
+        self.polling_interval = polling_interval
+        self.concurrency = concurrency
+
+    async def get_all(self, project_id: str, **kwargs) -> PaginatedResponse[CustomerReportEntity]:
+        """
+        Get al customer reports for a project
+
+        :param project_id: The ID of the project you want to fetch the customer-reports from
+        :return: A Paginated response containing customer-reports
+        """
+
+        return await self._api.get_as(f"/customer-reports-service/api/v2/projects/{project_id}/customer-reports",
+                                      CustomerReportPage, **kwargs)
+
+    async def get_one(self, customer_report_uri: str, **kwargs) -> CustomerReportEntity:
+        """
+        Get a single customer-report based on the customer-report uri
+
+        :param customer_report_uri: the uri of the customer-report
+        :return: A single customer-report or 404
+        """
+        return await self._api.get_as(customer_report_uri, CustomerReportEntity, **kwargs)
+
+    async def get_all_for_study(self, study_uri: str, **kwargs) -> PaginatedResponse[CustomerReportEntity]:
+        """
+        Get a single customer-report based on the customer-report uri
+
+        :param study_uri: the uri of the study
+        :return: A Paginated response containing customer-reports
+        """
+        study_uri = (study_uri
+                     .replace("/studies-service/", "/customer-reports-service/")
+                     .replace("/storage-service/", "/customer-reports-service/")
+                     .replace("/v1/", "/v2/"))
+        return await self._api.get_as(f"{study_uri}/customer-reports", CustomerReportPage, **kwargs)
+
+    async def download_customer_report_files(self, customer_report: CustomerReportEntity, out_path: str):
+        """
+        Download all files created by icobrain for a customer_report, at most `concurrency` files at once
+
+        :param customer_report: The customer report you want to download the files from
+        :param out_path: A folder path to write the files to
+        :return:
+        """
+        if not os.path.isdir(out_path):
+            os.mkdir(out_path)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def download(report_file: CustomerReportFile):
+            async with semaphore:
+                await self.download_customer_report_file(report_file, f"{out_path}/{report_file.name}")
+
+        await asyncio.gather(*[download(report_file) for report_file in customer_report.report_files])
+
+    async def download_customer_report_file(self, customer_report_file: CustomerReportFile,
+                                            out_path: Optional[str] = None):
+        """
+        Download a file created by icobrain for a customer_report
+
+        :param customer_report_file: The file entity you want to download
+        :param out_path: A path to write the file to
+        :return:
+        """
+        if not out_path:
+            out_path = customer_report_file.name
+        logger.info(f"Downloading {customer_report_file} -> {out_path}")
+        await self._api.stream_file(customer_report_file.uri, out_path)
+
+    async def wait_for_customer_report_for_study(self, project_id: str,
+                                                 study_instance_uid: str,
+                                                 report_type: str, timeout: float = 20) -> CustomerReportEntity:
+        """
+        After data has been imported a customer report will be created
+
+        :param project_id: The ID of the project you want to search under
+        :param study_instance_uid: The study instance UID from the DICOM
+        :param report_type: The requested report type
+        :param timeout: The maximum time to wait (in seconds)
+        :return:
+        """
+
+        async def find_report() -> Optional[CustomerReportEntity]:
+            logger.info(f"Searching {report_type} report for {study_instance_uid} in {project_id}")
+            params = {"study_instance_uid": study_instance_uid}
+            async for page in get_async_paginator(self.get_all, project_id=project_id, params=params, raw=False):
+                for report in page:
+                    if report.icobrain_report_type == report_type:
+                        return report
+            return None
+
+        try:
+            return await async_wait_for(find_report, lambda report: report is not None, timeout,
+                                        Backoff(initial=self.polling_interval, maximum=timeout / 2))
+        except WaitTimeoutException as e:
+            raise IcometrixDataImportException(f"Failed to find a CustomerReport for {study_instance_uid}") from e
+
+    async def wait_for_results(self, customer_reports: List[CustomerReportEntity], timeout: Optional[float] = None,
+                               max_interval: float = 60,
+                               on_finished: Optional[Callable[[CustomerReportEntity], Any]] = None,
+                               cancel: Optional[asyncio.Event] = None) -> List[CustomerReportEntity]:
+        """
+        Wait until processing has finished and the result files are available on the customer report,
+        see :meth:`~icometrix_sdk.resources.customer_reports.CustomerReports.wait_for_results`
+
+        Every report is checked on its own exponential backoff, with at most `concurrency` checks at once.
+
+        :param customer_reports: A list of customer reports
+        :param timeout: The maximum time to wait (in seconds), raises a WaitTimeoutException when exceeded
+        :param max_interval: The maximum time between two checks of a report (in seconds)
+        :param on_finished: Called (or awaited) as soon as a report has finished
+        :param cancel: An event to stop waiting, raises a WaitCancelledException when set
+        :return: The finished customer reports, in the order they finished
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        backoff = Backoff(initial=self.polling_interval, maximum=max_interval)
+        finished_customer_reports: Dict[str, CustomerReportEntity] = {}
+
+        async def check(customer_report_uri: str) -> Optional[CustomerReportEntity]:
+            async with semaphore:
+                try:
+                    report = await self.get_one(customer_report_uri, raw=False)
+                except IcometrixHttpException as e:
+                    if e.status_code not in RETRY_STATUS_CODES:
+                        raise
+                    logger.warning(f"Status check of {customer_report_uri} failed ({e.status_code}), retrying")
+                    return None
+            logger.info(f"Finished {report}" if report.status == "Finished" else f"Waiting for {report}")
+            return report
+
+        async def wait_for_report(customer_report_uri: str):
+            report = await async_wait_for(check, lambda r: r is not None and r.status == "Finished", timeout,
+                                          backoff, cancel, customer_report_uri=customer_report_uri)
+            finished_customer_reports[customer_report_uri] = report
+            if on_finished is not None:
+                result = on_finished(report)
+                if inspect.isawaitable(result):
+                    await result
+
+        tasks = [asyncio.ensure_future(wait_for_report(uri))
+                 for uri in dict.fromkeys(customer_report.uri for customer_report in customer_reports)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return list(finished_customer_reports.values())
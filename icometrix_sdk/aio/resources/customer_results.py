@@ -0,0 +1,57 @@
+import logging
+
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.customer_result_entity import CustomerResultEntity, CustomerResultPage
+from icometrix_sdk.utils.api_client import AsyncApiClient
+
+logger = logging.getLogger(logger_name)
+
+
+class AsyncCustomerResults:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.customer_results.CustomerResults`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def get_all_for_study(self, study_uri: str, **kwargs) -> PaginatedResponse[CustomerResultEntity]:
+        """
+        Get al customer results for a study
+
+        :param study_uri: The uri of a study
+        :return: A Paginated response containing customer-results
+        """
+
+        return await self._api.get_as(f"{study_uri}/customer-results", CustomerResultPage, **kwargs)
+
+    async def get_all_for_patient(self, patient_uri: str, **kwargs) -> PaginatedResponse[CustomerResultEntity]:
+        """
+        Get al customer results for a patient
+
+        :param patient_uri: The uri of a patient
+        :return: A Paginated response containing customer-results
+        """
+
+        return await self._api.get_as(f"{patient_uri}/customer-results", CustomerResultPage, **kwargs)
+
+    async def get_all_for_pipeline_result(self, pipeline_result_uri: str, **kwargs) -> \
+            PaginatedResponse[CustomerResultEntity]:
+        """
+        Get al customer reports for a pipeline-result
+
+        :param pipeline_result_uri: The uri of a pipeline-result
+        :return: A Paginated response containing customer-results
+        """
+
+        return await self._api.get_as(f"{pipeline_result_uri}/customer-results", CustomerResultPage, **kwargs)
+
+    async def get_one(self, customer_result_uri: str, **kwargs) -> CustomerResultEntity:
+        """
+        Get a single customer-result based on the customer-result uri
+
+        :param customer_result_uri: the uri of the customer-result
+        :return: A single customer-result or 404
+        """
+        return await self._api.get_as(customer_result_uri, CustomerResultEntity, **kwargs)
@@ -0,0 +1,30 @@
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.patient_entity import PatientEntity, PatientPage
+from icometrix_sdk.utils.api_client import AsyncApiClient
+
+
+class AsyncPatients:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.patients.Patients`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def get_all(self, project_uri: str, **kwargs) -> PaginatedResponse[PatientEntity]:
+        """
+        List all patients within a project
+
+        :param: The uri of the project
+        :return: A Paginated response containing patients
+        """
+        return await self._api.get_as(f"{project_uri}/patients", PatientPage, **kwargs)
+
+    async def get_one(self, patient_uri: str, **kwargs) -> PatientEntity:
+        """
+        Get a single patient based on the patient uri
+
+        :param patient_uri: the uri of the patient
+        :return: A single patient or 404
+        """
+        return await self._api.get_as(patient_uri, PatientEntity, **kwargs)
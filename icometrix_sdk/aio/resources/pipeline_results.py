@@ -0,0 +1,61 @@
+import logging
+from typing import Optional, Sequence
+
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.pipeline_result_entity import PipelineResultEntity, PipelineResultPage
+from icometrix_sdk.utils.api_client import AsyncApiClient
+from icometrix_sdk.utils.paginator import get_async_paginator
+
+logger = logging.getLogger(logger_name)
+
+
+class AsyncPipelineResults:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.pipeline_results.PipelineResults`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def get_all_for_study(self, study_uri: str, **kwargs) -> PaginatedResponse[PipelineResultEntity]:
+        """
+        Get al pipeline reports for a project
+
+        :param study_uri: The uri of a study
+        :return: A Paginated response containing pipeline-results
+        """
+
+        study_uri = study_uri.replace("/v1/", "/v2/")
+        return await self._api.get_as(f"{study_uri}/pipeline-results", PipelineResultPage, **kwargs)
+
+    async def get_one_for_job(self, study_uri: str, job_id: str,
+                              fields: Optional[Sequence[str]] = None) -> PipelineResultEntity | None:
+        """
+        Get a pipeline result for a job,
+        see :meth:`~icometrix_sdk.resources.pipeline_results.PipelineResults.get_one_for_job`
+
+        :param study_uri: The uri of a study
+        :param job_id: The id of the job
+        :param fields: Only request these fields while searching, the pipeline result of the job is then requested
+            completely
+        """
+        if fields is not None:
+            fields = list(dict.fromkeys([*fields, "uri", "job_id"]))
+        async for pipeline_results in get_async_paginator(self.get_all_for_study, study_uri=study_uri,
+                                                          fields=fields, raw=False):
+            for pipeline_result in pipeline_results:
+                if pipeline_result.job_id == job_id:
+                    if fields is None:
+                        return pipeline_result
+                    return await self.get_one(pipeline_result.uri, raw=False)
+        return None
+
+    async def get_one(self, pipeline_result_uri: str, **kwargs) -> PipelineResultEntity:
+        """
+        Get a single customer-result based on the customer-result uri
+
+        :param pipeline_result_uri: the uri of the pipeline-result
+        :return: A single pipeline-result or 404
+        """
+        return await self._api.get_as(pipeline_result_uri, PipelineResultEntity, **kwargs)
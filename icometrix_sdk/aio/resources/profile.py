@@ -0,0 +1,19 @@
+from icometrix_sdk.models.user_entity import User
+from icometrix_sdk.utils.api_client import AsyncApiClient
+
+
+class AsyncProfile:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.profile.Profile`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def who_am_i(self, **kwargs) -> User:
+        """
+        see the currently logged-in user
+
+        :return: The current User or 401
+        """
+        return await self._api.get_as(f"/authentication-service/api/v1/loginstatus", User, **kwargs)
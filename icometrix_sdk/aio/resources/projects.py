@@ -0,0 +1,53 @@
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.project_entity import ProjectEntity, ProjectPage
+from icometrix_sdk.utils.api_client import AsyncApiClient
+
+
+class AsyncProjects:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.projects.Projects`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def get_all(self, **kwargs) -> PaginatedResponse[ProjectEntity]:
+        """
+        List projects that the current user has access to
+
+        :return: A Paginated response containing projects
+        """
+        no_settings = {"no-settings": "true"}
+        if "params" in kwargs:
+            kwargs["params"].update(no_settings)
+        else:
+            kwargs["params"] = no_settings
+        return await self._api.get_as("/storage-service/api/v2/projects", ProjectPage, **kwargs)
+
+    async def get_one(self, project_uri: str, **kwargs) -> ProjectEntity:
+        """
+        Get a single project based on the project uri
+
+        :param project_uri: the uri of the project
+        :return: A single project or 404
+        """
+        no_settings = {"no-settings": "true"}
+        if "params" in kwargs:
+            kwargs["params"].update(no_settings)
+        else:
+            kwargs["params"] = no_settings
+        return await self._api.get_as(project_uri, ProjectEntity, **kwargs)
+
+    async def get_one_by_id(self, project_id: str, **kwargs) -> ProjectEntity:
+        """
+        Get a single project based on the project ID
+
+        :param project_id: the ID of the project
+        :return: A single project or 404
+        """
+        no_settings = {"no-settings": "true"}
+        if "params" in kwargs:
+            kwargs["params"].update(no_settings)
+        else:
+            kwargs["params"] = no_settings
+        return await self._api.get_as(f"/storage-service/api/v1/projects/{project_id}", ProjectEntity, **kwargs)
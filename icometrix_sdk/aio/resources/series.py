@@ -0,0 +1,26 @@
+import logging
+
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.series_entity import SeriesEntity, SeriesPage
+from icometrix_sdk.utils.api_client import AsyncApiClient
+
+logger = logging.getLogger(logger_name)
+
+
+class AsyncSeries:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.series.Series`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def get_all_for_study(self, study_uri: str, **kwargs) -> PaginatedResponse[SeriesEntity]:
+        """
+        List all series for a study
+
+        :param study_uri: the uri of the study
+        :return: A Paginated response containing series
+        """
+        return await self._api.get_as(f"{study_uri}/series", SeriesPage, **kwargs)
@@ -0,0 +1,38 @@
+import logging
+
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.study_entity import StudyEntity, StudyPage
+from icometrix_sdk.utils.api_client import AsyncApiClient
+
+logger = logging.getLogger(logger_name)
+
+
+class AsyncStudies:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.studies.Studies`
+    """
+
+    def __init__(self, api: AsyncApiClient):
+        self._api = api
+
+    async def get_one(self, project_id: str, patient_id: str, study_id: str, **kwargs) -> StudyEntity:
+        """
+        Get a single upload entry based on the upload uri
+
+        :param project_id: the ID of the project
+        :param patient_id: the ID of the patient
+        :param study_id: the ID of the study
+        :return: A single study or 404
+        """
+        uri = f"/storage-service/api/v1/projects/{project_id}/patients/{patient_id}/studies/{study_id}"
+        return await self._api.get_as(uri, StudyEntity, **kwargs)
+
+    async def get_all_for_patient(self, patient_uri: str, **kwargs) -> PaginatedResponse[StudyEntity]:
+        """
+        List all studies for a patient
+
+        :param: The uri of the patient
+        :return: A Paginated response containing studies
+        """
+        return await self._api.get_as(f"{patient_uri}/patients", StudyPage, **kwargs)
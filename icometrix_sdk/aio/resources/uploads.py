@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from typing import Optional
+
+from icometrix_sdk.exceptions import IcometrixException, IcometrixDataImportException
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.upload_entity import StartUploadDto, UploadEntity, UploadPage, UploadEntityFiles, \
+    StudyUploadEntity, StudyUploadPage
+from icometrix_sdk.resources.uploads import _walk_files
+from icometrix_sdk.utils.api_client import AsyncApiClient
+from icometrix_sdk.utils.wait import Backoff, async_wait_for
+
+logger = logging.getLogger(logger_name)
+
+
+class AsyncUploads:
+    """
+    Async variant of :class:`~icometrix_sdk.resources.uploads.Uploads`
+
+    :param api: An AsyncApiClient
+    :param polling_interval: Seconds between two status checks when waiting
+    :param concurrency: The default amount of files uploaded at once
+    """
+
+    def __init__(self, api: AsyncApiClient, polling_interval=2, concurrency: int = 10):
+        self._api = api
+        self.polling_interval = polling_interval
+        self.concurrency = concurrency
+
+    async def get_all(self, project_id: str, **kwargs) -> PaginatedResponse[UploadEntity]:
+        """
+        List all uploads within a project
+
+        :param: The ID of the project
+        :return: A Paginated response containing upload entries
+        """
+        return await self._api.get_as(f"/uploads-service/api/v1/projects/{project_id}/dicom-uploads",
+                                      UploadPage, **kwargs)
+
+    async def get_one(self, upload_uri: str, **kwargs) -> UploadEntity:
+        """
+        Get a single upload entry based on the upload uri
+
+        :param upload_uri: the uri of the upload
+        :return: A single patient or 404
+        """
+        return await self._api.get_as(upload_uri, UploadEntity, **kwargs)
+
+    async def get_studies_for_upload(self, upload_folder_uri: str, **kwargs) -> PaginatedResponse[StudyUploadEntity]:
+        """
+        Get studies created by this upload (first wait till import is finished)
+
+        :param upload_folder_uri: the folder uri of the upload (UploadEntry.folder_uri)
+        :return:
+        """
+        return await self._api.get_as(f"{upload_folder_uri}/study-uploads", StudyUploadPage, **kwargs)
+
+    async def get_uploaded_files(self, upload_folder_uri: str, **kwargs) -> UploadEntityFiles:
+        """
+        List all files that have been uploaded to a UploadEntry,
+        see :meth:`~icometrix_sdk.resources.uploads.Uploads.get_uploaded_files`
+
+        :param upload_folder_uri: the folder uri of the upload (UploadEntry.folder_uri)
+        :return: An object containing all file names (If the upload has been imported, the file list will be empty)
+        """
+        return await self._api.get_as(f"{upload_folder_uri}/files", UploadEntityFiles, **kwargs)
+
+    async def upload_dicom_dir(self, project_id: str, dicom_dir_path: str, options: StartUploadDto,
+                               complete_on_error=False, workers: Optional[int] = None) -> UploadEntity:
+        """
+        A higher level function to upload all DICOMs of a directory AND all of its subdirectories
+
+        :param project_id:
+            The ID of the project you want to upload to
+        :param dicom_dir_path:
+            The path to the directory
+        :param options:
+            Extra upload options
+        :param complete_on_error:
+            Setting this boolean to true will still complete the upload, even if a file failed to upload
+        :param workers:
+            The amount of files uploaded at once, defaults to `concurrency`
+        :return:
+        """
+        upload = await self.start_upload(project_id, options)
+        await self.upload_all_files_in_dir(upload.uri, dicom_dir_path, complete_on_error, workers)
+        return await self.complete_upload(upload.uri)
+
+    async def upload_all_files_in_dir(self, upload_uri: str, dicom_dir_path: str, complete_on_error=False,
+                                      workers: Optional[int] = None) -> int:
+        """
+        A higher level function to upload all DICOMs of a directory AND all of its subdirectories
+
+        The directory is walked while uploading: the files are fed to `workers` upload tasks through a queue of a
+        few files per worker. On an error the remaining files are dropped and the exception is raised right away,
+        unless `complete_on_error` is set.
+
+        :param upload_uri:
+            the URI of the upload entry
+        :param dicom_dir_path:
+            The path to the directory
+        :param complete_on_error:
+            Setting this boolean to true will still complete the upload, even if a file failed to upload
+        :param workers:
+            The amount of files uploaded at once, defaults to `concurrency`
+        :return: The amount of uploaded files, files that failed to upload are not counted
+        """
+        workers = workers or self.concurrency
+        queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=2 * workers)
+        count = 0
+
+        async def walk():
+            for file_path in _walk_files(dicom_dir_path):
+                await queue.put(file_path)
+            for _ in range(workers):
+                await queue.put(None)
+
+        async def upload():
+            nonlocal count
+            while (file_path := await queue.get()) is not None:
+                logger.info(f"Uploading {file_path}")
+                try:
+                    await self.upload_dicom_path(upload_uri, file_path)
+                except IcometrixException as e:
+                    logger.error(f"Exception while uploading {file_path}: {e}")
+                    if not complete_on_error:
+                        raise e
+                    continue
+                count += 1
+
+        tasks = [asyncio.create_task(walk()), *[asyncio.create_task(upload()) for _ in range(workers)]]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return count
+
+    async def start_upload(self, project_id: str, start_upload: StartUploadDto, **kwargs) -> UploadEntity:
+        """
+        A function to create an upload entry, that can be used to upload a block of data
+
+        :param project_id: The ID of the project you want to upload to
+        :param start_upload: Extra upload options
+        :return:
+        """
+        body = start_upload.model_dump(by_alias=True)
+        resp = await self._api.post(f"/uploads-service/api/v1/projects/{project_id}/multi-upload", data=body,
+                                    **kwargs)
+        return UploadEntity(**resp)
+
+    async def upload_dicom_path(self, upload_uri: str, file_path: str):
+        """
+        Upload a file to an upload entry
+
+        :param upload_uri: Uri to upload to (UploadEntity.uri)
+        :param file_path: The path to the file
+        :return:
+        """
+        with open(file_path, "rb") as fp:
+            await self.upload_dicom(upload_uri, fields={"file": (file_path, fp, "application/octet-stream")})
+
+    async def upload_dicom(self, upload_uri: str, fields):
+        """
+        Upload files to an upload entry, these can be DICOMs or zips
+
+        :param upload_uri: The uri to upload to
+        :param fields: Dictionary of fields or list of (key, :class:`~urllib3.fields.RequestField`).
+            The field data can be bytes or a binary file object, file objects are streamed.
+        :return:
+        """
+        await self._api.put_file(upload_uri, fields=fields)
+
+    async def complete_upload(self, upload_uri: str) -> UploadEntity:
+        """
+        A function to complete an upload entry, and start the importing the files
+
+        :param upload_uri: The uri to upload to
+        :return:
+        """
+        resp = await self._api.post(upload_uri, data={})
+        return UploadEntity(**resp)
+
+    async def wait_for_data_import(self, upload_uri: str, timeout: Optional[float] = None,
+                                   max_interval: float = 30) -> UploadEntity:
+        """
+        After data has been upload (and completed), we need to wait for the data to be imported
+
+        :param upload_uri: The uri to upload to
+        :param timeout: The maximum time to wait (in seconds), raises a WaitTimeoutException when exceeded
+        :param max_interval: The maximum time between two status checks (in seconds)
+        :return: UploadEntity
+        """
+
+        async def check() -> UploadEntity:
+            upload = await self.get_one(upload_uri, raw=False)
+            logger.info(upload)
+            if upload.status == "import_failed":
+                raise IcometrixDataImportException(f"Import failed: {upload}")
+            return upload
+
+        return await async_wait_for(check, lambda upload: upload.status == "import_success", timeout,
+                                    Backoff(initial=self.polling_interval, maximum=max_interval))
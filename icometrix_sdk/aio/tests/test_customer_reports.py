@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from icometrix_sdk.aio.resources.customer_reports import AsyncCustomerReports
+from icometrix_sdk.exceptions import WaitTimeoutException, WaitCancelledException, IcometrixHttpException
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity
+from icometrix_sdk.utils.tests.utils import FakeAsyncApiClient
+
+
+def create_report(report_id: str, status: str = "Processing") -> dict:
+    return {"id": report_id, "uri": f"/customer-reports/{report_id}", "status": status, "study_id": "s",
+            "patient_id": "p", "project_id": "pr", "project_name": "Project", "report_files": [],
+            "project_country": "BE", "study_instance_uid": "1.2.3", "icobrain_report_type": "icobrain_ms",
+            "update_timestamp": None, "creation_timestamp": None}
+
+
+class FakeAsyncApi(FakeAsyncApiClient):
+    """
+    Every report is finished after a number of checks, a check can fail with a 503 first
+    """
+
+    def __init__(self, checks_needed: dict, errors: dict = None):
+        super().__init__()
+        self.checks_needed = checks_needed
+        self.errors = errors or {}
+        self.checks = {uri: 0 for uri in checks_needed}
+
+    async def get(self, uri: str, **kwargs) -> dict:
+        self.checks[uri] += 1
+        if self.errors.get(uri):
+            self.errors[uri] -= 1
+            raise IcometrixHttpException("Service unavailable", status_code=503)
+        finished = self.checks[uri] >= self.checks_needed[uri]
+        return create_report(uri.rsplit("/", 1)[1], "Finished" if finished else "Processing")
+
+
+def reports(*report_ids: str):
+    return [CustomerReportEntity(**create_report(report_id)) for report_id in report_ids]
+
+
+def test_wait_for_results():
+    api = FakeAsyncApi({"/customer-reports/a": 1, "/customer-reports/b": 3}, errors={"/customer-reports/b": 1})
+    finished = []
+
+    async def on_finished(report: CustomerReportEntity):
+        finished.append(report.id)
+
+    results = asyncio.run(AsyncCustomerReports(api, polling_interval=0.01)
+                          .wait_for_results(reports("a", "b"), timeout=5, on_finished=on_finished))
+
+    assert [report.id for report in results] == ["a", "b"]
+    assert finished == ["a", "b"]
+    assert api.checks == {"/customer-reports/a": 1, "/customer-reports/b": 3}
+
+
+def test_wait_for_results_timeout():
+    api = FakeAsyncApi({"/customer-reports/a": 1, "/customer-reports/b": 1000})
+
+    with pytest.raises(WaitTimeoutException):
+        asyncio.run(AsyncCustomerReports(api, polling_interval=0.01)
+                    .wait_for_results(reports("a", "b"), timeout=0.1, max_interval=0.02))
+
+
+def test_wait_for_results_cancel():
+    api = FakeAsyncApi({"/customer-reports/a": 1000})
+
+    async def wait():
+        cancel = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, cancel.set)
+        await AsyncCustomerReports(api, polling_interval=10).wait_for_results(reports("a"), cancel=cancel)
+
+    with pytest.raises(WaitCancelledException):
+        asyncio.run(wait())
+
+
+def test_wait_for_results_raw_client():
+    api = FakeAsyncApi({"/customer-reports/a": 2})
+    api.raw = True
+
+    results = asyncio.run(AsyncCustomerReports(api, polling_interval=0.01).wait_for_results(reports("a"), timeout=5))
+
+    assert [report.id for report in results] == ["a"]
@@ -0,0 +1,124 @@
+import asyncio
+import os
+
+import pytest
+
+from icometrix_sdk.aio.resources import uploads
+from icometrix_sdk.aio.resources.uploads import AsyncUploads
+from icometrix_sdk.exceptions import IcometrixDataImportException, IcometrixHttpException
+from icometrix_sdk.utils.tests.utils import FakeAsyncApiClient
+
+UPLOAD_URI = "/uploads-service/api/v1/projects/pr/dicom-uploads/u"
+
+
+def create_upload(status: str) -> dict:
+    return {"id": "u", "uri": UPLOAD_URI, "status": status, "folder_uri": f"{UPLOAD_URI}/folder", "type": "dicom",
+            "logs": [], "errors": [], "icobrain_report_type": "icobrain_ms", "project_id": "pr",
+            "update_timestamp": None, "creation_timestamp": None}
+
+
+class FakeUploadApi(FakeAsyncApiClient):
+    """
+    The upload is imported after a number of checks, uploads of files named 'fail*' are rejected
+    """
+
+    def __init__(self, statuses: list = None, delay: float = 0):
+        super().__init__()
+        self.statuses = statuses or []
+        self.delay = delay
+        self.uploaded = []
+        self.running = 0
+        self.max_running = 0
+
+    async def get(self, uri: str, **kwargs) -> dict:
+        return create_upload(self.statuses.pop(0))
+
+    async def post(self, uri: str, data: dict, **kwargs) -> dict:
+        return create_upload("uploading")
+
+    async def put_file(self, uri: str, fields, **kwargs):
+        file_name, fp, _ = fields["file"]
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        if "fail" in file_name:
+            raise IcometrixHttpException("Bad request", status_code=400)
+        self.uploaded.append((file_name, fp.read()))
+
+
+def create_dicom_dir(tmp_path, names):
+    for name in names:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(name.encode())
+    return str(tmp_path)
+
+
+def test_upload_all_files_in_dir(tmp_path):
+    dicom_dir = create_dicom_dir(tmp_path, [f"a/IM-{i}.dcm" for i in range(8)] + ["b/IM-0.dcm", ".DS_Store"])
+    api = FakeUploadApi(delay=0.01)
+
+    count = asyncio.run(AsyncUploads(api, concurrency=3).upload_all_files_in_dir(UPLOAD_URI, dicom_dir))
+
+    assert count == 9
+    assert sorted(content for _, content in api.uploaded) == sorted(
+        [f"a/IM-{i}.dcm".encode() for i in range(8)] + [b"b/IM-0.dcm"])
+    assert api.max_running == 3
+
+
+def test_upload_all_files_in_dir_errors(tmp_path):
+    dicom_dir = create_dicom_dir(tmp_path, ["IM-0.dcm", "fail.dcm"])
+
+    with pytest.raises(IcometrixHttpException):
+        asyncio.run(AsyncUploads(FakeUploadApi()).upload_all_files_in_dir(UPLOAD_URI, dicom_dir))
+
+    api = FakeUploadApi()
+    asyncio.run(AsyncUploads(api).upload_all_files_in_dir(UPLOAD_URI, dicom_dir, complete_on_error=True))
+    assert [content for _, content in api.uploaded] == [b"IM-0.dcm"]
+
+
+def test_upload_all_files_in_dir_lazy(tmp_path, monkeypatch):
+    dicom_dir = create_dicom_dir(tmp_path, ["0-fail.dcm"] + [f"IM-{i}.dcm" for i in range(100)])
+    walked = []
+
+    def walk_files(dir_path: str):
+        # The failing file first
+        for name in sorted(os.listdir(dir_path)):
+            walked.append(name)
+            yield os.path.join(dir_path, name)
+
+    monkeypatch.setattr(uploads, "_walk_files", walk_files)
+    api = FakeUploadApi(delay=0.01)
+
+    with pytest.raises(IcometrixHttpException):
+        asyncio.run(AsyncUploads(api).upload_all_files_in_dir(UPLOAD_URI, dicom_dir, workers=2))
+
+    # Only a few files per worker were walked when the upload stopped
+    assert len(walked) < 10
+    assert len(api.uploaded) <= 2
+
+
+def test_wait_for_data_import():
+    api = FakeUploadApi(["importing", "importing", "import_success"])
+
+    upload = asyncio.run(AsyncUploads(api, polling_interval=0.01).wait_for_data_import(UPLOAD_URI))
+
+    assert upload.status == "import_success"
+    assert api.statuses == []
+
+
+def test_wait_for_data_import_failed():
+    api = FakeUploadApi(["importing", "import_failed"])
+
+    with pytest.raises(IcometrixDataImportException):
+        asyncio.run(AsyncUploads(api, polling_interval=0.01).wait_for_data_import(UPLOAD_URI))
+
+
+def test_wait_for_data_import_raw_client():
+    api = FakeUploadApi(["importing", "import_success"])
+    api.raw = True
+
+    upload = asyncio.run(AsyncUploads(api, polling_interval=0.01).wait_for_data_import(UPLOAD_URI))
+
+    assert upload.status == "import_success"
@@ -1,77 +1,296 @@
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, Future, BrokenExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 
+import pydicom
 from pydicom import Dataset, DataElement
+from pydicom.filebase import DicomFileLike
+from pydicom.filereader import read_dataset
+from pydicom.filewriter import write_dataset
+from pydicom.uid import DeflatedExplicitVRLittleEndian
 
 from icometrix_sdk.anonymizer.exceptions import PolicyException
 from icometrix_sdk.anonymizer.hash_factory import HashMethod
-from icometrix_sdk.anonymizer.models import Policy, TagPolicy
-from icometrix_sdk.anonymizer.utils import remove_tag, replace_tag, hash_tag, _is_pixel_data, round_tag, \
-    add_de_identification_tags, is_tag, is_group, empty_tag
+from icometrix_sdk.anonymizer.models import Policy, TagPolicy, AnonymizationResult
+from icometrix_sdk.anonymizer.utils import remove_tag, replace_tag, hash_tag, round_tag, \
+    add_de_identification_tags, is_tag, is_group, empty_tag, copy_file_range, reset_hash_caches, \
+    find_element_end, PIXEL_DATA_TAG
 from icometrix_sdk.logger import logger_name
 
 logger = logging.getLogger(logger_name)
 
+Handler = Callable[[DataElement, Dataset], None]
+
+
+def _keep(element: DataElement, dataset: Dataset):
+    return
+
+
+def _validate_policy(policy: Policy, group_policy: Policy):
+    for tag in policy:
+        if not is_tag(tag):
+            raise PolicyException("Tag policy contains an invalid tag")
+
+    for group in group_policy:
+        if not is_group(group):
+            raise PolicyException("Group policy contains an invalid group")
+
+
+def _walk_files_to(in_dir: str, out_dir: str) -> Iterator[Tuple[str, str]]:
+    out_dir_real = os.path.realpath(out_dir)
+    for root, dirs, files in os.walk(in_dir):
+        # Don't descend into the output directory when it is inside the input directory
+        dirs[:] = [d for d in dirs if not d.startswith(".")
+                   and os.path.realpath(os.path.join(root, d)) != out_dir_real]
+        for file in files:
+            if file.startswith("."):
+                continue
+            in_path = os.path.join(root, file)
+            yield in_path, os.path.join(out_dir, os.path.relpath(in_path, in_dir))
+
 
 class Anonymizer:
+    """
+    Anonymize DICOM datasets with a tag policy, a group policy (for the tags that are not in the tag policy) and
+    the default policy (for all other tags)
+
+    The policies are compiled into a dispatch table when the anonymizer is created, and again when `policy`,
+    `group_policy` or `hash_algo` is assigned. Changes made in place to the policy dicts are not picked up,
+    assign the policy again instead. An unknown action in the tag policy raises a PolicyException right away,
+    instead of when a tag of the policy is found. Unknown actions in the group policy are ignored.
+
+    :param policy: The tag policy, tag -> TagPolicy
+    :param group_policy: The group policy, group -> TagPolicy
+    :param hash_algo: The hash method of the "hash" action
+    """
     default_policy: TagPolicy = TagPolicy("empty", "Default")
 
     def __init__(self, policy: Policy, group_policy: Policy, hash_algo: HashMethod):
-        for tag in policy:
-            if not is_tag(tag):
-                raise PolicyException("Tag policy contains an invalid tag")
+        _validate_policy(policy, group_policy)
+        self._policy = policy
+        self._group_policy = group_policy
+        self._hash_algo = hash_algo
+        self._compile()
+
+    @property
+    def policy(self) -> Policy:
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: Policy):
+        _validate_policy(policy, {})
+        self._policy = policy
+        self._compile()
+
+    @property
+    def group_policy(self) -> Policy:
+        return self._group_policy
+
+    @group_policy.setter
+    def group_policy(self, group_policy: Policy):
+        _validate_policy({}, group_policy)
+        self._group_policy = group_policy
+        self._compile()
 
-        for group in group_policy:
-            if not is_group(group):
-                raise PolicyException("Group policy contains an invalid group")
+    @property
+    def hash_algo(self) -> HashMethod:
+        return self._hash_algo
 
-        self.policy = policy
-        self.group_policy = group_policy
-        self.hash_algo = hash_algo
+    @hash_algo.setter
+    def hash_algo(self, hash_algo: HashMethod):
+        self._hash_algo = hash_algo
+        self._compile()
+
+    def _compile(self):
+        """
+        Compile the policies into a dispatch table of tag -> handler, so anonymizing an element is a single lookup
+        and call. Tags that are not in the tag policy are resolved once (group or default policy) and then cached.
+        """
+        self._group_handlers: Dict[int, Handler] = {group: self._compile_group_policy(tag_policy)
+                                                    for group, tag_policy in self.group_policy.items()}
+        self._default_handler = self._compile_policy(self.default_policy)
+
+        self._handlers: Dict[int, Handler] = {tag: self._compile_policy(tag_policy)
+                                              for tag, tag_policy in self.policy.items()}
+        # Keep the pixel data
+        self._handlers[PIXEL_DATA_TAG] = _keep
+
+    def __getstate__(self):
+        # The compiled handlers are closures, they are rebuilt after unpickling (e.g. in a worker process)
+        return {"policy": self.policy, "group_policy": self.group_policy, "hash_algo": self.hash_algo}
+
+    def __setstate__(self, state):
+        self._policy = state["policy"]
+        self._group_policy = state["group_policy"]
+        self._hash_algo = state["hash_algo"]
+        self._compile()
 
     def anonymize(self, dataset: Dataset) -> Dataset:
+        self._anonymize_elements(dataset)
+        return add_de_identification_tags(dataset)
+
+    def _anonymize_elements(self, dataset: Dataset):
+        handlers = self._handlers
         for element in dataset.iterall():
-            # Keep the pixel data
-            if _is_pixel_data(element.tag):
-                continue
+            tag = element.tag
+            handler = handlers.get(tag) or self._resolve_handler(tag)
+            handler(element, dataset)
 
-            # Apply the tag policy
-            elif element.tag in self.policy:
-                tag_policy = self.policy[element.tag]
-                self._apply_policy_to_tag(element, tag_policy, dataset)
+    def anonymize_file(self, in_path: str, out_path: str, skip_pixel_data: bool = True):
+        """
+        Anonymize a DICOM file and write the result to a new file
 
-            # Apply the group policy
-            elif element.tag.group in self.group_policy:
-                tag_policy = self.group_policy[element.tag.group]
-                self._apply_policy_to_group(element, tag_policy, dataset)
+        With `skip_pixel_data` only the header (everything before the pixel data) is parsed and anonymized. The
+        pixel data element is then copied byte for byte from the input file, without loading it in memory. Elements
+        after the pixel data (e.g. private tags or trailing padding) are read and anonymized as well. Deflated
+        datasets, and pixel data that can't be parsed, are always read completely.
 
-            # Apply the default policy
-            else:
-                self._apply_policy_to_tag(element, self.default_policy, dataset)
+        :param in_path: The path to the DICOM file
+        :param out_path: The path to write the anonymized DICOM file to
+        :param skip_pixel_data: Don't read the pixel data in memory
+        """
+        with open(in_path, "rb") as in_fp:
+            stopped_before_pixels = skip_pixel_data
+            dataset = pydicom.dcmread(in_fp, stop_before_pixels=skip_pixel_data)
+            pixel_data_start = in_fp.tell()
+            file_size = os.fstat(in_fp.fileno()).st_size
 
-        return add_de_identification_tags(dataset)
+            pixel_data_end = file_size
+            transfer_syntax = getattr(dataset.file_meta, "TransferSyntaxUID", None)
+            if skip_pixel_data and transfer_syntax == DeflatedExplicitVRLittleEndian:
+                skip_pixel_data = False
+            elif skip_pixel_data and pixel_data_start < file_size:
+                pixel_data_end = find_element_end(in_fp, pixel_data_start, dataset.is_implicit_VR,
+                                                  dataset.is_little_endian)
+                skip_pixel_data = pixel_data_end is not None and pixel_data_end <= file_size
+
+            if stopped_before_pixels and not skip_pixel_data:
+                in_fp.seek(0)
+                dataset = pydicom.dcmread(in_fp)
+
+            trailing = None
+            if skip_pixel_data and pixel_data_end < file_size:
+                in_fp.seek(pixel_data_end)
+                trailing = read_dataset(in_fp, dataset.is_implicit_VR, dataset.is_little_endian,
+                                        parent_encoding=dataset._character_set)
+                self._anonymize_elements(trailing)
+
+            with open(out_path, "wb") as out_fp:
+                self.anonymize(dataset).save_as(out_fp, write_like_original=True)
+                if skip_pixel_data:
+                    copy_file_range(in_fp, out_fp, pixel_data_start, pixel_data_end)
+                if trailing is not None:
+                    trailing_fp = DicomFileLike(out_fp)
+                    trailing_fp.is_implicit_VR = dataset.is_implicit_VR
+                    trailing_fp.is_little_endian = dataset.is_little_endian
+                    write_dataset(trailing_fp, trailing, parent_encoding=dataset._character_set)
+
+    def anonymize_files(self, files: Iterable[Tuple[str, str]],
+                        workers: Optional[int] = None) -> Iterator[AnonymizationResult]:
+        """
+        Anonymize many DICOM files in a process pool, see :meth:`anonymize_file`
+
+        The anonymizer (and so its policies) is sent to every worker process once. The files are consumed lazily,
+        at most a few files per worker are queued. Files that are not a DICOM are skipped, files that fail to
+        anonymize are reported and don't stop the run.
+
+        :param files: An iterable of (input path, output path) tuples, missing output directories are created
+        :param workers: The amount of processes, defaults to the amount of CPUs
+        :return: A generator of results, in the order the files finish
+        """
+        from icometrix_sdk.anonymizer.parallel import init_worker, anonymize_file_to
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = 2 * workers
 
-    def _apply_policy_to_group(self, element: DataElement, tag_policy: TagPolicy, dataset: Dataset):
+        pending: Dict[Future, Tuple[str, str]] = {}
+        files = iter(files)
+        exhausted = False
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(self,)) as pool:
+            try:
+                while True:
+                    while not exhausted and len(pending) < max_pending:
+                        paths = next(files, None)
+                        if paths is None:
+                            exhausted = True
+                            break
+                        pending[pool.submit(anonymize_file_to, paths)] = paths
+
+                    if not pending:
+                        return
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        in_path, out_path = pending.pop(future)
+                        try:
+                            is_dicom = future.result()
+                        except BrokenExecutor:
+                            raise
+                        except Exception as e:
+                            logger.error(f"Exception while anonymizing {in_path}: {e}")
+                            yield AnonymizationResult(in_path, out_path, "failed", str(e))
+                            continue
+                        yield AnonymizationResult(in_path, out_path, "anonymized" if is_dicom else "skipped")
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def anonymize_directory(self, in_dir: str, out_dir: str,
+                            workers: Optional[int] = None) -> Iterator[AnonymizationResult]:
+        """
+        Anonymize all DICOMs of a directory AND all of its subdirectories to an output directory,
+        with the same directory structure. Hidden files are skipped. See :meth:`anonymize_files`.
+
+        :param in_dir: The directory with the original DICOMs
+        :param out_dir: The directory to write the anonymized DICOMs to
+        :param workers: The amount of processes, defaults to the amount of CPUs
+        :return: A generator of results, in the order the files finish
+        """
+        return self.anonymize_files(_walk_files_to(in_dir, out_dir), workers)
+
+    def reset_cache(self):
+        """
+        Clear the cached hashes, call this between batches of unrelated studies
+        """
+        self.hash_algo.reset_cache()
+        reset_hash_caches()
+
+    def _resolve_handler(self, tag: int) -> Handler:
+        # Apply the group policy, or else the default policy
+        handler = self._group_handlers.get(tag >> 16, self._default_handler)
+        self._handlers[tag] = handler
+        return handler
+
+    def _compile_group_policy(self, tag_policy: TagPolicy) -> Handler:
         try:
-            self._apply_policy_to_tag(element, tag_policy, dataset)
-        except (AttributeError, ValueError):
-            logger.debug("Failed to apply group action '%d' to %s %s.", tag_policy.action,
-                         element.tag, element.name)
-            return
-
-    def _apply_policy_to_tag(self, element: DataElement, tag_policy: TagPolicy, dataset: Dataset):
-        logger.debug('%d %s: %s', element.tag, element.name, tag_policy.action)
-
-        if tag_policy.action == "keep":
-            return
-        elif tag_policy.action == "empty":
-            empty_tag(element)
-        elif tag_policy.action == "remove":
-            remove_tag(element, dataset)
-        elif tag_policy.action == "replace":
-            replace_tag(element, dataset, tag_policy.replace_fn)
-        elif tag_policy.action == "hash":
-            hash_tag(element, self.hash_algo)
-        elif tag_policy.action == "round":
-            round_tag(element)
-        else:
-            raise ValueError("Unknown tag policy action")
+            handler = self._compile_policy(tag_policy)
+        except PolicyException:
+            logger.debug("Ignoring unknown group action '%s'.", tag_policy.action)
+            return _keep
+
+        def apply_group_policy(element: DataElement, dataset: Dataset):
+            try:
+                handler(element, dataset)
+            except (AttributeError, ValueError):
+                logger.debug("Failed to apply group action '%s' to %s %s.", tag_policy.action,
+                             element.tag, element.name)
+
+        return apply_group_policy
+
+    def _compile_policy(self, tag_policy: TagPolicy) -> Handler:
+        action = tag_policy.action
+        if action == "keep":
+            return _keep
+        elif action == "empty":
+            return lambda element, dataset: empty_tag(element)
+        elif action == "remove":
+            return remove_tag
+        elif action == "replace":
+            replace_fn = tag_policy.replace_fn
+            return lambda element, dataset: replace_tag(element, dataset, replace_fn)
+        elif action == "hash":
+            hash_algo = self.hash_algo
+            return lambda element, dataset: hash_tag(element, hash_algo)
+        elif action == "round":
+            return lambda element, dataset: round_tag(element)
+        raise PolicyException(f"Unknown tag policy action '{action}' ({tag_policy.description})")
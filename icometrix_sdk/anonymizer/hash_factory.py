@@ -1,6 +1,8 @@
 import hashlib
+import threading
 from abc import abstractmethod
-from typing import get_args
+from collections import OrderedDict
+from typing import NamedTuple, get_args
 
 from icometrix_sdk.anonymizer.exceptions import HashAlgorithmException, HashSizeException
 from icometrix_sdk.anonymizer.models import HashAlgo
@@ -20,17 +22,104 @@ class HashFactory:
             raise HashAlgorithmException(f"No algorithm named {algo} is supported, valid values are {supported}")
 
 
+DEFAULT_CACHE_SIZE = 4096
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class _HashCache:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
 class HashMethod:
+    """
+    Base class of the hash methods
+
+    The same identifiers (StudyInstanceUID, PatientID, ...) occur in every file of a series, so the results of
+    :meth:`calculate_hash` are kept in a bounded LRU cache. Call :meth:`reset_cache` between batches to drop them.
+    The cache is created on first use, so subclasses don't have to call ``super().__init__()``.
+
+    :param cache_size: The maximum amount of cached hashes, 0 disables the cache
+    """
+
+    cache_size: int = DEFAULT_CACHE_SIZE
+
+    # Guards the creation of the cache of every instance
+    _cache_init_lock = threading.Lock()
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+
+    @property
+    def _cache(self) -> _HashCache:
+        cache = self.__dict__.get("_hash_cache")
+        if cache is None:
+            with HashMethod._cache_init_lock:
+                cache = self.__dict__.setdefault("_hash_cache", _HashCache())
+        return cache
+
+    def __getstate__(self):
+        # The lock can't be pickled, and the cache is not useful in another process
+        state = self.__dict__.copy()
+        state.pop("_hash_cache", None)
+        return state
+
     @abstractmethod
     def calculate_hash_from_bytes(self, input_obj: bytes) -> str:
         pass
 
     def calculate_hash(self, input_obj: str, encoding='utf-8') -> str:
-        return self.calculate_hash_from_bytes(input_obj.encode(encoding))
+        if not self.cache_size or not isinstance(input_obj, str):
+            return self.calculate_hash_from_bytes(input_obj.encode(encoding))
+
+        key = (input_obj, encoding)
+        cache = self._cache
+        with cache.lock:
+            hashed = cache.entries.get(key)
+            if hashed is not None:
+                cache.hits += 1
+                cache.entries.move_to_end(key)
+                return hashed
+            cache.misses += 1
+
+        hashed = self.calculate_hash_from_bytes(input_obj.encode(encoding))
+        with cache.lock:
+            cache.entries[key] = hashed
+            if len(cache.entries) > self.cache_size:
+                cache.entries.popitem(last=False)
+        return hashed
+
+    def cache_info(self) -> CacheInfo:
+        """
+        The hits, misses and size of the hash cache
+        """
+        cache = self._cache
+        with cache.lock:
+            return CacheInfo(cache.hits, cache.misses, len(cache.entries), self.cache_size)
+
+    def reset_cache(self):
+        """
+        Clear the hash cache and its counters, e.g. between batches
+        """
+        cache = self._cache
+        with cache.lock:
+            cache.entries.clear()
+            cache.hits = 0
+            cache.misses = 0
 
 
 class SHA3(HashMethod):
-    def __init__(self, size=256):
+    def __init__(self, size=256, cache_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(cache_size)
         acceptable_capacities = [224, 256, 384, 512]
         if size not in acceptable_capacities:
             raise f"Invalid capacity for SHA3, should be any of {acceptable_capacities}"
@@ -63,9 +152,6 @@ class ShortMD5(HashMethod):
     MD5 that is re-based to base10.
     """
 
-    def calculate_hash(self, input_obj: str, encoding='utf-8') -> str:
-        return self.calculate_hash_from_bytes(input_obj.encode(encoding))
-
     def calculate_hash_from_bytes(self, input_obj: bytes):
         md5_hash = MD5().calculate_hash_from_bytes(input_obj)
         return str(int(md5_hash, base=16))[:10]
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Literal, Callable
+from typing import Literal, Callable, Optional
 
 from pydicom import DataElement, Dataset
 
@@ -33,3 +33,19 @@ class TagPolicy:
 
 
 Policy = dict[int, TagPolicy]
+
+
+@dataclass
+class AnonymizationResult:
+    """
+    The result of anonymizing a single file in a batch
+
+    :param: The path of the original file
+    :param: The path of the anonymized file
+    :param: "anonymized", "skipped" (not a DICOM) or "failed"
+    :param: The error message of a failed file
+    """
+    in_path: str
+    out_path: str
+    status: Literal["anonymized", "skipped", "failed"]
+    error: Optional[str] = None
@@ -0,0 +1,72 @@
+"""
+Helpers to run an Anonymizer in worker processes
+
+The anonymizer is sent to every worker once, through the initializer of the process pool, instead of with every
+file. All policy actions (including the replace functions) need to be picklable, i.e. defined on module level.
+"""
+import os
+from io import BytesIO
+from typing import Optional, Tuple
+
+import pydicom
+from pydicom.errors import InvalidDicomError
+
+from icometrix_sdk.anonymizer.anonymizer import Anonymizer
+
+_anonymizer: Optional[Anonymizer] = None
+
+
+def init_worker(anonymizer: Anonymizer):
+    """
+    Initializer for a process pool, stores the anonymizer in the worker process
+    """
+    global _anonymizer
+    _anonymizer = anonymizer
+
+
+def anonymize_to_bytes(file_path: str) -> Optional[bytes]:
+    """
+    Anonymize a DICOM file with the anonymizer of this worker
+
+    :param file_path: The path to the DICOM file
+    :return: The anonymized DICOM file, or None if the file is not a DICOM
+    """
+    try:
+        dataset = pydicom.dcmread(file_path)
+    except InvalidDicomError:
+        return None
+
+    buffer = BytesIO()
+    _anonymizer.anonymize(dataset).save_as(buffer)
+    return buffer.getvalue()
+
+
+def anonymize_file_to(paths: Tuple[str, str]) -> bool:
+    """
+    Anonymize a DICOM file to an output path with the anonymizer of this worker,
+    see :meth:`~icometrix_sdk.anonymizer.anonymizer.Anonymizer.anonymize_file`
+
+    :param paths: A tuple of the input and output path
+    :return: False if the file is not a DICOM, nothing is written in that case
+    """
+    in_path, out_path = paths
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    try:
+        _anonymizer.anonymize_file(in_path, out_path)
+    except InvalidDicomError:
+        _remove(out_path)
+        return False
+    except BaseException:
+        # Don't leave a partially written file behind
+        _remove(out_path)
+        raise
+    return True
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -8,7 +8,7 @@ from icometrix_sdk.anonymizer.exceptions import PolicyException
 from icometrix_sdk.anonymizer.hash_factory import HashMethod, HashFactory
 from icometrix_sdk.anonymizer.models import Policy, TagPolicy
 from icometrix_sdk.anonymizer.policy import policy_sha, policy_md5, group_policy
-from icometrix_sdk.anonymizer.tests.utils import _ignore_tag
+from icometrix_sdk.anonymizer.tests.utils import _ignore_tag, create_trailing_dataset
 
 
 @pytest.fixture(scope="module")
@@ -67,3 +67,85 @@ def test_full_sha3(hash_algo: HashMethod):
             continue
 
         assert anonymized_ds[tag].value == expected_ds[tag].value
+
+
+def test_unknown_action(hash_algo: HashMethod):
+    with pytest.raises(PolicyException):
+        Anonymizer({0x00100010: TagPolicy("scramble", "PatientName")}, {}, hash_algo)
+
+    # Unknown group actions are ignored
+    anonymizer = Anonymizer({}, {0x0010: TagPolicy("scramble", "Patient group")}, hash_algo)
+    original_ds = pydicom.dcmread(f"datasets/original.dcm")
+    anonymized_ds = anonymizer.anonymize(copy.deepcopy(original_ds))
+    assert anonymized_ds.PatientName == original_ds.PatientName
+
+
+def test_assign_policy(hash_algo: HashMethod):
+    anonymizer = Anonymizer({0x0020000d: TagPolicy("keep", "StudyInstanceUID")}, {}, hash_algo)
+    original_ds = pydicom.dcmread(f"datasets/original.dcm")
+
+    anonymizer.policy = {0x0020000d: TagPolicy("hash", "StudyInstanceUID")}
+    md5_ds = anonymizer.anonymize(copy.deepcopy(original_ds))
+    assert md5_ds.StudyInstanceUID != original_ds.StudyInstanceUID
+
+    anonymizer.hash_algo = HashFactory.create_hash_method("sha3")
+    sha3_ds = anonymizer.anonymize(copy.deepcopy(original_ds))
+    assert sha3_ds.StudyInstanceUID not in (original_ds.StudyInstanceUID, md5_ds.StudyInstanceUID)
+
+    anonymizer.group_policy = {0x0018: TagPolicy("remove", "Group 18")}
+    assert 0x00180081 not in anonymizer.anonymize(copy.deepcopy(original_ds))
+
+    with pytest.raises(PolicyException):
+        anonymizer.policy = {0x0010: TagPolicy("keep", "Patient group")}
+
+
+def test_keep_pixel_data(hash_algo: HashMethod):
+    anonymizer = Anonymizer({0x7fe00010: TagPolicy("remove", "PixelData")}, {0x7fe0: TagPolicy("empty", "Pixels")},
+                            hash_algo)
+
+    original_ds = pydicom.dcmread(f"datasets/original.dcm")
+    anonymized_ds = anonymizer.anonymize(copy.deepcopy(original_ds))
+
+    assert anonymized_ds.PixelData == original_ds.PixelData
+
+
+def test_anonymize_multiple_datasets(hash_algo: HashMethod):
+    # The resolved handlers are cached between datasets
+    anonymizer = Anonymizer(policy_md5, group_policy, hash_algo)
+
+    original_ds = pydicom.dcmread(f"datasets/original.dcm")
+    first_ds = anonymizer.anonymize(copy.deepcopy(original_ds))
+    second_ds = anonymizer.anonymize(copy.deepcopy(original_ds))
+
+    assert first_ds == second_ds
+
+
+@pytest.mark.parametrize("skip_pixel_data", [True, False])
+def test_anonymize_file(hash_algo: HashMethod, tmp_path, skip_pixel_data: bool):
+    anonymizer = Anonymizer(policy_md5, group_policy, hash_algo)
+    out_path = str(tmp_path / "anonymized.dcm")
+
+    anonymizer.anonymize_file("datasets/original.dcm", out_path, skip_pixel_data=skip_pixel_data)
+
+    expected_ds = anonymizer.anonymize(pydicom.dcmread("datasets/original.dcm"))
+    anonymized_ds = pydicom.dcmread(out_path)
+    assert anonymized_ds == expected_ds
+    assert anonymized_ds.file_meta == expected_ds.file_meta
+    assert anonymized_ds.PixelData == expected_ds.PixelData
+
+
+@pytest.mark.parametrize("transfer_syntax", [None, pydicom.uid.ImplicitVRLittleEndian])
+def test_anonymize_file_trailing_elements(hash_algo: HashMethod, tmp_path, transfer_syntax: str):
+    anonymizer = Anonymizer(policy_md5, group_policy, hash_algo)
+    in_path, out_path = str(tmp_path / "original.dcm"), str(tmp_path / "anonymized.dcm")
+    create_trailing_dataset(in_path, transfer_syntax)
+
+    anonymizer.anonymize_file(in_path, out_path, skip_pixel_data=True)
+    anonymizer.anonymize_file(in_path, str(tmp_path / "expected.dcm"), skip_pixel_data=False)
+
+    with open(out_path, "rb") as fp:
+        assert b"John Doe" not in fp.read()
+    expected_ds = pydicom.dcmread(str(tmp_path / "expected.dcm"))
+    anonymized_ds = pydicom.dcmread(out_path)
+    assert anonymized_ds == expected_ds
+    assert anonymized_ds.PixelData == expected_ds.PixelData
@@ -48,3 +48,40 @@ def test_hash_ui_value(hash_algo: HashMethod):
     elem1 = DataElement(0x0020000D, "UI", value)
     hash_tag(elem1, hash_algo)
     assert elem1.value == expected
+
+
+def test_hash_cache():
+    hash_method = HashFactory.create_hash_method("md5")
+    value = "1.2.826.0.1.3680043.9.5542.5114248473116471214116117310121520961"
+
+    first = hash_method.calculate_hash(value)
+    assert hash_method.calculate_hash(value) == first
+    assert hash_method.calculate_hash_from_bytes(value.encode()) == first
+    assert hash_method.cache_info() == (1, 1, 1, hash_method.cache_size)
+
+    hash_method.reset_cache()
+    assert hash_method.cache_info() == (0, 0, 0, hash_method.cache_size)
+
+
+def test_hash_cache_is_bounded():
+    hash_method = HashFactory.create_hash_method("sha3")
+    hash_method.cache_size = 2
+    for value in ("a", "b", "c", "a"):
+        hash_method.calculate_hash(value)
+
+    info = hash_method.cache_info()
+    assert info.size == 2
+    assert info.misses == 4
+
+
+def test_hash_cache_without_super_init():
+    class CustomHash(HashMethod):
+        def __init__(self, prefix: str):
+            self.prefix = prefix
+
+        def calculate_hash_from_bytes(self, input_obj: bytes) -> str:
+            return self.prefix + input_obj.hex()
+
+    hash_method = CustomHash("x")
+    assert hash_method.calculate_hash("a") == hash_method.calculate_hash("a") == "x61"
+    assert hash_method.cache_info().hits == 1
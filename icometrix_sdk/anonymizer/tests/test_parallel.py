@@ -0,0 +1,73 @@
+import copy
+import os
+import pickle
+import shutil
+from io import BytesIO
+
+import pydicom
+import pytest
+
+from icometrix_sdk.anonymizer.anonymizer import Anonymizer
+from icometrix_sdk.anonymizer.hash_factory import HashMethod, HashFactory
+from icometrix_sdk.anonymizer.parallel import init_worker, anonymize_to_bytes
+from icometrix_sdk.anonymizer.policy import policy_md5, group_policy
+from icometrix_sdk.anonymizer.tests.utils import create_trailing_dataset
+
+
+@pytest.fixture(scope="module")
+def hash_algo() -> HashMethod:
+    return HashFactory.create_hash_method("md5")
+
+
+def test_anonymize_to_bytes(hash_algo: HashMethod):
+    anonymizer = Anonymizer(policy_md5, group_policy, hash_algo)
+    # The anonymizer is sent to the worker processes
+    init_worker(pickle.loads(pickle.dumps(anonymizer)))
+
+    expected_ds = anonymizer.anonymize(copy.deepcopy(pydicom.dcmread("datasets/original.dcm")))
+    anonymized_ds = pydicom.dcmread(BytesIO(anonymize_to_bytes("datasets/original.dcm")))
+
+    for element in expected_ds:
+        assert anonymized_ds[element.tag].value == element.value
+
+
+def test_anonymize_non_dicom(hash_algo: HashMethod, tmp_path):
+    init_worker(Anonymizer(policy_md5, group_policy, hash_algo))
+    text_file = tmp_path / "readme.txt"
+    text_file.write_text("Not a DICOM")
+
+    assert anonymize_to_bytes(str(text_file)) is None
+
+
+def test_anonymize_directory(hash_algo: HashMethod, tmp_path):
+    in_dir = tmp_path / "in"
+    (in_dir / "series").mkdir(parents=True)
+    shutil.copy("datasets/original.dcm", in_dir / "series" / "1.dcm")
+    (in_dir / "readme.txt").write_text("Not a DICOM")
+    # A truncated DICOM
+    (in_dir / "broken.dcm").write_bytes((in_dir / "series" / "1.dcm").read_bytes()[:1000])
+    out_dir = tmp_path / "out"
+
+    anonymizer = Anonymizer(policy_md5, group_policy, hash_algo)
+    results = {os.path.basename(r.in_path): r for r in anonymizer.anonymize_directory(str(in_dir), str(out_dir), 2)}
+
+    assert results["1.dcm"].status == "anonymized"
+    assert results["readme.txt"].status == "skipped"
+    assert results["broken.dcm"].status == "failed"
+    assert sorted(os.listdir(out_dir)) == ["series"]
+
+    expected_ds = anonymizer.anonymize(pydicom.dcmread("datasets/original.dcm"))
+    assert pydicom.dcmread(out_dir / "series" / "1.dcm") == expected_ds
+
+
+def test_anonymize_directory_trailing_elements(hash_algo: HashMethod, tmp_path):
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    create_trailing_dataset(str(in_dir / "1.dcm"))
+    out_dir = tmp_path / "out"
+
+    anonymizer = Anonymizer(policy_md5, group_policy, hash_algo)
+    results = list(anonymizer.anonymize_directory(str(in_dir), str(out_dir), 1))
+
+    assert [result.status for result in results] == ["anonymized"]
+    assert b"John Doe" not in (out_dir / "1.dcm").read_bytes()
@@ -1,3 +1,4 @@
+import pydicom
 from pydicom import Dataset, DataElement
 
 from icometrix_sdk.anonymizer.config import PATIENT_IDENTITY_REMOVED_TAG, DE_IDENTIFICATION_METHOD_TAG, \
@@ -31,3 +32,18 @@ def replace_by_value(value: str | int):
         el.value = value
 
     return replace_vl
+
+
+def create_trailing_dataset(path: str, transfer_syntax: str = None):
+    """
+    The original dataset with a private element after the pixel data
+    """
+    ds = pydicom.dcmread("datasets/original.dcm")
+    if transfer_syntax == pydicom.uid.ImplicitVRLittleEndian:
+        # Native (not encapsulated) pixel data
+        ds.PixelData = bytes(range(256)) * 16
+        ds.file_meta.TransferSyntaxUID = transfer_syntax
+        ds.is_implicit_VR = True
+    ds.add_new(0x7fe10010, "LO", "Private creator")
+    ds.add_new(0x7fe11010, "LO", "Patient John Doe secret")
+    ds.save_as(path, write_like_original=False)
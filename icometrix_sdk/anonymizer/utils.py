@@ -1,5 +1,9 @@
+import os
+import struct
+from typing import BinaryIO, Optional
+
 from pydicom import DataElement, Dataset
-from pydicom.valuerep import INT_VR, FLOAT_VR, validate_value, MAX_VALUE_LEN
+from pydicom.valuerep import INT_VR, FLOAT_VR, validate_value, MAX_VALUE_LEN, EXPLICIT_VR_LENGTH_32
 
 from icometrix_sdk.anonymizer.config import ROOT_UID, PATIENT_IDENTITY_REMOVED_TAG, DE_IDENTIFICATION_METHOD_TAG, \
     VALIDATION_MODE
@@ -17,8 +21,11 @@ def is_tag(tag: int) -> bool:
     return (tag >> 16) != 0
 
 
+PIXEL_DATA_TAG: int = 0x7fe00010
+
+
 def _is_pixel_data(tag: int) -> bool:
-    return tag == 0x7fe00010
+    return tag == PIXEL_DATA_TAG
 
 
 def _is_numeric_vr(vr: str) -> bool:
@@ -161,20 +168,119 @@ def add_de_identification_tags(dataset: Dataset) -> Dataset:
     return dataset
 
 
+# Shared by the replace functions, so their hashes are cached across datasets
+_short_md5 = ShortMD5()
+_short_sha3 = SHA3(size=512)
+
+
+def reset_hash_caches():
+    """
+    Clear the hash caches of the replace functions (short_md5_hash, short_sha3_hash)
+    """
+    _short_md5.reset_cache()
+    _short_sha3.reset_cache()
+
+
 def short_md5_hash(element: DataElement, _):
     value = element.value
     if len(value) % 2 != 0:
         value += " "
-    element.value = ShortMD5().calculate_hash(value)
+    element.value = _short_md5.calculate_hash(value)
 
 
 def short_sha3_hash(element: DataElement, _):
     value = str(element.value)
     if len(value) % 2 != 0:
         value += " "
-    element.value = SHA3(size=512).calculate_hash(value)[:10]
+    element.value = _short_sha3.calculate_hash(value)[:10]
 
 
 def remove_if_birthday(element: DataElement, ds: Dataset):
     if ds[0x00100030].value:
         del ds[element.tag]
+
+
+def copy_file_range(src_fp: BinaryIO, dst_fp: BinaryIO, offset: int, end: Optional[int] = None):
+    """
+    Append the bytes of a source file, from an offset up to an end offset (or the end of the file),
+    to a destination file.
+    The copy is done in the kernel when possible (copy_file_range/sendfile), without passing the data through Python.
+    """
+    dst_fp.flush()
+    src_fd, dst_fd = src_fp.fileno(), dst_fp.fileno()
+    count = (os.fstat(src_fd).st_size if end is None else end) - offset
+
+    for kernel_copy in (_copy_file_range, _sendfile):
+        try:
+            while count > 0:
+                copied = kernel_copy(src_fd, dst_fd, offset, count)
+                if copied == 0:
+                    break
+                offset += copied
+                count -= copied
+            return
+        except (AttributeError, OSError):
+            # Not available on this OS or file system, continue where the copy stopped
+            continue
+
+    src_fp.seek(offset)
+    while count > 0:
+        chunk = src_fp.read(min(count, 1024 * 1024))
+        if not chunk:
+            break
+        dst_fp.write(chunk)
+        count -= len(chunk)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count, offset)
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+_ITEM_TAG = (0xfffe, 0xe000)
+_SEQUENCE_DELIMITER_TAG = (0xfffe, 0xe0dd)
+_UNDEFINED_LENGTH = 0xffffffff
+
+
+def find_element_end(fp: BinaryIO, offset: int, is_implicit_vr: bool, is_little_endian: bool) -> Optional[int]:
+    """
+    Find the end of the (top level) data element that starts at an offset, without reading its value.
+    An element of undefined length (encapsulated pixel data) ends after its sequence delimiter.
+
+    :return: The offset after the element, or None when the element can't be parsed
+    """
+    endian = "<" if is_little_endian else ">"
+    fp.seek(offset)
+    header = fp.read(8)
+    if len(header) < 8:
+        return None
+    if is_implicit_vr:
+        length, = struct.unpack(f"{endian}L", header[4:])
+    elif header[4:6].decode("latin-1") in EXPLICIT_VR_LENGTH_32:
+        extra = fp.read(4)
+        if len(extra) < 4:
+            return None
+        length, = struct.unpack(f"{endian}L", extra)
+        offset += 4
+    else:
+        length, = struct.unpack(f"{endian}H", header[6:])
+    offset += 8
+    if length != _UNDEFINED_LENGTH:
+        return offset + length
+
+    # Encapsulated: a sequence of items, each with a defined length, ended by a sequence delimiter
+    while True:
+        fp.seek(offset)
+        item = fp.read(8)
+        if len(item) < 8:
+            return None
+        group, element, item_length = struct.unpack(f"{endian}HHL", item)
+        offset += 8
+        if (group, element) == _SEQUENCE_DELIMITER_TAG:
+            return offset
+        if (group, element) != _ITEM_TAG or item_length == _UNDEFINED_LENGTH:
+            return None
+        offset += item_length
@@ -12,6 +12,9 @@ SESSION_URI = "/authentication-service/api/v1/sessions"
 class AuthenticationMethod(ABC):
     """
     Interface for authentication methods
+
+    The result of the api calls should be returned, so the same method can be used by an
+    :class:`~icometrix_sdk.utils.api_client.AsyncApiClient`, which will await it.
     """
 
     @abstractmethod
@@ -22,6 +25,13 @@ class AuthenticationMethod(ABC):
     def disconnect(self, api: ApiClient):
         pass
 
+    def identity(self) -> Optional[str]:
+        """
+        Identifies the user, e.g. to keep the cached responses of different users apart.
+        Return None when unknown, the cached responses are then private to the client.
+        """
+        return None
+
 
 class PasswordAuthentication(AuthenticationMethod):
     """
@@ -34,11 +44,14 @@ class PasswordAuthentication(AuthenticationMethod):
 
     def connect(self, api: ApiClient):
         data = {"email": self.email, "password": self.password}
-        api.post(SESSION_URI, data=data)
+        return api.post(SESSION_URI, data=data)
 
     def disconnect(self, api: ApiClient):
         if api:
-            api.delete(SESSION_URI)
+            return api.delete(SESSION_URI)
+
+    def identity(self) -> Optional[str]:
+        return self.email
 
 
 class TokenAuthentication(AuthenticationMethod):
@@ -51,11 +64,14 @@ class TokenAuthentication(AuthenticationMethod):
 
     def connect(self, api: ApiClient):
         data = {"key": self.token}
-        api.post(TOKEN_URI, data=data)
+        return api.post(TOKEN_URI, data=data)
 
     def disconnect(self, api: ApiClient):
         if api:
-            api.delete(SESSION_URI)
+            return api.delete(SESSION_URI)
+
+    def identity(self) -> Optional[str]:
+        return self.token
 
 
 def get_auth_method() -> Optional[AuthenticationMethod]:
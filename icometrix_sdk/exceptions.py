@@ -34,5 +34,13 @@ class WaitTimeoutException(IcometrixException):
     ...
 
 
+class WaitCancelledException(IcometrixException):
+    ...
+
+
 class IcometrixUnusableReportException(IcometrixException):
     pass
+
+
+class IcometrixIntegrityException(IcometrixException):
+    fmt = "Downloaded file is incomplete or corrupted"
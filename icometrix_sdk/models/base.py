@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Generic, TypeVar, List, Optional, Iterator, Literal
+from typing import Any, Generic, TypeVar, List, Optional, Iterator, Literal
 
 from pydantic import BaseModel, BeforeValidator
 from typing_extensions import Annotated
@@ -18,11 +18,14 @@ def utc_datetime_parser(v: str | datetime | None) -> datetime | None:
     if isinstance(v, datetime):
         return v.replace(tzinfo=timezone.utc)
 
-    datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
-    if "+" in v:
-        datetime_format = "%Y-%m-%dT%H:%M:%S.%f%z"
-
-    input_datetime = datetime.strptime(v, datetime_format)
+    try:
+        input_datetime = datetime.fromisoformat(v)
+    except ValueError:
+        # Before python 3.11, fromisoformat only parses fractions of 3 or 6 digits and offsets with a colon
+        datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
+        if "+" in v:
+            datetime_format = "%Y-%m-%dT%H:%M:%S.%f%z"
+        input_datetime = datetime.strptime(v, datetime_format)
     return input_datetime.replace(tzinfo=timezone.utc)
 
 
@@ -51,6 +54,12 @@ class PaginatedMetaData(BaseModel):
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
+    """
+    A page of entities
+
+    Parametrising the generic model (``PaginatedResponse[StudyEntity]``) is relatively slow, the models define
+    their page type once (e.g. :data:`~icometrix_sdk.models.study_entity.StudyPage`) to use on every request.
+    """
     meta_data: PaginatedMetaData
     results: List[T]
     _itr_index: int
@@ -80,3 +89,20 @@ class PaginatedResponse(BaseModel, Generic[T]):
 
     def __len__(self) -> int:
         return len(self.results)
+
+
+class BulkResult(BaseModel, Generic[T]):
+    """
+    The result of one item of a bulk operation, e.g. :meth:`~icometrix_sdk.resources.studies.Studies.get_many`
+
+    :param key: The input item
+    :param value: The result, None when the item failed
+    :param error: The error message of a failed item
+    """
+    key: Any
+    value: Optional[T] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -2,7 +2,7 @@ from typing import Optional, Union, List, Literal
 
 from pydantic import BaseModel
 
-from icometrix_sdk.models.base import BackendEntity
+from icometrix_sdk.models.base import BackendEntity, PaginatedResponse
 
 CustomerReportStatus = Literal["Imported", "Scheduled", "Processing", "QualityControl", "Finished"]
 
@@ -53,3 +53,13 @@ class CustomerReportEntity(BackendEntity):
 
     def __repr__(self):
         return str(self)
+
+
+class FileDownloadResult(BaseModel):
+    name: str
+    path: str
+    size: Optional[int] = None
+    error: Optional[str] = None
+
+
+CustomerReportPage = PaginatedResponse[CustomerReportEntity]
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing_extensions import Optional
 
-from icometrix_sdk.models.base import BackendEntity
+from icometrix_sdk.models.base import BackendEntity, PaginatedResponse
 
 
 class CustomerResultPipelineResults(BaseModel):
@@ -16,3 +16,6 @@ class CustomerResultEntity(BackendEntity):
     project_id: str
     qc_result_id: str
     pipeline_results: CustomerResultPipelineResults
+
+
+CustomerResultPage = PaginatedResponse[CustomerResultEntity]
@@ -1,6 +1,6 @@
 from typing import Optional, Union
 
-from icometrix_sdk.models.base import BackendEntity, utc_datetime
+from icometrix_sdk.models.base import BackendEntity, utc_datetime, PaginatedResponse
 
 
 class PatientEntity(BackendEntity):
@@ -29,3 +29,6 @@ class PatientEntity(BackendEntity):
     encrypted_patient_id: Optional[str] = None
     encrypted_patient_name: Optional[str] = None
     encrypted_patient_birth_date: Optional[str] = None
+
+
+PatientPage = PaginatedResponse[PatientEntity]
@@ -1,6 +1,6 @@
 from typing import Optional, Literal, Union, Any
 
-from icometrix_sdk.models.base import BackendEntity
+from icometrix_sdk.models.base import BackendEntity, PaginatedResponse
 
 PipelineResultType = Literal[
     "unusable_finalization",
@@ -39,3 +39,6 @@ class PipelineResultEntity(BackendEntity):
     run_parameters: dict
     automatic_qc_results: Optional[dict] = None
     software_version_data: dict
+
+
+PipelineResultPage = PaginatedResponse[PipelineResultEntity]
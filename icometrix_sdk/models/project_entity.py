@@ -1,6 +1,6 @@
 from typing import Optional
 
-from icometrix_sdk.models.base import BackendEntity, utc_datetime
+from icometrix_sdk.models.base import BackendEntity, utc_datetime, PaginatedResponse
 
 
 class ProjectEntity(BackendEntity):
@@ -13,3 +13,6 @@ class ProjectEntity(BackendEntity):
     project_type: Optional[str] = None
     processing_type: Optional[str] = None
     imported_timestamp: Optional[utc_datetime] = None
+
+
+ProjectPage = PaginatedResponse[ProjectEntity]
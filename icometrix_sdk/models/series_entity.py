@@ -1,4 +1,4 @@
-from icometrix_sdk.models.base import BackendEntity, utc_datetime
+from icometrix_sdk.models.base import BackendEntity, utc_datetime, PaginatedResponse
 
 
 class SeriesEntity(BackendEntity):
@@ -36,3 +36,6 @@ class SeriesEntity(BackendEntity):
     magnetic_field_strength: str
     maximum_slice_increment: float  # available after preprocessing
     expected_images_in_acquisition: str
+
+
+SeriesPage = PaginatedResponse[SeriesEntity]
@@ -1,9 +1,15 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from pydantic import field_validator
 
 from icometrix_sdk.exceptions import IcometrixInvalidInputDataException
-from icometrix_sdk.models.base import BackendEntity, DicomModality, utc_datetime
+from icometrix_sdk.models.base import BackendEntity, DicomModality, utc_datetime, PaginatedResponse
+
+
+class StudyIds(NamedTuple):
+    project_id: str
+    patient_id: str
+    study_id: str
 
 
 class StudyEntity(BackendEntity):
@@ -34,3 +40,6 @@ class StudyEntity(BackendEntity):
         else:
             raise IcometrixInvalidInputDataException(
                 "Study date does not follow DICOM format (e.g. 20220117)")
+
+
+StudyPage = PaginatedResponse[StudyEntity]
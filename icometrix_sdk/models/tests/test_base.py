@@ -0,0 +1,67 @@
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from icometrix_sdk.models.base import utc_datetime_parser, BackendEntity
+
+# The formats sent by the backend
+TIMESTAMPS = [
+    "2024-01-02T03:04:05.123456",
+    "2024-01-02T03:04:05.123",
+    "2024-01-02T03:04:05.1",
+    "2024-01-02T03:04:05.000000",
+    "2024-12-31T23:59:59.999999",
+    "2024-01-02T03:04:05.123456+00:00",
+    "2024-01-02T03:04:05.123+02:00",
+    "2024-01-02T03:04:05.123456+0000",
+    "2024-01-02T03:04:05.5+0130",
+]
+
+
+def strptime_utc_datetime_parser(v):
+    """
+    The previous, strptime based, implementation
+    """
+    if not v:
+        return None
+    if isinstance(v, datetime):
+        return v.replace(tzinfo=timezone.utc)
+
+    datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
+    if "+" in v:
+        datetime_format = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+    input_datetime = datetime.strptime(v, datetime_format)
+    return input_datetime.replace(tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("timestamp", TIMESTAMPS)
+def test_equivalent_to_strptime(timestamp):
+    parsed = utc_datetime_parser(timestamp)
+
+    assert parsed == strptime_utc_datetime_parser(timestamp)
+    assert parsed.tzinfo is timezone.utc
+
+
+@pytest.mark.parametrize("value", [None, "", datetime(2024, 1, 2, 3, 4, 5),
+                                   datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2)))])
+def test_empty_and_datetime(value):
+    assert utc_datetime_parser(value) == strptime_utc_datetime_parser(value)
+
+
+def test_offset_is_replaced():
+    # The wall time is kept, the offset is replaced by UTC (not converted)
+    assert utc_datetime_parser("2024-01-02T03:04:05.123+02:00") == \
+           datetime(2024, 1, 2, 3, 4, 5, 123000, tzinfo=timezone.utc)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        utc_datetime_parser("02/01/2024 03:04:05")
+
+
+def test_backend_entity():
+    entity = BackendEntity(id="1", update_timestamp=TIMESTAMPS[0], creation_timestamp=None)
+
+    assert entity.update_timestamp == datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    assert entity.creation_timestamp is None
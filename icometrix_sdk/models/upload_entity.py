@@ -2,7 +2,7 @@ from typing import Optional, List, Union, Literal
 
 from pydantic import BaseModel
 
-from icometrix_sdk.models.base import BackendEntity
+from icometrix_sdk.models.base import BackendEntity, PaginatedResponse
 
 SuggestedReportTypes = Literal["icobrain_ms", "icobrain_dm", "icobrain_tbi"]
 
@@ -47,3 +47,13 @@ class StudyUploadEntity(BackendEntity):
 
 class UploadEntityFiles(BaseModel):
     files: List[str]
+
+
+class FileUploadResult(BaseModel):
+    path: str
+    status: Literal["uploaded", "skipped", "failed"]
+    error: Optional[str] = None
+
+
+UploadPage = PaginatedResponse[UploadEntity]
+StudyUploadPage = PaginatedResponse[StudyUploadEntity]
@@ -1,17 +1,33 @@
 import logging
 import os
-from time import sleep
-from typing import Optional, Dict, List
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, List, Sequence
 
-from icometrix_sdk.exceptions import IcometrixDataImportException
+from requests.adapters import DEFAULT_POOLSIZE
+
+from icometrix_sdk.exceptions import IcometrixDataImportException, IcometrixException, WaitTimeoutException
 from icometrix_sdk.logger import logger_name
-from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.customer_report_entity import CustomerReportEntity, CustomerReportFile
-from icometrix_sdk.utils.paginator import get_paginator
+from icometrix_sdk.models.base import PaginatedResponse, BulkResult
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity, CustomerReportPage, CustomerReportFile, \
+    FileDownloadResult
+from icometrix_sdk.utils.concurrency import bounded_map, bulk_map
+from icometrix_sdk.utils.paginator import iter_items
 from icometrix_sdk.utils.requests_api_client import ApiClient
+from icometrix_sdk.utils.wait import Backoff, CallbackPool, wait_for, wait_for_many
 
 logger = logging.getLogger(logger_name)
 
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_WAIT_WORKERS = 8
+
+# Query of a status sweep, see CustomerReports.wait_for_results_in_project
+SWEEP_PARAMS = {"status": "Finished", "sort": "-update_timestamp"}
+# Only list the reports updated since the previous sweep
+SWEEP_SINCE_PARAM = "update_timestamp_from"
+# Margin on the update timestamp of the previous sweep, for reports that were updated during that sweep
+SWEEP_OVERLAP = timedelta(seconds=30)
+
 
 class CustomerReports:
     def __init__(self, api: ApiClient, polling_interval=2):
@@ -26,18 +42,17 @@ class CustomerReports:
         :return: A Paginated response containing customer-reports
         """
 
-        page = self._api.get(f"/customer-reports-service/api/v2/projects/{project_id}/customer-reports", **kwargs)
-        return PaginatedResponse[CustomerReportEntity](**page)
+        return self._api.get_as(f"/customer-reports-service/api/v2/projects/{project_id}/customer-reports",
+                                CustomerReportPage, **kwargs)
 
-    def get_one(self, customer_report_uri: str) -> CustomerReportEntity:
+    def get_one(self, customer_report_uri: str, **kwargs) -> CustomerReportEntity:
         """
         Get a single customer-report based on the customer-report uri
 
         :param customer_report_uri: the uri of the customer-report
         :return: A single customer-report or 404
         """
-        resp = self._api.get(customer_report_uri)
-        return CustomerReportEntity(**resp)
+        return self._api.get_as(customer_report_uri, CustomerReportEntity, **kwargs)
 
     def get_all_for_study(self, study_uri: str, **kwargs) -> PaginatedResponse[CustomerReportEntity]:
         """
@@ -50,84 +65,211 @@ class CustomerReports:
                      .replace("/studies-service/", "/customer-reports-service/")
                      .replace("/storage-service/", "/customer-reports-service/")
                      .replace("/v1/", "/v2/"))
-        page = self._api.get(f"{study_uri}/customer-reports", **kwargs)
-        return PaginatedResponse[CustomerReportEntity](**page)
+        return self._api.get_as(f"{study_uri}/customer-reports", CustomerReportPage, **kwargs)
+
+    def get_all_for_studies(self, study_uris: Sequence[str], workers: int = DEFAULT_POOLSIZE,
+                            complete_on_error=False, **kwargs) -> List[BulkResult[List[CustomerReportEntity]]]:
+        """
+        List all customer-reports (of all pages) for many studies, the studies are requested concurrently
+
+        :param study_uris: The uris of the studies
+        :param workers: The amount of concurrent requests
+        :param complete_on_error: Setting this boolean to true will return the studies that failed with their error,
+            instead of raising the first exception
+        :param kwargs: Extra arguments for :meth:`get_all_for_study`
+        :return: A result per study with its customer-reports, in the order of the study uris
+        """
+        return bulk_map(lambda study_uri: list(iter_items(self.get_all_for_study, study_uri=study_uri, **kwargs)),
+                        study_uris, workers, complete_on_error)
 
-    def download_customer_report_files(self, customer_report: CustomerReportEntity, out_path: str):
+    def download_customer_report_files(self, customer_report: CustomerReportEntity, out_path: str,
+                                       workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                                       complete_on_error=False) -> List[FileDownloadResult]:
         """
         Download all files created by icobrain for a customer_report
 
+        The files are downloaded concurrently. Every file is written to a temporary file first and only moved to
+        its final path once its size has been verified, so a failed download never leaves a partial file behind.
+
         :param customer_report: The customer report you want to download the files from
         :param out_path: A folder path to write the files to
-        :return:
+        :param workers: The amount of files downloaded at once
+        :param complete_on_error: Setting this boolean to true will download the other files when a download fails,
+            instead of raising the exception
+        :return: A result per report file, in the order of the report files
         """
-        if not os.path.isdir(out_path):
-            os.mkdir(out_path)
+        os.makedirs(out_path, exist_ok=True)
 
-        for report_file in customer_report.report_files:
-            out_path_file = f"{out_path}/{report_file.name}"
-            self.download_customer_report_file(report_file, out_path_file)
+        def download(report_file: CustomerReportFile) -> int:
+            return self.download_customer_report_file(report_file, f"{out_path}/{report_file.name}")
 
-    def download_customer_report_file(self, customer_report_file: CustomerReportFile, out_path: Optional[str] = None):
+        results = []
+        for report_file, future in bounded_map(download, customer_report.report_files, workers, ordered=True):
+            result = FileDownloadResult(name=report_file.name, path=f"{out_path}/{report_file.name}")
+            try:
+                result.size = future.result()
+            except IcometrixException as e:
+                logger.error(f"Failed to download {report_file}: {e}")
+                if not complete_on_error:
+                    raise e
+                result.error = str(e)
+            results.append(result)
+        return results
+
+    def download_customer_report_file(self, customer_report_file: CustomerReportFile,
+                                      out_path: Optional[str] = None) -> int:
         """
         Download a file created by icobrain for a customer_report
 
         :param customer_report_file: The file entity you want to download
         :param out_path: A path to write the file to
-        :return:
+        :return: The size of the file
         """
         if not out_path:
             out_path = customer_report_file.name
         logger.info(f"Downloading {customer_report_file} -> {out_path}")
-        self._api.stream_file(customer_report_file.uri, out_path)
+        return self._api.stream_file(customer_report_file.uri, out_path)
 
     def wait_for_customer_report_for_study(self, project_id: str,
                                            study_instance_uid: str,
-                                           report_type: str) -> CustomerReportEntity:
+                                           report_type: str, timeout: float = 20) -> CustomerReportEntity:
         """
         After data has been imported a customer report will be created
 
         :param project_id: The ID of the project you want to search under
         :param study_instance_uid: The study instance UID from the DICOM
         :param report_type: The requested report type
+        :param timeout: The maximum time to wait (in seconds)
         :return:
         """
-        max_wait = 20  # sec (approx...)
-        max_count = round(max_wait / self.polling_interval)
-        count = 0
-        while True:
-            count += 1
+
+        def find_report() -> Optional[CustomerReportEntity]:
             logger.info(f"Searching {report_type} report for {study_instance_uid} in {project_id}")
             params = {"study_instance_uid": study_instance_uid}
-            for page in get_paginator(self.get_all, project_id=project_id, params=params):
-                for report in page:
-                    if report.icobrain_report_type == report_type:
-                        return report
-            if count >= max_count:
-                raise IcometrixDataImportException(f"Failed to find a CustomerReport for {study_instance_uid}")
-            sleep(self.polling_interval)
+            reports = iter_items(self.get_all, project_id=project_id, params=params, raw=False)
+            return next((report for report in reports if report.icobrain_report_type == report_type), None)
+
+        try:
+            return wait_for(find_report, lambda report: report is not None, timeout,
+                            Backoff(initial=self.polling_interval, maximum=timeout / 2))
+        except WaitTimeoutException as e:
+            raise IcometrixDataImportException(f"Failed to find a CustomerReport for {study_instance_uid}") from e
 
-    def wait_for_results(self, customer_reports: List[CustomerReportEntity]) -> List[CustomerReportEntity]:
+    def wait_for_results(self, customer_reports: List[CustomerReportEntity], timeout: Optional[float] = None,
+                         workers: int = DEFAULT_WAIT_WORKERS, max_interval: float = 60,
+                         max_requests_per_cycle: Optional[int] = None,
+                         on_finished: Optional[Callable[[CustomerReportEntity], None]] = None,
+                         cancel: Optional[threading.Event] = None) -> List[CustomerReportEntity]:
         """
         Wait until processing has finished and the result files are available on the customer report
 
+        The unfinished reports are checked concurrently. Every report is checked again after an exponential
+        backoff, starting from the polling interval, so reports that take long are not checked every cycle.
+
         :param customer_reports: A list of customer reports
-        :return:
+        :param timeout: The maximum time to wait (in seconds), raises a WaitTimeoutException when exceeded
+        :param workers: The amount of concurrent status checks
+        :param max_interval: The maximum time between two checks of a report (in seconds)
+        :param max_requests_per_cycle: The maximum amount of status checks at once
+        :param on_finished: Called as soon as a report has finished, e.g. to start downloading its files. It runs in
+            its own thread, so it doesn't delay the status checks. The function returns once all calls finished.
+        :param cancel: An event to stop waiting from another thread
+        :return: The finished customer reports, in the order they finished
         """
-        customer_report_uris = [customer_report.uri for customer_report in customer_reports]
 
+        def check(customer_report_uri: str) -> CustomerReportEntity:
+            report = self.get_one(customer_report_uri, raw=False)
+            logger.info(f"Finished {report}" if report.status == "Finished" else f"Waiting for {report}")
+            return report
+
+        finished_customer_reports = wait_for_many(
+            check,
+            dict.fromkeys(customer_report.uri for customer_report in customer_reports),
+            lambda report: report.status == "Finished",
+            timeout=timeout,
+            backoff=Backoff(initial=self.polling_interval, maximum=max_interval),
+            workers=workers,
+            max_requests_per_cycle=max_requests_per_cycle,
+            on_done=(lambda uri, report: on_finished(report)) if on_finished else None,
+            cancel=cancel)
+        return list(finished_customer_reports.values())
+
+    def wait_for_results_in_project(self, project_id: str, customer_reports: List[CustomerReportEntity],
+                                    timeout: Optional[float] = None, max_interval: float = 30,
+                                    page_size: int = 100,
+                                    on_finished: Optional[Callable[[CustomerReportEntity], None]] = None,
+                                    cancel: Optional[threading.Event] = None) -> List[CustomerReportEntity]:
+        """
+        Wait until processing has finished for many customer reports of a project
+
+        Instead of requesting every report (see :meth:`wait_for_results`), the finished reports of the project are
+        listed, most recently updated first, and compared with the reports that are waited for. After the first
+        sweep, only the reports updated since the previous sweep are requested. This takes a few requests per sweep,
+        independent of the amount of reports.
+
+        The status, sort and timestamp filters are only a hint for the server, every listed report is checked
+        again. When the server doesn't filter on the timestamp, a sweep stops at the reports that were already seen
+        in the previous sweep, but only once a complete sweep confirmed that the server sorts the reports.
+
+        :param project_id: The ID of the project of the customer reports
+        :param customer_reports: A list of customer reports
+        :param timeout: The maximum time to wait (in seconds), raises a WaitTimeoutException when exceeded
+        :param max_interval: The maximum time between two sweeps (in seconds)
+        :param page_size: The page size of a sweep
+        :param on_finished: Called as soon as a report has finished, e.g. to start downloading its files. It runs in
+            its own thread, so it doesn't delay the sweeps. The function returns once all calls finished.
+        :param cancel: An event to stop waiting from another thread
+        :return: The finished customer reports, in the order they finished
+        """
+        pending = {customer_report.id for customer_report in customer_reports}
         finished_customer_reports: Dict[str, CustomerReportEntity] = {}
-        while len(finished_customer_reports) != len(customer_reports):
-            for customer_report_uri in customer_report_uris:
-                if customer_report_uri in finished_customer_reports:
-                    continue
-
-                report = self.get_one(customer_report_uri)
-                if report.status != "Finished":
-                    logger.info(f"Waiting for {report}")
-                    continue
-
-                logger.info(f"Finished {report}")
-                finished_customer_reports[report.uri] = report
-            sleep(self.polling_interval)
-        return [value for value in finished_customer_reports.values()]
+        # The newest update timestamp of the previous sweep
+        since: Optional[datetime] = None
+        # Set when a complete sweep was sorted on the update timestamp
+        sorted_by_server = False
+
+        def sweep() -> int:
+            nonlocal since, sorted_by_server
+            callbacks.check()
+            logger.info(f"Sweeping project {project_id} for {len(pending)} unfinished reports")
+            params = dict(SWEEP_PARAMS)
+            if since:
+                params[SWEEP_SINCE_PARAM] = since.isoformat()
+            stop_early = sorted_by_server and since is not None
+
+            newest: Optional[datetime] = None
+            previous: Optional[datetime] = None
+            ordered = True
+            timestamps = 0
+            for report in iter_items(self.get_all, page_size=page_size, project_id=project_id, params=params,
+                                     raw=False):
+                timestamp = report.update_timestamp
+                if timestamp:
+                    timestamps += 1
+                    if previous and timestamp > previous:
+                        ordered = False
+                    previous = timestamp
+                    newest = timestamp if newest is None else max(newest, timestamp)
+                    if stop_early and ordered and timestamp < since:
+                        break
+
+                if report.id in pending and report.status == "Finished":
+                    logger.info(f"Finished {report}")
+                    pending.discard(report.id)
+                    finished_customer_reports[report.id] = report
+                    if on_finished is not None:
+                        callbacks.submit(on_finished, report)
+
+            if not ordered:
+                sorted_by_server = False
+            elif not stop_early and timestamps > 1:
+                sorted_by_server = True
+            if newest:
+                since = newest - SWEEP_OVERLAP
+            return len(pending)
+
+        with CallbackPool() as callbacks:
+            wait_for(sweep, lambda unfinished: unfinished == 0, timeout,
+                     Backoff(initial=self.polling_interval, maximum=max_interval), cancel)
+            callbacks.join()
+        return list(finished_customer_reports.values())
@@ -2,7 +2,7 @@ import logging
 
 from icometrix_sdk.logger import logger_name
 from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.customer_result_entity import CustomerResultEntity
+from icometrix_sdk.models.customer_result_entity import CustomerResultEntity, CustomerResultPage
 from icometrix_sdk.utils.requests_api_client import ApiClient
 
 logger = logging.getLogger(logger_name)
@@ -20,8 +20,7 @@ class CustomerResults:
         :return: A Paginated response containing customer-results
         """
 
-        page = self._api.get(f"{study_uri}/customer-results", **kwargs)
-        return PaginatedResponse[CustomerResultEntity](**page)
+        return self._api.get_as(f"{study_uri}/customer-results", CustomerResultPage, **kwargs)
 
     def get_all_for_patient(self, patient_uri: str, **kwargs) -> PaginatedResponse[CustomerResultEntity]:
         """
@@ -31,8 +30,7 @@ class CustomerResults:
         :return: A Paginated response containing customer-results
         """
 
-        page = self._api.get(f"{patient_uri}/customer-results", **kwargs)
-        return PaginatedResponse[CustomerResultEntity](**page)
+        return self._api.get_as(f"{patient_uri}/customer-results", CustomerResultPage, **kwargs)
 
     def get_all_for_pipeline_result(self, pipeline_result_uri: str, **kwargs) -> \
             PaginatedResponse[CustomerResultEntity]:
@@ -43,15 +41,13 @@ class CustomerResults:
         :return: A Paginated response containing customer-results
         """
 
-        page = self._api.get(f"{pipeline_result_uri}/customer-results", **kwargs)
-        return PaginatedResponse[CustomerResultEntity](**page)
+        return self._api.get_as(f"{pipeline_result_uri}/customer-results", CustomerResultPage, **kwargs)
 
-    def get_one(self, customer_result_uri: str) -> CustomerResultEntity:
+    def get_one(self, customer_result_uri: str, **kwargs) -> CustomerResultEntity:
         """
         Get a single customer-result based on the customer-result uri
 
         :param customer_result_uri: the uri of the customer-result
         :return: A single customer-result or 404
         """
-        resp = self._api.get(customer_result_uri)
-        return CustomerResultEntity(**resp)
+        return self._api.get_as(customer_result_uri, CustomerResultEntity, **kwargs)
@@ -1,5 +1,5 @@
 from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.patient_entity import PatientEntity
+from icometrix_sdk.models.patient_entity import PatientEntity, PatientPage
 from icometrix_sdk.utils.requests_api_client import ApiClient
 
 
@@ -14,8 +14,7 @@ class Patients:
         :param: The uri of the project
         :return: A Paginated response containing patients
         """
-        page = self._api.get(f"{project_uri}/patients", **kwargs)
-        return PaginatedResponse[PatientEntity](**page)
+        return self._api.get_as(f"{project_uri}/patients", PatientPage, **kwargs)
 
     def get_one(self, patient_uri: str, **kwargs) -> PatientEntity:
         """
@@ -24,5 +23,4 @@ class Patients:
         :param patient_uri: the uri of the patient
         :return: A single patient or 404
         """
-        resp = self._api.get(patient_uri, **kwargs)
-        return PatientEntity(**resp)
+        return self._api.get_as(patient_uri, PatientEntity, **kwargs)
@@ -1,13 +1,17 @@
 import logging
+from typing import Optional, Sequence
 
 from icometrix_sdk.logger import logger_name
 from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.pipeline_result_entity import PipelineResultEntity
-from icometrix_sdk.utils.paginator import get_paginator
+from icometrix_sdk.models.pipeline_result_entity import PipelineResultEntity, PipelineResultPage
+from icometrix_sdk.utils.paginator import iter_items
 from icometrix_sdk.utils.requests_api_client import ApiClient
 
 logger = logging.getLogger(logger_name)
 
+# The fields of a pipeline result that are needed to find the pipeline result of a job, see get_one_for_job
+SCAN_FIELDS = ["id", "uri", "job_id"]
+
 
 class PipelineResults:
     def __init__(self, api: ApiClient):
@@ -22,22 +26,27 @@ class PipelineResults:
         """
 
         study_uri = study_uri.replace("/v1/", "/v2/")
-        page = self._api.get(f"{study_uri}/pipeline-results", **kwargs)
-        return PaginatedResponse[PipelineResultEntity](**page)
+        return self._api.get_as(f"{study_uri}/pipeline-results", PipelineResultPage, **kwargs)
 
-    def get_one_for_job(self, study_uri: str, job_id: str) -> PipelineResultEntity | None:
+    def get_one_for_job(self, study_uri: str, job_id: str,
+                        fields: Optional[Sequence[str]] = None) -> PipelineResultEntity | None:
         """
         Get a pipeline result for a job
 
         :param study_uri: The uri of a study
         :param job_id: The id of the job
+        :param fields: Only request these fields while searching (e.g. :data:`SCAN_FIELDS`), the pipeline result of
+            the job is then requested completely. This saves transferring the (large) results of the other pipeline
+            results of a study, at the cost of one extra request.
         """
-        page = get_paginator(self.get_all_for_study, study_uri=study_uri)
-        for pipeline_results in page:
-            for pipeline_result in pipeline_results:
-                if pipeline_result.job_id == job_id:
-                    return pipeline_result
-        return None
+        if fields is None:
+            pipeline_results = iter_items(self.get_all_for_study, study_uri=study_uri, raw=False)
+            return next((result for result in pipeline_results if result.job_id == job_id), None)
+
+        fields = list(dict.fromkeys([*fields, "uri", "job_id"]))
+        pipeline_results = iter_items(self.get_all_for_study, study_uri=study_uri, fields=fields, raw=False)
+        pipeline_result = next((result for result in pipeline_results if result.job_id == job_id), None)
+        return self.get_one(pipeline_result.uri, raw=False) if pipeline_result is not None else None
 
     def get_one(self, pipeline_result_uri: str, **kwargs) -> PipelineResultEntity:
         """
@@ -46,5 +55,4 @@ class PipelineResults:
         :param pipeline_result_uri: the uri of the pipeline-result
         :return: A single pipeline-result or 404
         """
-        resp = self._api.get(pipeline_result_uri, **kwargs)
-        return PipelineResultEntity(**resp)
+        return self._api.get_as(pipeline_result_uri, PipelineResultEntity, **kwargs)
@@ -12,5 +12,4 @@ class Profile:
 
         :return: The current User or 401
         """
-        resp = self._api.get(f"/authentication-service/api/v1/loginstatus", **kwargs)
-        return User(**resp)
+        return self._api.get_as(f"/authentication-service/api/v1/loginstatus", User, **kwargs)
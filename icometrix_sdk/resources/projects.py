@@ -1,5 +1,5 @@
 from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.project_entity import ProjectEntity
+from icometrix_sdk.models.project_entity import ProjectEntity, ProjectPage
 from icometrix_sdk.utils.requests_api_client import ApiClient
 
 
@@ -18,8 +18,7 @@ class Projects:
             kwargs["params"].update(no_settings)
         else:
             kwargs["params"] = no_settings
-        page = self._api.get("/storage-service/api/v2/projects", **kwargs)
-        return PaginatedResponse[ProjectEntity](**page)
+        return self._api.get_as("/storage-service/api/v2/projects", ProjectPage, **kwargs)
 
     def get_one(self, project_uri: str, **kwargs) -> ProjectEntity:
         """
@@ -33,8 +32,7 @@ class Projects:
             kwargs["params"].update(no_settings)
         else:
             kwargs["params"] = no_settings
-        resp = self._api.get(project_uri,  **kwargs)
-        return ProjectEntity(**resp)
+        return self._api.get_as(project_uri, ProjectEntity, **kwargs)
 
     def get_one_by_id(self, project_id: str, **kwargs) -> ProjectEntity:
         """
@@ -48,5 +46,4 @@ class Projects:
             kwargs["params"].update(no_settings)
         else:
             kwargs["params"] = no_settings
-        resp = self._api.get(f"/storage-service/api/v1/projects/{project_id}",  **kwargs)
-        return ProjectEntity(**resp)
+        return self._api.get_as(f"/storage-service/api/v1/projects/{project_id}", ProjectEntity, **kwargs)
@@ -1,8 +1,13 @@
 import logging
+from typing import List, Sequence
+
+from requests.adapters import DEFAULT_POOLSIZE
 
 from icometrix_sdk.logger import logger_name
-from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.series_entity import SeriesEntity
+from icometrix_sdk.models.base import PaginatedResponse, BulkResult
+from icometrix_sdk.models.series_entity import SeriesEntity, SeriesPage
+from icometrix_sdk.utils.concurrency import bulk_map
+from icometrix_sdk.utils.paginator import iter_items
 from icometrix_sdk.utils.requests_api_client import ApiClient
 
 logger = logging.getLogger(logger_name)
@@ -19,5 +24,19 @@ class Series:
         :param study_uri: the uri of the study
         :return: A Paginated response containing series
         """
-        page = self._api.get(f"{study_uri}/series", **kwargs)
-        return PaginatedResponse[SeriesEntity](**page)
+        return self._api.get_as(f"{study_uri}/series", SeriesPage, **kwargs)
+
+    def get_all_for_studies(self, study_uris: Sequence[str], workers: int = DEFAULT_POOLSIZE,
+                            complete_on_error=False, **kwargs) -> List[BulkResult[List[SeriesEntity]]]:
+        """
+        List all series (of all pages) for many studies, the studies are requested concurrently
+
+        :param study_uris: The uris of the studies
+        :param workers: The amount of concurrent requests
+        :param complete_on_error: Setting this boolean to true will return the studies that failed with their error,
+            instead of raising the first exception
+        :param kwargs: Extra arguments for :meth:`get_all_for_study`
+        :return: A result per study with its series, in the order of the study uris
+        """
+        return bulk_map(lambda study_uri: list(iter_items(self.get_all_for_study, study_uri=study_uri, **kwargs)),
+                        study_uris, workers, complete_on_error)
@@ -1,8 +1,13 @@
 import logging
+from typing import List, Sequence, Union
+
+from requests.adapters import DEFAULT_POOLSIZE
 
 from icometrix_sdk.logger import logger_name
-from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.study_entity import StudyEntity
+from icometrix_sdk.models.base import PaginatedResponse, BulkResult
+from icometrix_sdk.models.study_entity import StudyEntity, StudyPage, StudyIds
+from icometrix_sdk.models.upload_entity import StudyUploadEntity
+from icometrix_sdk.utils.concurrency import bulk_map
 from icometrix_sdk.utils.requests_api_client import ApiClient
 
 logger = logging.getLogger(logger_name)
@@ -22,8 +27,22 @@ class Studies:
         :return: A single study or 404
         """
         uri = f"/storage-service/api/v1/projects/{project_id}/patients/{patient_id}/studies/{study_id}"
-        resp = self._api.get(uri, **kwargs)
-        return StudyEntity(**resp)
+        return self._api.get_as(uri, StudyEntity, **kwargs)
+
+    def get_many(self, study_ids: Sequence[Union[StudyIds, StudyUploadEntity]], workers: int = DEFAULT_POOLSIZE,
+                 complete_on_error=False, **kwargs) -> List[BulkResult[StudyEntity]]:
+        """
+        Get many studies at once, the studies are requested concurrently
+
+        :param study_ids: The project, patient and study IDs of the studies, e.g. the studies of an upload
+            (:meth:`~icometrix_sdk.resources.uploads.Uploads.get_studies_for_upload`)
+        :param workers: The amount of concurrent requests
+        :param complete_on_error: Setting this boolean to true will return the studies that failed with their error,
+            instead of raising the first exception
+        :return: A result per study, in the order of the study IDs
+        """
+        return bulk_map(lambda ids: self.get_one(ids.project_id, ids.patient_id, ids.study_id, **kwargs),
+                        study_ids, workers, complete_on_error)
 
     def get_all_for_patient(self, patient_uri: str, **kwargs) -> PaginatedResponse[StudyEntity]:
         """
@@ -32,5 +51,4 @@ class Studies:
         :param: The uri of the patient
         :return: A Paginated response containing studies
         """
-        page = self._api.get(f"{patient_uri}/patients", **kwargs)
-        return PaginatedResponse[StudyEntity](**page)
+        return self._api.get_as(f"{patient_uri}/patients", StudyPage, **kwargs)
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import pytest
+
+from icometrix_sdk.exceptions import WaitTimeoutException
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity
+from icometrix_sdk.resources.customer_reports import CustomerReports, SWEEP_SINCE_PARAM
+from icometrix_sdk.utils.tests.utils import FakeApiClient
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def create_report(report_id: str, status: str, update_timestamp: datetime) -> dict:
+    return {"id": report_id, "uri": f"/customer-reports/{report_id}", "status": status, "study_id": "s",
+            "patient_id": "p", "project_id": "pr", "project_name": "Project", "report_files": [],
+            "project_country": "BE", "study_instance_uid": "1.2.3", "icobrain_report_type": "icobrain_ms",
+            "update_timestamp": update_timestamp.isoformat(), "creation_timestamp": None}
+
+
+class FakeProject(FakeApiClient):
+    """
+    A project with many finished reports, at the start of every sweep the clock advances an hour, a report that is
+    not waited for is updated and the next report of `finish_order` finishes.
+
+    :param sort: Sort the reports on the update timestamp, newest first (like the sort parameter asks)
+    :param filter_since: Only list the reports updated since the timestamp parameter
+    :param skew: Added to the update timestamp of finished reports, e.g. a report updated during the previous sweep
+    """
+
+    def __init__(self, finish_order: List[str], sort=True, filter_since=False, skew=timedelta(0)):
+        super().__init__()
+        self.sort = sort
+        self.filter_since = filter_since
+        self.skew = skew
+        self.finish_order = list(finish_order)
+        self.clock = START
+        self.reports = {f"old-{i}": create_report(f"old-{i}", "Finished", START - timedelta(minutes=i))
+                        for i in range(45)}
+        for report_id in finish_order:
+            self.reports[report_id] = create_report(report_id, "Processing", START - timedelta(days=1))
+        self.sweeps = []
+
+    def get(self, uri: str, params: Optional[dict] = None, **kwargs) -> dict:
+        if params["pageIndex"] == 0:
+            self.sweeps.append({"params": dict(params), "pages": 0})
+            self.clock += timedelta(hours=1)
+            self.reports["busy"] = create_report("busy", "Processing", self.clock)
+            if self.finish_order:
+                report_id = self.finish_order.pop(0)
+                self.reports[report_id] = create_report(report_id, "Finished", self.clock + self.skew)
+        self.sweeps[-1]["pages"] += 1
+
+        reports = list(self.reports.values())
+        if self.filter_since and SWEEP_SINCE_PARAM in params:
+            since = datetime.fromisoformat(params[SWEEP_SINCE_PARAM])
+            reports = [r for r in reports if datetime.fromisoformat(r["update_timestamp"]) >= since]
+        if self.sort:
+            reports.sort(key=lambda r: r["update_timestamp"], reverse=True)
+
+        offset = params["pageIndex"] * params["pageSize"]
+        return {"meta_data": {"result_set": {"count": len(reports), "offset": offset, "limit": params["pageSize"]}},
+                "results": reports[offset:offset + params["pageSize"]]}
+
+
+def waiting_for(*report_ids: str) -> List[CustomerReportEntity]:
+    return [CustomerReportEntity(**create_report(report_id, "Processing", START)) for report_id in report_ids]
+
+
+def wait_in_project(api: FakeProject, *report_ids: str, **kwargs) -> List[str]:
+    finished = CustomerReports(api, polling_interval=0.001).wait_for_results_in_project(
+        "pr", waiting_for(*report_ids), timeout=5, max_interval=0.001, page_size=10, **kwargs)
+    return [report.id for report in finished]
+
+
+def test_sweep_sorted():
+    api = FakeProject(["a", "b", "c"])
+    done = []
+
+    assert wait_in_project(api, "a", "b", "c", on_finished=lambda report: done.append(report.id)) == \
+           ["a", "b", "c"]
+    assert done == ["a", "b", "c"]
+    # The first sweep lists the whole project, the following sweeps stop at the reports of the previous sweep
+    assert [sweep["pages"] for sweep in api.sweeps] == [5, 1, 1]
+
+
+def test_sweep_unsorted():
+    # The server ignores the sort, the newly finished reports are listed last
+    api = FakeProject(["a", "b", "c"], sort=False)
+
+    assert wait_in_project(api, "a", "b", "c") == ["a", "b", "c"]
+    assert [sweep["pages"] for sweep in api.sweeps] == [5, 5, 5]
+
+
+def test_sweep_overlap():
+    # The reports were updated during the previous sweep, but only listed after it: their update timestamp is
+    # older than the newest timestamp of the previous sweep
+    api = FakeProject(["a", "b", "c"], skew=timedelta(hours=-1, seconds=-20))
+
+    assert wait_in_project(api, "a", "b", "c") == ["a", "b", "c"]
+
+
+def test_sweep_filter_since():
+    api = FakeProject(["a", "b", "c"], filter_since=True)
+
+    assert wait_in_project(api, "a", "b", "c") == ["a", "b", "c"]
+    assert SWEEP_SINCE_PARAM not in api.sweeps[0]["params"]
+    assert datetime.fromisoformat(api.sweeps[1]["params"][SWEEP_SINCE_PARAM]) == \
+           START + timedelta(hours=1) - timedelta(seconds=30)
+
+
+def test_sweep_timeout():
+    api = FakeProject(["a"])
+
+    with pytest.raises(WaitTimeoutException):
+        CustomerReports(api, polling_interval=0.01).wait_for_results_in_project(
+            "pr", waiting_for("a", "never"), timeout=0.1, max_interval=0.01)
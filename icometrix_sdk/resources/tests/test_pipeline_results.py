@@ -0,0 +1,42 @@
+import asyncio
+
+from icometrix_sdk.aio.resources.pipeline_results import AsyncPipelineResults
+from icometrix_sdk.resources.pipeline_results import PipelineResults, SCAN_FIELDS
+from icometrix_sdk.resources.tests.test_raw_client import ROUTES, STUDY_URI, PIPELINE_RESULT_URI
+from icometrix_sdk.utils.tests.utils import FakeApiClient, FakeAsyncApiClient
+
+
+def requested(api) -> list:
+    return [(uri, (kwargs.get("params") or {}).get("fields")) for _, uri, kwargs in api.requests]
+
+
+def test_get_one_for_job():
+    api = FakeApiClient(ROUTES)
+
+    assert PipelineResults(api).get_one_for_job(STUDY_URI, "job").job_id == "job"
+    # A single request, without projection
+    assert len(requested(api)) == 1 and requested(api)[0][1] is None
+    assert PipelineResults(api).get_one_for_job(STUDY_URI, "other-job") is None
+
+
+def test_get_one_for_job_fields():
+    api = FakeApiClient(ROUTES)
+
+    pipeline_result = PipelineResults(api).get_one_for_job(STUDY_URI, "job", fields=SCAN_FIELDS)
+
+    assert pipeline_result.software_version_data == {}
+    assert requested(api)[0][1] == ",".join(SCAN_FIELDS)
+    assert requested(api)[1] == (PIPELINE_RESULT_URI, None)
+
+
+def test_async_get_one_for_job():
+    api = FakeAsyncApiClient(ROUTES)
+    pipeline_results = AsyncPipelineResults(api)
+
+    assert asyncio.run(pipeline_results.get_one_for_job(STUDY_URI, "job")).job_id == "job"
+    assert len(requested(api)) == 1 and requested(api)[0][1] is None
+
+    api.requests.clear()
+    assert asyncio.run(pipeline_results.get_one_for_job(STUDY_URI, "job", fields=["id"])).job_id == "job"
+    assert requested(api)[0][1] == "id,uri,job_id"
+    assert requested(api)[1] == (PIPELINE_RESULT_URI, None)
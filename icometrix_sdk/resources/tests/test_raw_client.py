@@ -0,0 +1,126 @@
+import os
+
+from icometrix_sdk import IcometrixApi
+from icometrix_sdk.models.customer_report_entity import CustomerReportEntity
+from icometrix_sdk.models.pipeline_result_entity import PipelineResultEntity
+from icometrix_sdk.models.upload_entity import StartUploadDto, UploadEntity
+from icometrix_sdk.resources.customer_reports import CustomerReports
+from icometrix_sdk.resources.pipeline_results import PipelineResults
+from icometrix_sdk.resources.series import Series
+from icometrix_sdk.resources.uploads import Uploads
+from icometrix_sdk.utils.tests.utils import FakeApiClient
+
+PROJECT_URI = "/storage-service/api/v1/projects/pr"
+STUDY_URI = f"{PROJECT_URI}/patients/pa/studies/st"
+UPLOAD_URI = "/uploads-service/api/v1/projects/pr/dicom-uploads/u"
+UPLOAD_FOLDER_URI = f"{UPLOAD_URI}/folder"
+REPORT_URI = "/customer-reports-service/api/v2/customer-reports/r"
+PIPELINE_RESULT_URI = "/storage-service/api/v2/pipeline-results/pi"
+SERIES_URI = f"{STUDY_URI}/series/se"
+
+TIMESTAMPS = {"update_timestamp": "2024-01-01T00:00:00", "creation_timestamp": None}
+
+PROJECT = {"id": "pr", "uri": PROJECT_URI, "name": "Project", "abbrev": "PR", "country": "BE", **TIMESTAMPS}
+UPLOAD = {"id": "u", "uri": UPLOAD_URI, "status": "import_success", "folder_uri": UPLOAD_FOLDER_URI, "type": "dicom",
+          "logs": [], "errors": [], "icobrain_report_type": "icobrain_ms", "project_id": "pr", **TIMESTAMPS}
+STUDY_UPLOAD = {"id": "su", "project_id": "pr", "patient_id": "pa", "study_id": "st", "upload_id": "u", **TIMESTAMPS}
+STUDY = {"id": "st", "uri": STUDY_URI, "modality": "MR", "patient_id": "pa", "project_id": "pr",
+         "study_date": "20240101", "study_time": "120000", **TIMESTAMPS}
+REPORT = {"id": "r", "uri": REPORT_URI, "status": "Finished", "study_id": "st", "patient_id": "pa", "project_id": "pr",
+          "project_name": "Project", "project_country": "BE", "study_instance_uid": "1.2.3",
+          "icobrain_report_type": "icobrain_ms",
+          "report_files": [{"uri": f"{REPORT_URI}/files/report.pdf", "name": "report.pdf", "type": "pdf"}],
+          **TIMESTAMPS}
+PIPELINE_RESULT = {"id": "pi", "uri": PIPELINE_RESULT_URI, "image": "icobrain", "job_id": "job", "results": {},
+                   "pipeline": "icobrain_mr_cross", "study_id": "st", "patient_id": "pa", "project_id": "pr",
+                   "run_parameters": {}, "software_version_data": {}, **TIMESTAMPS}
+
+
+def page(*results: dict) -> dict:
+    return {"meta_data": {"result_set": {"count": len(results), "offset": 0, "limit": 50}}, "results": list(results)}
+
+
+ROUTES = {
+    PROJECT_URI: PROJECT,
+    UPLOAD_URI: UPLOAD,
+    UPLOAD_FOLDER_URI: UPLOAD,
+    f"{UPLOAD_FOLDER_URI}/files": {"files": []},
+    f"{UPLOAD_FOLDER_URI}/study-uploads": page(STUDY_UPLOAD),
+    STUDY_URI: STUDY,
+    "/customer-reports-service/api/v2/projects/pr/patients/pa/studies/st/customer-reports": page(REPORT),
+    "/customer-reports-service/api/v2/projects/pr/customer-reports": page(REPORT),
+    REPORT_URI: REPORT,
+    "/storage-service/api/v2/projects/pr/patients/pa/studies/st/pipeline-results": page(PIPELINE_RESULT),
+    PIPELINE_RESULT_URI: PIPELINE_RESULT,
+    f"{STUDY_URI}/series": page({"id": "se", "uri": SERIES_URI}),
+    "POST /uploads-service/api/v1/projects/pr/multi-upload": UPLOAD,
+    f"POST {UPLOAD_URI}": UPLOAD,
+    f"PUT_FILE {UPLOAD_URI}": None,
+}
+
+
+class RawApi(FakeApiClient):
+    """
+    A client that returns the entities as dicts, answering every request of a DICOM upload and its results
+    """
+
+    def __init__(self):
+        super().__init__(ROUTES, raw=True)
+        self.downloads = []
+
+    def stream_file(self, uri: str, out_path: str, **kwargs):
+        self.downloads.append(uri)
+        with open(out_path, "wb") as fp:
+            fp.write(b"report")
+        return 6
+
+
+def test_raw_client_returns_dicts():
+    assert Uploads(RawApi()).get_one(UPLOAD_URI) == UPLOAD
+
+
+def test_wait_helpers_with_raw_client():
+    api = RawApi()
+    customer_reports = CustomerReports(api, polling_interval=0.01)
+    report = CustomerReportEntity(**REPORT)
+
+    assert isinstance(Uploads(api).wait_for_data_import(UPLOAD_URI), UploadEntity)
+    assert customer_reports.wait_for_results([report], timeout=5) == [report]
+    assert customer_reports.wait_for_results_in_project("pr", [report], timeout=5) == [report]
+    assert customer_reports.wait_for_customer_report_for_study("pr", "1.2.3", "icobrain_ms") == report
+
+
+def test_get_one_for_job_with_raw_client():
+    pipeline_result = PipelineResults(RawApi()).get_one_for_job(STUDY_URI, "job")
+    assert isinstance(pipeline_result, PipelineResultEntity)
+
+
+def test_bulk_fetch_forwards_kwargs():
+    api = RawApi()
+    api.raw = False
+
+    results = Series(api).get_all_for_studies([STUDY_URI], raw=True)
+    assert results[0].value == [{"id": "se", "uri": SERIES_URI}]
+
+    results = Series(api).get_all_for_studies([STUDY_URI], fields=["id", "uri"])
+    assert results[0].value[0].uri == SERIES_URI
+
+
+def test_upload_manifest_with_raw_client(tmp_path):
+    (tmp_path / "dicom").mkdir()
+    (tmp_path / "dicom" / "IM-0001.dcm").write_bytes(b"dicom")
+
+    results = list(Uploads(RawApi()).iter_upload_files_in_dir(UPLOAD_URI, str(tmp_path / "dicom"),
+                                                             manifest_path=str(tmp_path / "manifest.jsonl")))
+    assert [result.status for result in results] == ["uploaded"]
+
+
+def test_process_dicom_directory_with_raw_client(tmp_path):
+    (tmp_path / "dicom").mkdir()
+    (tmp_path / "dicom" / "IM-0001.dcm").write_bytes(b"dicom")
+    api = RawApi()
+
+    IcometrixApi(api).process_dicom_directory("pr", str(tmp_path / "dicom"), str(tmp_path / "out"),
+                                              StartUploadDto(icobrain_report_type="icobrain_ms"))
+
+    assert os.listdir(tmp_path / "out" / "r") == ["report.pdf"]
@@ -1,15 +1,23 @@
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from time import sleep
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, BrokenExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, Optional, TYPE_CHECKING
 
 from requests.adapters import DEFAULT_POOLSIZE
 
-from icometrix_sdk.exceptions import IcometrixException, IcometrixDataImportException
+from icometrix_sdk.exceptions import IcometrixException, IcometrixDataImportException, IcometrixConfigException
 from icometrix_sdk.logger import logger_name
 from icometrix_sdk.models.base import PaginatedResponse
-from icometrix_sdk.models.upload_entity import StartUploadDto, UploadEntity, UploadEntityFiles, StudyUploadEntity
+from icometrix_sdk.models.upload_entity import StartUploadDto, UploadEntity, UploadPage, UploadEntityFiles, \
+    StudyUploadEntity, StudyUploadPage, FileUploadResult
+from icometrix_sdk.utils.concurrency import bounded_map
 from icometrix_sdk.utils.requests_api_client import ApiClient
+from icometrix_sdk.utils.upload_manifest import UploadManifest, file_sha256
+from icometrix_sdk.utils.wait import Backoff, wait_for
+
+if TYPE_CHECKING:
+    from icometrix_sdk.anonymizer.anonymizer import Anonymizer
 
 logger = logging.getLogger(logger_name)
 
@@ -26,18 +34,16 @@ class Uploads:
         :param: The ID of the project
         :return: A Paginated response containing upload entries
         """
-        page = self._api.get(f"/uploads-service/api/v1/projects/{project_id}/dicom-uploads", **kwargs)
-        return PaginatedResponse[UploadEntity](**page)
+        return self._api.get_as(f"/uploads-service/api/v1/projects/{project_id}/dicom-uploads", UploadPage, **kwargs)
 
-    def get_one(self, upload_uri: str) -> UploadEntity:
+    def get_one(self, upload_uri: str, **kwargs) -> UploadEntity:
         """
         Get a single upload entry based on the upload uri
 
         :param upload_uri: the uri of the upload
         :return: A single patient or 404
         """
-        resp = self._api.get(upload_uri)
-        return UploadEntity(**resp)
+        return self._api.get_as(upload_uri, UploadEntity, **kwargs)
 
     def get_studies_for_upload(self, upload_folder_uri: str, **kwargs) -> PaginatedResponse[StudyUploadEntity]:
         """
@@ -46,8 +52,7 @@ class Uploads:
         :param upload_folder_uri: the folder uri of the upload (UploadEntry.folder_uri)
         :return:
         """
-        page = self._api.get(f"{upload_folder_uri}/study-uploads", **kwargs)
-        return PaginatedResponse[StudyUploadEntity](**page)
+        return self._api.get_as(f"{upload_folder_uri}/study-uploads", StudyUploadPage, **kwargs)
 
     def get_uploaded_files(self, upload_folder_uri: str, **kwargs) -> UploadEntityFiles:
         """
@@ -70,11 +75,11 @@ class Uploads:
         :param upload_folder_uri: the folder uri of the upload (UploadEntry.folder_uri)
         :return: An object containing all file names (If the upload has been imported, the file list will be empty)
         """
-        resp = self._api.get(f"{upload_folder_uri}/files", **kwargs)
-        return UploadEntityFiles(**resp)
+        return self._api.get_as(f"{upload_folder_uri}/files", UploadEntityFiles, **kwargs)
 
     def upload_dicom_dir(self, project_id: str, dicom_dir_path: str, options: StartUploadDto,
-                         complete_on_error=False) -> UploadEntity:
+                         complete_on_error=False, manifest_path: Optional[str] = None,
+                         workers: int = DEFAULT_POOLSIZE) -> UploadEntity:
         """
         A higher level function to upload all DICOMs of a directory AND all of its subdirectories
 
@@ -86,50 +91,222 @@ class Uploads:
             Extra upload options
         :param complete_on_error:
             Setting this boolean to true will still complete the upload, even if a file failed to upload
+        :param manifest_path:
+            Path to an upload manifest, see :meth:`upload_all_files_in_dir`. When the manifest already exists, the
+            upload it belongs to is resumed instead of starting a new upload. The manifest of a completed upload is
+            replaced by the manifest of a new upload.
+        :param workers:
+            The amount of files uploaded at once
         :return:
         """
-        # Create upload entry
-        upload = self.start_upload(project_id, options)
+        upload_uri = None
+        if manifest_path and os.path.exists(manifest_path):
+            manifest = UploadManifest.load(manifest_path)
+            if manifest.completed:
+                logger.info(f"Upload {manifest.upload_uri} of manifest {manifest_path} is completed, starting a new "
+                            f"upload")
+                os.remove(manifest_path)
+            else:
+                # Resume the upload of a previous run
+                upload_uri = manifest.upload_uri
+                logger.info(f"Resuming upload {upload_uri}")
+        if upload_uri is None:
+            # Create upload entry
+            upload_uri = self.start_upload(project_id, options).uri
         # Upload all files in directory
-        self.upload_all_files_in_dir(upload.uri, dicom_dir_path, complete_on_error)
+        self.upload_all_files_in_dir(upload_uri, dicom_dir_path, complete_on_error, manifest_path, workers)
         # Once all files have been uploaded, signal that they are all there and start the import/processing
-        return self.complete_upload(upload.uri)
+        upload = self.complete_upload(upload_uri)
+        if manifest_path:
+            UploadManifest.load(manifest_path).complete()
+        return upload
 
-    def upload_all_files_in_dir(self, upload_uri: str, dicom_dir_path: str, complete_on_error=False) -> int:
+    def upload_all_files_in_dir(self, upload_uri: str, dicom_dir_path: str, complete_on_error=False,
+                                manifest_path: Optional[str] = None, workers: int = DEFAULT_POOLSIZE) -> int:
         """
         A higher level function to upload all DICOMs of a directory AND all of its subdirectories
 
+        When a manifest path is given, the upload status of every file is recorded in a local manifest
+        (see :class:`~icometrix_sdk.utils.upload_manifest.UploadManifest`). Running the function again with the same
+        manifest, e.g. after a crash or a network failure, first reconciles the manifest with the files the upload
+        service received and then only sends the files that are missing or changed.
+
         :param upload_uri:
             the URI of the upload entry
         :param dicom_dir_path:
             The path to the directory
         :param complete_on_error:
             Setting this boolean to true will still complete the upload, even if a file failed to upload
+        :param manifest_path:
+            Path to the upload manifest, it is created if it does not exist yet
+        :param workers:
+            The amount of files uploaded at once
+        :return: The amount of files in the upload: the files uploaded now and, with a manifest, the files skipped
+            because they were uploaded in a previous run. Files that failed to upload are not counted.
+        """
+        count = 0
+        for result in self.iter_upload_files_in_dir(upload_uri, dicom_dir_path, complete_on_error, manifest_path,
+                                                    workers):
+            if result.status != "failed":
+                count += 1
+        return count
+
+    def iter_upload_files_in_dir(self, upload_uri: str, dicom_dir_path: str, complete_on_error=False,
+                                 manifest_path: Optional[str] = None,
+                                 workers: int = DEFAULT_POOLSIZE) -> Iterator[FileUploadResult]:
+        """
+        Upload all DICOMs of a directory AND all of its subdirectories, yielding a result per file as soon as it is
+        uploaded. See :meth:`upload_all_files_in_dir` for the parameters.
+
+        The directory is walked while uploading, only a few files per worker are queued at any time. On an error the
+        queued files are dropped and the exception is raised right away, unless `complete_on_error` is set.
+
+        :return: A generator of upload results, one per file
+        """
+        manifest = None
+        if manifest_path:
+            manifest = UploadManifest.open(manifest_path, upload_uri)
+            if manifest.completed:
+                raise IcometrixConfigException(f"Upload {upload_uri} of manifest {manifest_path} is already completed")
+            upload = self.get_one(upload_uri, raw=False)
+            manifest.reconcile(self.get_uploaded_files(upload.folder_uri, raw=False).files)
+
+        def upload_file(file_path: str) -> FileUploadResult:
+            if manifest is None:
+                logger.info(f"Uploading {file_path}")
+                self.upload_dicom_path(upload_uri, file_path)
+            elif manifest.needs_upload(file_path):
+                logger.info(f"Uploading {file_path}")
+                self._upload_dicom_path_with_manifest(upload_uri, file_path, manifest)
+            else:
+                logger.debug(f"Skipping {file_path}, it was already uploaded")
+                return FileUploadResult(path=file_path, status="skipped")
+            return FileUploadResult(path=file_path, status="uploaded")
+
+        for file_path, future in bounded_map(upload_file, _walk_files(dicom_dir_path), workers):
+            try:
+                yield future.result()
+            except IcometrixException as e:
+                logger.error(f"Exception while uploading {file_path}: {e}")
+                if not complete_on_error:
+                    raise e
+                yield FileUploadResult(path=file_path, status="failed", error=str(e))
+
+    def upload_anonymized_dir(self, project_id: str, dicom_dir_path: str, anonymizer: "Anonymizer",
+                              options: StartUploadDto, complete_on_error=False, processes: Optional[int] = None,
+                              workers: int = DEFAULT_POOLSIZE) -> UploadEntity:
+        """
+        A higher level function to anonymize and upload all DICOMs of a directory AND all of its subdirectories,
+        files that are not DICOMs are skipped
+
+        :param project_id:
+            The ID of the project you want to upload to
+        :param dicom_dir_path:
+            The path to the directory
+        :param anonymizer:
+            The :class:`~icometrix_sdk.anonymizer.anonymizer.Anonymizer` used to anonymize the DICOMs
+        :param options:
+            Extra upload options
+        :param complete_on_error:
+            Setting this boolean to true will still complete the upload, even if a file failed to anonymize or upload
+        :param processes:
+            The amount of processes anonymizing files, defaults to the amount of CPUs
+        :param workers:
+            The amount of files uploaded at once
         :return:
         """
-        futures = []
-        with ThreadPoolExecutor(DEFAULT_POOLSIZE) as executor:
-            # Loop over all files in a DIR and upload them to the before created upload entry
-            for path, subdirs, files in os.walk(dicom_dir_path):
-                for name in files:
-                    if name.startswith("."):
-                        continue
-
-                    file_path = os.path.join(path, name)
-                    logger.info(f"Uploading {file_path}")
-                    future = executor.submit(self.upload_dicom_path, upload_uri, file_path)
-                    futures.append(future)
-
-            # Wait for all threads to complete and handle exceptions
-            for completed_future in as_completed(futures):
-                try:
-                    completed_future.result()  # Check for exceptions here
-                except IcometrixException as e:
-                    # Log or handle the exception appropriately
-                    logging.error(f"Exception in one of the threads: {e}")
-                    if not complete_on_error:
-                        raise e
-        return len(futures)
+        upload = self.start_upload(project_id, options)
+        for _ in self.iter_upload_anonymized_files_in_dir(upload.uri, dicom_dir_path, anonymizer, complete_on_error,
+                                                          processes, workers):
+            pass
+        return self.complete_upload(upload.uri)
+
+    def iter_upload_anonymized_files_in_dir(self, upload_uri: str, dicom_dir_path: str, anonymizer: "Anonymizer",
+                                            complete_on_error=False, processes: Optional[int] = None,
+                                            workers: int = DEFAULT_POOLSIZE) -> Iterator[FileUploadResult]:
+        """
+        Anonymize and upload all DICOMs of a directory AND all of its subdirectories, yielding a result per file.
+        See :meth:`upload_anonymized_dir` for the parameters.
+
+        Anonymization is CPU bound and runs in a process pool, the anonymized files are handed to a thread pool
+        that uploads them. New files are only read when both stages have room, so at most a few files per
+        process/worker are kept in memory.
+
+        :return: A generator of upload results, one per file
+        """
+        from icometrix_sdk.anonymizer.parallel import init_worker, anonymize_to_bytes
+
+        processes = processes or os.cpu_count() or 1
+        max_anonymizing = 2 * processes
+        max_uploading = 2 * workers
+
+        process_pool = ProcessPoolExecutor(processes, initializer=init_worker, initargs=(anonymizer,))
+        thread_pool = ThreadPoolExecutor(workers)
+        anonymizing: Dict[Future, str] = {}
+        uploading: Dict[Future, str] = {}
+        file_paths = _walk_files(dicom_dir_path)
+        walked = False
+        try:
+            while True:
+                # Only read new files when both stages have room (backpressure)
+                while not walked and len(anonymizing) < max_anonymizing and len(uploading) < max_uploading:
+                    file_path = next(file_paths, None)
+                    if file_path is None:
+                        walked = True
+                        break
+                    anonymizing[process_pool.submit(anonymize_to_bytes, file_path)] = file_path
+
+                if not anonymizing and not uploading:
+                    break
+
+                done, _ = wait([*anonymizing, *uploading], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in anonymizing:
+                        file_path = anonymizing.pop(future)
+                        try:
+                            data = future.result()
+                        except BrokenExecutor:
+                            raise
+                        except Exception as e:
+                            logger.error(f"Exception while anonymizing {file_path}: {e}")
+                            if not complete_on_error:
+                                raise e
+                            yield FileUploadResult(path=file_path, status="failed", error=str(e))
+                            continue
+
+                        if data is None:
+                            logger.debug(f"Skipping {file_path}, it is not a DICOM")
+                            yield FileUploadResult(path=file_path, status="skipped")
+                            continue
+
+                        logger.info(f"Uploading anonymized {file_path}")
+                        fields = {"file": (file_path, data, "application/octet-stream")}
+                        uploading[thread_pool.submit(self.upload_dicom, upload_uri, fields)] = file_path
+                    else:
+                        file_path = uploading.pop(future)
+                        try:
+                            future.result()
+                        except IcometrixException as e:
+                            logger.error(f"Exception while uploading {file_path}: {e}")
+                            if not complete_on_error:
+                                raise e
+                            yield FileUploadResult(path=file_path, status="failed", error=str(e))
+                            continue
+                        yield FileUploadResult(path=file_path, status="uploaded")
+        finally:
+            process_pool.shutdown(wait=True, cancel_futures=True)
+            thread_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _upload_dicom_path_with_manifest(self, upload_uri: str, file_path: str, manifest: UploadManifest):
+        # The file is sent with the same name as without a manifest, the manifest keys it on its absolute path
+        sha256 = file_sha256(file_path)
+        manifest.record(file_path, "pending", sha256)
+        try:
+            self.upload_dicom_path(upload_uri, file_path)
+        except Exception:
+            manifest.record(file_path, "failed", sha256)
+            raise
+        manifest.record(file_path, "uploaded", sha256)
 
     def start_upload(self, project_id: str, start_upload: StartUploadDto, **kwargs) -> UploadEntity:
         """
@@ -152,7 +329,7 @@ class Uploads:
         :return:
         """
         with open(file_path, "rb") as fp:
-            self.upload_dicom(upload_uri, fields={"file": (file_path, fp.read(), "application/octet-stream")})
+            self.upload_dicom(upload_uri, fields={"file": (file_path, fp, "application/octet-stream")})
 
     def upload_dicom(self, upload_uri: str, fields):
         """
@@ -160,6 +337,7 @@ class Uploads:
 
         :param upload_uri: The uri to upload to
         :param fields: Dictionary of fields or list of (key, :class:`~urllib3.fields.RequestField`).
+            The field data can be bytes or a binary file object, file objects are streamed.
         :return:
         """
         self._api.put_file(upload_uri, fields=fields)
@@ -174,19 +352,35 @@ class Uploads:
         resp = self._api.post(upload_uri, data={})
         return UploadEntity(**resp)
 
-    def wait_for_data_import(self, upload_uri: str) -> UploadEntity:
+    def wait_for_data_import(self, upload_uri: str, timeout: Optional[float] = None, max_interval: float = 30,
+                             cancel: Optional[threading.Event] = None) -> UploadEntity:
         """
         After data has been upload (and completed), we need to wait for the data to be imported
 
         :param upload_uri: The uri to upload to
+        :param timeout: The maximum time to wait (in seconds), raises a WaitTimeoutException when exceeded
+        :param max_interval: The maximum time between two status checks (in seconds)
+        :param cancel: An event to stop waiting from another thread
         :return: UploadEntity
         """
 
-        upload = self.get_one(upload_uri)
-        while upload.status != "import_success":
-            upload = self.get_one(upload.folder_uri)
+        def check() -> UploadEntity:
+            upload = self.get_one(upload_uri, raw=False)
             logger.info(upload)
             if upload.status == "import_failed":
                 raise IcometrixDataImportException(f"Import failed: {upload}")
-            sleep(self.polling_interval)
-        return upload
+            return upload
+
+        return wait_for(check, lambda upload: upload.status == "import_success", timeout,
+                        Backoff(initial=self.polling_interval, maximum=max_interval), cancel)
+
+
+def _walk_files(dir_path: str) -> Iterator[str]:
+    """
+    Lazily list all (non-hidden) files of a directory AND all of its subdirectories
+    """
+    for path, subdirs, files in os.walk(dir_path):
+        for name in files:
+            if name.startswith("."):
+                continue
+            yield os.path.join(path, name)
@@ -1,4 +1,19 @@
 from abc import abstractmethod, ABC
+from typing import Optional, Sequence, Type, TypeVar
+
+from icometrix_sdk.utils.json_parser import convert_as
+
+T = TypeVar("T")
+
+# The query parameter that asks the server for a subset of the fields of the entities
+FIELDS_PARAM = "fields"
+
+
+def with_fields(kwargs: dict, fields: Sequence[str]) -> dict:
+    """
+    Add the fields query parameter to the kwargs of a request
+    """
+    return {**kwargs, "params": {**(kwargs.get("params") or {}), FIELDS_PARAM: ",".join(fields)}}
 
 
 class ApiClient(ABC):
@@ -6,10 +21,31 @@ class ApiClient(ABC):
     Interface for API clients, used to make HTTP calls to the icometrix API
     """
 
+    # Return the entities of get_as as dicts, without validating them
+    raw: bool = False
+
     @abstractmethod
     def get(self, uri: str, **kwargs) -> dict:
         pass
 
+    def get_as(self, uri: str, model_type: Type[T], raw: Optional[bool] = None,
+               fields: Optional[Sequence[str]] = None, **kwargs) -> T:
+        """
+        Submit a GET request and validate the response as a model
+
+        Implementations can override this to validate the raw response body, without building a dict first.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param model_type: The model type, e.g. ``StudyEntity`` or ``PaginatedResponse[StudyEntity]``
+        :param raw: Skip the validation and return the entities as dicts
+            (see :func:`~icometrix_sdk.utils.json_parser.raw_as`), defaults to the raw setting of the client
+        :param fields: Only request (and keep) these fields of the entities
+            (see :func:`~icometrix_sdk.utils.json_parser.project_as`)
+        :returns: The validated model
+        """
+        data = self.get(uri, **(with_fields(kwargs, fields) if fields is not None else kwargs))
+        return convert_as(data, model_type, self.raw if raw is None else raw, fields)
+
     @abstractmethod
     def post(self, uri: str, data: dict, **kwargs) -> dict:
         pass
@@ -29,3 +65,47 @@ class ApiClient(ABC):
     @abstractmethod
     def stream_file(self, uri: str, out_path: str, **kwargs):
         pass
+
+
+class AsyncApiClient(ABC):
+    """
+    Interface for asynchronous API clients, the asyncio counterpart of :class:`ApiClient`
+    """
+
+    raw: bool = False
+
+    @abstractmethod
+    async def get(self, uri: str, **kwargs) -> dict:
+        pass
+
+    async def get_as(self, uri: str, model_type: Type[T], raw: Optional[bool] = None,
+                     fields: Optional[Sequence[str]] = None, **kwargs) -> T:
+        """
+        Submit a GET request and validate the response as a model, see :meth:`ApiClient.get_as`
+        """
+        data = await self.get(uri, **(with_fields(kwargs, fields) if fields is not None else kwargs))
+        return convert_as(data, model_type, self.raw if raw is None else raw, fields)
+
+    @abstractmethod
+    async def post(self, uri: str, data: dict, **kwargs) -> dict:
+        pass
+
+    @abstractmethod
+    async def put(self, uri: str, data: dict, **kwargs) -> dict:
+        pass
+
+    @abstractmethod
+    async def delete(self, uri: str, **kwargs):
+        pass
+
+    @abstractmethod
+    async def put_file(self, uri: str, fields, **kwargs):
+        pass
+
+    @abstractmethod
+    async def stream_file(self, uri: str, out_path: str, **kwargs):
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
@@ -0,0 +1,140 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from icometrix_sdk.exceptions import IcometrixException
+from icometrix_sdk.models.base import BulkResult
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(func: Callable[[T], R], items: Iterable[T], workers: int, max_pending: Optional[int] = None,
+                ordered: bool = False) -> Iterator[Tuple[T, "Future[R]"]]:
+    """
+    Run a function over items in a thread pool, without submitting all items up front
+
+    The items are consumed lazily: at most `max_pending` items are queued or running at any time, so the memory
+    use does not depend on the amount of items. When the caller stops iterating (e.g. on an error), the queued
+    items are cancelled.
+
+    :param func: The function to run for every item
+    :param items: An iterable of items, e.g. a generator
+    :param workers: The amount of threads
+    :param max_pending: The maximum amount of submitted items, defaults to twice the amount of workers
+    :param ordered: Yield the results in the order of the items, instead of in the order they complete
+    :return: An iterator of (item, completed future) tuples
+    """
+    if max_pending is None:
+        max_pending = 2 * workers
+    max_pending = max(max_pending, workers, 1)
+
+    executor = ThreadPoolExecutor(workers)
+    pending = deque() if ordered else {}
+    try:
+        for item in items:
+            future = executor.submit(func, item)
+            if ordered:
+                pending.append((item, future))
+            else:
+                pending[future] = item
+
+            if len(pending) >= max_pending:
+                yield from _take_completed(pending, ordered)
+
+        while pending:
+            yield from _take_completed(pending, ordered)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def bulk_map(func: Callable[[T], R], items: Iterable[T], workers: int,
+             complete_on_error=False) -> List[BulkResult[R]]:
+    """
+    Run a function over items in a thread pool, e.g. to fetch many entities at once
+
+    :param func: The function to run for every item
+    :param items: The items
+    :param workers: The amount of threads
+    :param complete_on_error: Setting this boolean to true will return the failed items with their error, instead of
+        raising the first exception
+    :return: A result per item, in the order of the items
+    """
+    results = []
+    for item, future in bounded_map(func, items, workers, ordered=True):
+        try:
+            results.append(BulkResult(key=item, value=future.result()))
+        except IcometrixException as e:
+            if not complete_on_error:
+                raise e
+            results.append(BulkResult(key=item, error=str(e)))
+    return results
+
+
+def _take_completed(pending, ordered: bool):
+    if ordered:
+        item, future = pending.popleft()
+        wait([future])
+        yield item, future
+        return
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        yield pending.pop(future), future
+
+
+class SingleFlightStats(NamedTuple):
+    calls: int
+    coalesced: int
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls with the same key
+
+    While a call for a key is running, other threads calling with the same key wait for that call and share its
+    result (or exception), instead of making the call again.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], R]) -> R:
+        """
+        Call the function, or wait for the call with the same key that is already running
+
+        :param key: Calls with the same key are deduplicated
+        :param func: The function to call
+        :return: The result of the function
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                follower = True
+            else:
+                self._calls += 1
+                future = self._in_flight[key] = Future()
+                follower = False
+        if follower:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def stats(self) -> SingleFlightStats:
+        """
+        The amount of calls made, and the amount of calls that shared the result of another call
+        """
+        with self._lock:
+            return SingleFlightStats(self._calls, self._coalesced)
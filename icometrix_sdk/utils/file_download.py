@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import os
+import uuid
+from typing import Mapping, Optional
+
+from icometrix_sdk.exceptions import IcometrixIntegrityException
+
+
+class DownloadWriter:
+    """
+    A file-like object that writes a download to a temporary file next to the output path
+
+    When the writer is closed without errors, the size (Content-Length) and checksum (Content-MD5) are verified
+    against the response headers and the file is renamed to the output path. So the output path either holds the
+    complete file or nothing.
+
+    :param out_path: The path to write the file to
+    :param headers: The response headers
+    """
+
+    def __init__(self, out_path: str, headers: Optional[Mapping[str, str]] = None):
+        headers = headers or {}
+        self.out_path = out_path
+        self.size = 0
+        self.expected_size = int(headers["Content-Length"]) if headers.get("Content-Length") else None
+        self.expected_md5 = headers.get("Content-MD5")
+        self._md5 = hashlib.md5(usedforsecurity=False) if self.expected_md5 else None
+
+        out_dir, name = os.path.split(os.path.abspath(out_path))
+        self._tmp_path = os.path.join(out_dir, f".{name}.{uuid.uuid4().hex[:8]}.part")
+        self._fp = open(self._tmp_path, "xb")
+
+    def write(self, chunk: bytes) -> int:
+        self.size += len(chunk)
+        if self._md5:
+            self._md5.update(chunk)
+        return self._fp.write(chunk)
+
+    def commit(self) -> int:
+        """
+        Verify the file and move it to the output path
+
+        :return: The size of the file
+        """
+        self._fp.close()
+        if self.expected_size is not None and self.size != self.expected_size:
+            raise IcometrixIntegrityException(
+                f"Download of {self.out_path} is incomplete: {self.size} of {self.expected_size} bytes received")
+        if self._md5 and base64.b64encode(self._md5.digest()).decode() != self.expected_md5:
+            raise IcometrixIntegrityException(f"Download of {self.out_path} does not match its Content-MD5")
+        os.replace(self._tmp_path, self.out_path)
+        return self.size
+
+    def abort(self):
+        self._fp.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+            return
+        try:
+            self.commit()
+        except Exception:
+            self.abort()
+            raise
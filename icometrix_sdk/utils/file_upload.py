@@ -1,4 +1,11 @@
+import io
+import os
+from typing import BinaryIO, Iterator, List, Union
+
 from urllib3 import encode_multipart_formdata
+from urllib3.filepost import choose_boundary, iter_field_objects
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 def create_multipart(fields, boundary=None):
@@ -15,3 +22,145 @@ def create_multipart(fields, boundary=None):
     data, content_type = encode_multipart_formdata(fields, boundary)
     headers = {"Content-Type": content_type, 'Content-Length': str(len(data))}
     return data, headers
+
+
+def create_streaming_multipart(fields, boundary=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Streaming counterpart of :func:`create_multipart`
+
+    File objects passed as field data are read in chunks while the request body is sent, instead of being
+    loaded in memory. The Content-Length is computed up front from the size of each part.
+
+    :param fields:
+        Dictionary of fields or list of (key, :class:`~urllib3.fields.RequestField`).
+        The data of a field can be bytes, a string or a binary file object opened for reading.
+
+    :param boundary:
+        If not specified, then a random boundary will be generated using
+        :func:`urllib3.filepost.choose_boundary`.
+
+    :param chunk_size:
+        The amount of bytes read from a file object at once
+    """
+    body = MultipartEncoder(fields, boundary, chunk_size)
+    headers = {"Content-Type": body.content_type, "Content-Length": str(len(body))}
+    return body, headers
+
+
+def _file_size(fp: BinaryIO) -> int:
+    """
+    The amount of bytes left to read from a file object
+    """
+    position = fp.tell()
+    try:
+        end = os.fstat(fp.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        end = fp.seek(0, os.SEEK_END)
+        fp.seek(position)
+    return max(0, end - position)
+
+
+class _FilePart:
+    """
+    A file object that is part of a multipart body
+    """
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        self.start = fp.tell()
+        self.size = _file_size(fp)
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        self.fp.seek(self.start + offset)
+        return self.fp.read(min(size, self.size - offset))
+
+
+class MultipartEncoder:
+    """
+    A file-like multipart/form-data body that streams the data of its fields
+
+    Produces exactly the same body as urllib3 "encode_multipart_formdata", but only keeps one chunk in memory
+    at a time. The body can be rewound with ``seek(0)``, so the HTTP client is able to resend it on a retry.
+    """
+
+    def __init__(self, fields, boundary=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.boundary = boundary or choose_boundary()
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+
+        self._parts: List[Union[bytes, _FilePart]] = []
+        for field in iter_field_objects(fields):
+            self._parts.append(f"--{self.boundary}\r\n".encode("latin-1") + field.render_headers().encode("utf-8"))
+
+            data = field.data
+            if isinstance(data, int):
+                data = str(data)  # Same as urllib3
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            self._parts.append(_FilePart(data) if hasattr(data, "read") else bytes(data))
+            self._parts.append(b"\r\n")
+        self._parts.append(f"--{self.boundary}--\r\n".encode("latin-1"))
+
+        self._length = sum(part.size if isinstance(part, _FilePart) else len(part) for part in self._parts)
+        self._position = 0
+        self._part_index = 0
+        self._part_offset = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._position = min(max(0, offset), self._length)
+
+        # Find the part that contains the new position
+        remaining = self._position
+        self._part_index = 0
+        for part in self._parts:
+            part_size = part.size if isinstance(part, _FilePart) else len(part)
+            if remaining < part_size:
+                break
+            remaining -= part_size
+            self._part_index += 1
+        self._part_offset = remaining
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._position
+
+        chunks = []
+        while size > 0 and self._part_index < len(self._parts):
+            part = self._parts[self._part_index]
+            if isinstance(part, _FilePart):
+                chunk = part.read_at(self._part_offset, size)
+                part_size = part.size
+            else:
+                chunk = part[self._part_offset:self._part_offset + size]
+                part_size = len(part)
+
+            # A file that shrunk after the Content-Length was computed can't be sent anymore
+            if not chunk and self._part_offset < part_size:
+                raise IOError("File changed while it was being uploaded")
+
+            chunks.append(chunk)
+            size -= len(chunk)
+            self._position += len(chunk)
+            self._part_offset += len(chunk)
+            if self._part_offset >= part_size:
+                self._part_index += 1
+                self._part_offset = 0
+        return b"".join(chunks)
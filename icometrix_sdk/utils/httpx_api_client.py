@@ -0,0 +1,333 @@
+import asyncio
+import contextvars
+import inspect
+import json
+import logging
+import os
+import uuid
+from typing import Optional, AsyncIterator, Callable, Sequence, Type, TypeVar
+from urllib.parse import urljoin
+
+from icometrix_sdk._version import __version__
+from icometrix_sdk.authentication import AuthenticationMethod
+from icometrix_sdk.exceptions import IcometrixHttpException, IcometrixConfigException, IcometrixAuthException
+from icometrix_sdk.logger import logger_name
+from icometrix_sdk.utils.api_client import AsyncApiClient, with_fields
+from icometrix_sdk.utils.file_download import DownloadWriter
+from icometrix_sdk.utils.file_upload import create_streaming_multipart, MultipartEncoder
+from icometrix_sdk.utils.json_parser import parse_json_as, convert_as
+from icometrix_sdk.utils.requests_api_client import HTTP_TIMEOUT, response_to_dict
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+T = TypeVar("T")
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+
+# Same retry behaviour as the RequestsApiClient
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+logger = logging.getLogger(logger_name)
+
+# Set while the auth method is connecting, so its own requests don't wait for the authentication
+_authenticating = contextvars.ContextVar("authenticating", default=False)
+
+
+class HttpxApiClient(AsyncApiClient):
+    """
+    An asyncio implementation of the API client using the httpx library (pip install httpx[http2])
+
+    All requests share one connection pool, bounded by ``max_connections``. The client authenticates on the first
+    request, or when :meth:`connect` is awaited, and authenticates again when the session expires (401).
+
+    :param server: The icometrix server, e.g. https://icobrain-eu.icometrix.com
+    :param auth: The authentication method
+    :param http2: Use HTTP/2 when the server supports it (requires the h2 package)
+    :param max_connections: The maximum amount of concurrent connections
+    :param max_keepalive_connections: The maximum amount of idle connections kept alive
+    :param raw: Skip the validation of the responses, see
+        :class:`~icometrix_sdk.utils.requests_api_client.RequestsApiClient`
+    """
+
+    auth: Optional[AuthenticationMethod]
+
+    def __init__(self, server: str, auth: Optional[AuthenticationMethod] = None, http2: bool = False,
+                 max_connections: int = HTTP_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS, raw: bool = False):
+        if httpx is None:
+            raise IcometrixConfigException("The HttpxApiClient requires httpx, install it with 'pip install httpx'")
+        if not server:
+            raise IcometrixConfigException("Server is required")
+
+        self.base_headers = {
+            "User-Agent": "Python SDK v{}".format(__version__),
+            "x-sdk-type": "Python",
+            "x-sdk-version": __version__,
+            "x-sdk-contextId": str(uuid.uuid4()),
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+        self.server = server
+        self.auth = auth
+        self.raw = raw
+
+        self._client = httpx.AsyncClient(
+            headers=self.base_headers,
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+            timeout=float(HTTP_TIMEOUT),
+        )
+        self._connected = False
+        # Incremented on every (re-)authentication, so tasks can tell whether the session was already refreshed
+        self._auth_generation = 0
+        self._auth_lock = asyncio.Lock()
+
+    async def connect(self):
+        """
+        Authenticate the client, this is done automatically on the first request
+        """
+        async with self._auth_lock:
+            if self._connected or not self.auth:
+                return
+            await self._authenticate()
+
+    async def _authenticate(self):
+        logger.info("Authenticating")
+        token = _authenticating.set(True)
+        try:
+            result = self.auth.connect(self)
+            if inspect.isawaitable(result):
+                await result
+        finally:
+            _authenticating.reset(token)
+        self._connected = True
+        self._auth_generation += 1
+
+    def _can_refresh_token(self) -> bool:
+        # The requests of the authentication itself are never retried
+        return self.auth is not None and not _authenticating.get()
+
+    async def _refresh_token(self, generation: int):
+        """
+        Authenticate again after a 401, unless another task already did since the request was sent
+
+        :param generation: The authentication generation at the time the failed request was sent
+        """
+        async with self._auth_lock:
+            if self._auth_generation != generation:
+                return
+            logger.info("Fetching new token as the previous token expired")
+            try:
+                await self._authenticate()
+            except IcometrixHttpException as e:
+                raise IcometrixAuthException("Failed to authenticate") from e
+
+    async def close(self):
+        """
+        Close all connections of the client
+        """
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        await self.close()
+
+    async def _send(self, build_request: Callable[[], "httpx.Request"], content=None) -> "httpx.Response":
+        """
+        Send a request, retrying on the same status codes as the RequestsApiClient. When the session expired (401),
+        the first task to notice authenticates again while the other tasks wait, after which all of them send their
+        request once more. The request is built again, so it carries the new session.
+        """
+        if self.auth and not self._connected and not _authenticating.get():
+            await self.connect()
+
+        generation = self._auth_generation
+        response = await self._send_with_retries(build_request(), content)
+        if response.status_code == 401 and self._can_refresh_token():
+            await response.aclose()
+            await self._refresh_token(generation)
+            if isinstance(content, _RewindableStream):
+                content.rewind()
+            response = await self._send_with_retries(build_request(), content)
+        return response
+
+    async def _send_with_retries(self, request: "httpx.Request", content=None) -> "httpx.Response":
+        for attempt in range(RETRY_TOTAL + 1):
+            response = await self._client.send(request, stream=True)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == RETRY_TOTAL:
+                return response
+            await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** attempt))
+            if isinstance(content, _RewindableStream):
+                content.rewind()
+        return response  # pragma: no cover
+
+    async def _make_request(self,
+                            method: str,
+                            url: str,
+                            data=None,
+                            headers: Optional[dict] = None,
+                            params: Optional[dict] = None,
+                            stream=False) -> "httpx.Response":
+        """
+        private function to abstract most of the HTTP request logic
+
+        :param method: GET, POST, PUT, PATCH, DELETE...
+        :param url: A relative URL to specify the API endpoint
+        :param data: Request body, bytes or a :class:`~icometrix_sdk.utils.file_upload.MultipartEncoder`
+        :param headers: Dict containing additional request headers.
+        :param params: Dict containing query parameters.
+        :param stream: Don't read the response body, the caller has to close the response
+        :return:
+        """
+        full_url = urljoin(self.server, url)
+        content = _RewindableStream(data) if isinstance(data, MultipartEncoder) else data
+
+        def build_request() -> "httpx.Request":
+            return self._client.build_request(method, full_url, content=content, headers=headers, params=params)
+
+        response = await self._send(build_request, content)
+        if not stream or response.is_error:
+            await response.aread()
+            await response.aclose()
+
+        if response.is_error:
+            logger.error("Exception received when sending an HTTP request")
+            raise IcometrixHttpException(
+                message="An error occurred while making an HTTP request",
+                status_code=response.status_code,
+                response_text=response.text,
+                url=full_url
+            )
+        return response
+
+    async def get(self, uri: str, **kwargs) -> dict:
+        """
+        Submit a GET request to the API.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param params: A dictionary containing query parameters.
+        :returns: The API response as a dictionary.
+        """
+        resp = await self._make_request("GET", uri, **kwargs)
+        return response_to_dict(resp)
+
+    async def get_as(self, uri: str, model_type: Type[T], raw: Optional[bool] = None,
+                     fields: Optional[Sequence[str]] = None, **kwargs) -> T:
+        """
+        Submit a GET request to the API and validate the response body as a model.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param model_type: The model type, e.g. ``StudyEntity`` or ``PaginatedResponse[StudyEntity]``
+        :param raw: Skip the validation and return the entities as dicts, defaults to the raw setting of the client
+        :param fields: Only request (and keep) these fields of the entities
+        :returns: The validated model
+        """
+        raw = self.raw if raw is None else raw
+        if fields is not None:
+            kwargs = with_fields(kwargs, fields)
+        resp = await self._make_request("GET", uri, **kwargs)
+        if not raw and fields is None:
+            return parse_json_as(resp.content, model_type)
+        return convert_as(response_to_dict(resp), model_type, raw, fields)
+
+    async def post(self, uri: str, data: dict, **kwargs) -> dict:
+        """
+        Submit a POST request to the API.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param data: A dictionary containing data for the request body
+        :returns: The API response as a dictionary.
+        """
+        resp = await self._make_request("POST", uri, data=json.dumps(data).encode(), **kwargs)
+        return response_to_dict(resp)
+
+    async def put(self, uri: str, data: dict, **kwargs) -> dict:
+        """
+        Submit a PUT request to the API.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param data: A dictionary containing data for the request body
+        :returns: The API response as a dictionary.
+        """
+        resp = await self._make_request("PUT", uri, data=json.dumps(data).encode(), **kwargs)
+        return response_to_dict(resp)
+
+    async def delete(self, uri: str, **kwargs):
+        """
+        Submit a DELETE request to the API.
+
+        :param uri: A relative URL to specify the API endpoint
+        :returns: void
+        """
+        await self._make_request("DELETE", uri, **kwargs)
+
+    async def put_file(self, uri: str, fields, **kwargs):
+        """
+        Submit a multipart PUT request to the API, file objects in the fields are streamed.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param fields: Dictionary of fields or list of (key, :class:`~urllib3.fields.RequestField`).
+        :returns:
+        """
+        data, headers = create_streaming_multipart(fields)
+        await self._make_request("PUT", uri, data=data, headers=headers, **kwargs)
+
+    async def stream_file(self, uri: str, out_path: str, **kwargs) -> int:
+        """
+        Download a file from the API, see :meth:`~icometrix_sdk.utils.requests_api_client.RequestsApiClient.stream_file`
+
+        :param uri: A relative URL to specify the API endpoint
+        :param out_path: A path to write the file to
+        :returns: The size of the file
+        """
+        response = await self._make_request("GET", uri, stream=True, **kwargs)
+        try:
+            # The disk operations are done in a thread to not block the event loop
+            writer = await asyncio.to_thread(DownloadWriter, out_path, response.headers)
+            try:
+                async for chunk in response.aiter_raw():
+                    await asyncio.to_thread(writer.write, chunk)
+            except BaseException:
+                await asyncio.to_thread(writer.abort)
+                raise
+            return await asyncio.to_thread(_commit, writer)
+        finally:
+            await response.aclose()
+
+
+def _commit(writer: DownloadWriter) -> int:
+    try:
+        return writer.commit()
+    except Exception:
+        writer.abort()
+        raise
+
+
+class _RewindableStream:
+    """
+    Async adapter around a MultipartEncoder, file reads are done in a thread to not block the event loop
+    """
+
+    def __init__(self, body: MultipartEncoder):
+        self._body = body
+
+    def rewind(self):
+        self._body.seek(0)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await asyncio.to_thread(self._body.read, self._body.chunk_size)
+            if not chunk:
+                return
+            yield chunk
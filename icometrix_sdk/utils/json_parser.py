@@ -0,0 +1,123 @@
+import json
+from functools import lru_cache
+from typing import Any, Collection, Optional, Sequence, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from icometrix_sdk.exceptions import IcometrixParseException
+from icometrix_sdk.models.base import PaginatedResponse, PaginatedMetaData
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+T = TypeVar("T")
+
+
+def loads(content: bytes) -> Any:
+    """
+    Parse a JSON response body, with orjson when it is installed (pip install orjson)
+    """
+    try:
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+    except ValueError as e:
+        raise IcometrixParseException("Failed to parse response to json: {}".format(e.args[0]))
+
+
+@lru_cache(maxsize=None)
+def type_adapter(model_type: Type[T]) -> TypeAdapter[T]:
+    """
+    The (cached) pydantic type adapter of a model type, building an adapter is expensive
+    """
+    return TypeAdapter(model_type)
+
+
+def parse_json_as(content: bytes, model_type: Type[T]) -> T:
+    """
+    Validate a JSON response body as a model, without parsing it into a dict first
+
+    :param content: The raw response body
+    :param model_type: The model type, e.g. ``StudyEntity`` or ``PaginatedResponse[StudyEntity]``
+    :return: The validated model
+    """
+    try:
+        return type_adapter(model_type).validate_json(content)
+    except ValidationError as e:
+        if e.errors()[0]["type"] == "json_invalid":
+            raise IcometrixParseException("Failed to parse response to json: {}".format(e.errors()[0]["msg"]))
+        raise
+
+
+def validate_as(data: Any, model_type: Type[T]) -> T:
+    """
+    Validate a parsed JSON response as a model
+
+    :param data: The parsed response, e.g. the result of :meth:`~icometrix_sdk.utils.api_client.ApiClient.get`
+    :param model_type: The model type
+    :return: The validated model
+    """
+    return type_adapter(model_type).validate_python(data)
+
+
+def raw_as(data: Any, model_type: Type[T]) -> T:
+    """
+    Skip the validation of a parsed JSON response, the entities are kept as dicts
+
+    A page is still built as a :class:`~icometrix_sdk.models.base.PaginatedResponse`, with its results as dicts,
+    so it can be paginated. Only use this for trusted data, when the validation is too expensive, e.g. when reading
+    many entities for an export.
+
+    :param data: The parsed response
+    :param model_type: The model type the response would be validated as
+    :return: The response dict, or a page of dicts
+    """
+    if isinstance(model_type, type) and issubclass(model_type, PaginatedResponse):
+        return model_type.model_construct(meta_data=PaginatedMetaData.model_validate(data["meta_data"]),
+                                          results=data["results"])
+    return data
+
+
+def project_as(data: Any, model_type: Type[T], fields: Collection[str], raw: bool = False) -> T:
+    """
+    Keep only some fields of the entities of a parsed response, e.g. to drop large fields the server sent anyway
+
+    Only the kept fields are validated, the other fields are not set: accessing them raises an AttributeError
+    (unless they have a default).
+
+    :param data: The parsed response
+    :param model_type: The model type of the response, an entity or a page of entities
+    :param fields: The fields to keep
+    :param raw: Keep the entities as dicts, see :func:`raw_as`
+    :return: The entity, or a page of entities, with only the kept fields
+    """
+    keep = set(fields)
+    if isinstance(model_type, type) and issubclass(model_type, PaginatedResponse):
+        entity_type = model_type.__pydantic_generic_metadata__["args"][0]
+        return model_type.model_construct(meta_data=PaginatedMetaData.model_validate(data["meta_data"]),
+                                          results=[_project(item, entity_type, keep, raw)
+                                                   for item in data["results"]])
+    return _project(data, model_type, keep, raw)
+
+
+def _project(item: dict, model_type: Type[T], keep: Collection[str], raw: bool) -> T:
+    item = {key: value for key, value in item.items() if key in keep}
+    if raw or not (isinstance(model_type, type) and issubclass(model_type, BaseModel)):
+        return item
+
+    entity = model_type.model_construct()
+    for key, value in item.items():
+        if key in model_type.model_fields:
+            model_type.__pydantic_validator__.validate_assignment(entity, key, value)
+    return entity
+
+
+def convert_as(data: Any, model_type: Type[T], raw: bool = False, fields: Optional[Sequence[str]] = None) -> T:
+    """
+    Build the model of a parsed response, see :meth:`~icometrix_sdk.utils.api_client.ApiClient.get_as`
+    """
+    if fields is not None:
+        return project_as(data, model_type, fields, raw)
+    if raw:
+        return raw_as(data, model_type)
+    return validate_as(data, model_type)
@@ -1,8 +1,20 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from inspect import signature
-from typing import Callable, Generic, TypeVar, Optional, Iterable, ParamSpec
+from math import ceil
+from typing import Awaitable, Callable, Deque, Generic, TypeVar, Optional, Iterable, Iterator, ParamSpec
 
+from icometrix_sdk.exceptions import IcometrixHttpException
+from icometrix_sdk.logger import logger_name
 from icometrix_sdk.models.base import PaginatedResponse
 
+# Status codes on which the adaptive paginator retries with a smaller page
+ADAPTIVE_RETRY_STATUS_CODES = (413, 500, 502, 503, 504)
+
+logger = logging.getLogger(logger_name)
+
 T = TypeVar("T")
 P = ParamSpec("P")
 
@@ -15,50 +27,206 @@ def can_paginate(func: Callable):
     return issubclass(sig.return_annotation, PaginatedResponse)
 
 
+class AdaptivePageSize:
+    """
+    Adapts the page size to the response latency
+
+    The page size is doubled while pages are returned faster than half the target latency, and halved when a
+    page is slower than the target latency, or fails with a 413 or 5xx status code. The API paginates with a
+    page index, so the size only changes at an item offset that is a multiple of the new size: when half the page
+    size doesn't divide the offset (e.g. an odd page size), the page size shrinks to the largest divisor of the
+    offset below half the page size. A page size that failed is not tried again.
+
+    :param page_size: The initial page size
+    :param max_page_size: The maximum page size
+    :param target_latency: The target duration of a request (in seconds)
+    """
+
+    def __init__(self, page_size: int, max_page_size: int, target_latency: float):
+        self.page_size = page_size
+        self.max_page_size = max(max_page_size, page_size)
+        self.target_latency = target_latency
+
+    def can_shrink(self) -> bool:
+        return self.page_size > 1
+
+    def shrink(self, offset: int, failed: bool = False):
+        """
+        Halve the page size, after a failed request the page size won't grow back to the failed size
+
+        :param offset: The item offset of the next page, the new page size divides it
+        """
+        page_size = self.page_size // 2
+        while offset % page_size:
+            page_size -= 1
+        self.page_size = page_size
+        if failed:
+            self.max_page_size = self.page_size
+
+    def update(self, latency: float, offset: int):
+        """
+        Update the page size after a page was fetched
+
+        :param latency: The duration of the request
+        :param offset: The item offset of the next page
+        """
+        if latency > self.target_latency:
+            if self.can_shrink():
+                self.shrink(offset)
+        elif latency < self.target_latency / 2:
+            if self.page_size * 2 <= self.max_page_size and offset % (self.page_size * 2) == 0:
+                self.page_size *= 2
+
+
 class PageIterator(Generic[T], Iterable):
     """
     An iterable object to iterate over paginated api responses
+
+    With ``prefetch`` the next pages are requested in background threads while the caller processes the current
+    page. The total amount of pages is known after the first page, so up to ``prefetch`` pages are fetched in
+    parallel. Pages are always returned in order. Call :meth:`close` (or use the iterator as a context manager)
+    when you stop iterating early, to cancel the pages that were not fetched yet.
+
+    With ``adaptive`` the page size is adapted to the response latency, see :class:`AdaptivePageSize`.
     """
 
     _current_page: Optional[PaginatedResponse[T]] = None
 
-    def __init__(self, func: Callable, op_kwargs, page_size: int = 50, starting_index=0):
+    def __init__(self, func: Callable, op_kwargs, page_size: int = 50, starting_index=0, prefetch: int = 0,
+                 adaptive: Optional[AdaptivePageSize] = None):
+        if prefetch > 0 and adaptive is not None:
+            raise ValueError("A paginator can't both prefetch and adapt its page size")
         self._func = func
         self._op_kwargs = op_kwargs
         self._page_size = page_size
         self._starting_index = starting_index
         self._page_index = starting_index
         self._params = {"pageIndex": self._page_index, "pageSize": self._page_size}
+        self._prefetch = prefetch
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque["Future[PaginatedResponse[T]]"] = deque()
+        self._end_index: Optional[int] = None
+        self._next_index = starting_index
+        self._adaptive = adaptive
+        self._offset = starting_index * page_size
 
     def __iter__(self):
+        self.close()
+        self._offset = self._starting_index * self._page_size
+        if self._adaptive is not None:
+            self._adaptive.page_size = self._page_size
         self._page_index = self._starting_index
         self._params = {"pageIndex": self._page_index, "pageSize": self._page_size}
+        self._current_page = None
+        self._end_index = None
         return self
 
     def __next__(self) -> PaginatedResponse[T]:
-        if self._current_page is None:
-            self._current_page = self._fetch_current_page()
-            self._page_index = self._page_index + 1
-            return self._current_page
-        if not self._current_page.has_next():
+        if self._current_page is not None and not self._current_page.has_next():
+            self.close()
             raise StopIteration
 
-        self._current_page = self._fetch_current_page()
+        if self._adaptive is not None:
+            self._current_page = self._fetch_adaptive_page()
+        elif self._prefetch > 0 and self._current_page is not None:
+            self._current_page = self._next_prefetched_page()
+        else:
+            self._current_page = self._fetch_current_page()
         self._page_index = self._page_index + 1
         return self._current_page
 
+    def items(self, limit: Optional[int] = None, take_while: Optional[Callable[[T], bool]] = None) -> Iterator[T]:
+        """
+        Iterate over the items of all pages, see :func:`iter_items`
+        """
+        if limit is not None and limit <= 0:
+            return
+        count = 0
+        try:
+            for page in self:
+                for item in page:
+                    if take_while is not None and not take_while(item):
+                        return
+                    yield item
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def close(self):
+        """
+        Cancel the prefetched pages and stop the background threads
+        """
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _page_kwargs(self, page_index: int, page_size: Optional[int] = None) -> dict:
+        # Every request gets its own params, the prefetched requests run concurrently
+        params = {"pageIndex": page_index, "pageSize": page_size or self._page_size}
+        return {**self._op_kwargs, "params": {**self._op_kwargs.get("params", {}), **params}}
+
     def _fetch_current_page(self) -> PaginatedResponse[T]:
         self._params = {"pageIndex": self._page_index, "pageSize": self._page_size}
-        if "params" in self._op_kwargs:
-            self._op_kwargs["params"].update(self._params)
-        else:
-            self._op_kwargs["params"] = self._params
-        return self._func(**self._op_kwargs)
+        return self._func(**self._page_kwargs(self._page_index))
+
+    def _fetch_adaptive_page(self) -> PaginatedResponse[T]:
+        adaptive = self._adaptive
+        while True:
+            page_size = adaptive.page_size
+            page_index = self._offset // page_size
+            self._params = {"pageIndex": page_index, "pageSize": page_size}
+            start = time.monotonic()
+            try:
+                page = self._func(**self._page_kwargs(page_index, page_size))
+            except IcometrixHttpException as e:
+                if e.status_code not in ADAPTIVE_RETRY_STATUS_CODES or not adaptive.can_shrink():
+                    raise
+                adaptive.shrink(self._offset, failed=True)
+                logger.info(f"Page request failed ({e.status_code}), retrying with page size {adaptive.page_size}")
+                continue
+
+            self._offset += page_size
+            adaptive.update(time.monotonic() - start, self._offset)
+            return page
+
+    def _next_prefetched_page(self) -> PaginatedResponse[T]:
+        if self._executor is None:
+            # The amount of pages is known from the first page
+            result_set = self._current_page.meta_data.result_set
+            limit = int(result_set.limit) or self._page_size
+            remaining = int(result_set.count) - int(result_set.offset) - limit
+            self._end_index = self._page_index + ceil(remaining / limit)
+            self._next_index = self._page_index
+            self._executor = ThreadPoolExecutor(self._prefetch, thread_name_prefix="paginator")
+
+        while len(self._pending) < self._prefetch and self._next_index < self._end_index:
+            self._pending.append(self._executor.submit(self._func, **self._page_kwargs(self._next_index)))
+            self._next_index += 1
+
+        if not self._pending:
+            # The count grew since the first page
+            return self._fetch_current_page()
+
+        try:
+            return self._pending.popleft().result()
+        except BaseException:
+            self.close()
+            raise
 
 
 def get_paginator(func: Callable[..., PaginatedResponse[T]],
                   page_size: Optional[int] = 50,
-                  starting_index: Optional[int] = 0, **kwargs) -> PageIterator[T]:
+                  starting_index: Optional[int] = 0, prefetch: int = 0, adaptive: bool = False,
+                  max_page_size: int = 1000, target_latency: float = 1.0, **kwargs) -> PageIterator[T]:
     """
     Create paginator object for an operation.
 
@@ -73,11 +241,99 @@ def get_paginator(func: Callable[..., PaginatedResponse[T]],
         The size of the pages
     :param starting_index:
         The starting page
+    :param prefetch:
+        The amount of pages fetched in parallel ahead of the current page, 0 to fetch the pages one by one
+    :param adaptive:
+        Grow the page size while the responses are fast, and shrink it when they are slow or fail with a 413/5xx
+        (can't be combined with prefetch)
+    :param max_page_size:
+        The maximum page size in adaptive mode
+    :param target_latency:
+        The target duration of a request (in seconds) in adaptive mode
     :returns: A PageIterator
     """
     if not can_paginate(func):
         raise ValueError(f"Function '{func.__name__}' can't be paginated")
 
+    adaptive_page_size = AdaptivePageSize(page_size, max_page_size, target_latency) if adaptive else None
     # sig = signature(func)
     return PageIterator[T](func, op_kwargs=kwargs, page_size=page_size,
-                           starting_index=starting_index)
+                           starting_index=starting_index, prefetch=prefetch, adaptive=adaptive_page_size)
+
+
+def iter_items(func: Callable[..., PaginatedResponse[T]],
+               page_size: Optional[int] = 50,
+               limit: Optional[int] = None,
+               take_while: Optional[Callable[[T], bool]] = None,
+               prefetch: int = 0, **kwargs) -> Iterator[T]:
+    """
+    Iterate over the items of a paginated operation, instead of over the pages
+
+    Pages are fetched lazily and only the current page is kept in memory. Stopping the iteration (or reaching
+    ``limit`` or ``take_while``) doesn't request any further pages.
+
+    :param func:
+        The function that needs to be paginated. (The function needs
+         to return a :class:`~icometrix_sdk.models.base.PaginatedResponse`)
+    :param page_size:
+        The size of the pages
+    :param limit:
+        The maximum amount of items
+    :param take_while:
+        Stop at the first item for which this function returns False
+    :param prefetch:
+        The amount of pages fetched in parallel ahead of the current page, see :func:`get_paginator`
+    :returns: A generator of items
+    """
+    return get_paginator(func, page_size=page_size, prefetch=prefetch, **kwargs).items(limit, take_while)
+
+
+class AsyncPageIterator(Generic[T]):
+    """
+    An async iterable object to iterate over paginated api responses
+    """
+
+    def __init__(self, func: Callable, op_kwargs, page_size: int = 50, starting_index=0):
+        self._func = func
+        self._op_kwargs = op_kwargs
+        self._page_size = page_size
+        self._starting_index = starting_index
+        self._page_index = starting_index
+        self._current_page: Optional[PaginatedResponse[T]] = None
+
+    def __aiter__(self):
+        self._page_index = self._starting_index
+        self._current_page = None
+        return self
+
+    async def __anext__(self) -> PaginatedResponse[T]:
+        if self._current_page is not None and not self._current_page.has_next():
+            raise StopAsyncIteration
+
+        # A new params dict per request, the caller's params are never modified
+        params = {"pageIndex": self._page_index, "pageSize": self._page_size}
+        kwargs = {**self._op_kwargs, "params": {**self._op_kwargs.get("params", {}), **params}}
+        self._current_page = await self._func(**kwargs)
+        self._page_index = self._page_index + 1
+        return self._current_page
+
+
+def get_async_paginator(func: Callable[..., Awaitable[PaginatedResponse[T]]],
+                        page_size: Optional[int] = 50,
+                        starting_index: Optional[int] = 0, **kwargs) -> AsyncPageIterator[T]:
+    """
+    Create an async paginator object for an async operation, see :func:`get_paginator`
+
+    :param func:
+        The coroutine function that needs to be paginated. (The function needs
+         to return a :class:`~icometrix_sdk.models.base.PaginatedResponse`)
+    :param page_size:
+        The size of the pages
+    :param starting_index:
+        The starting page
+    :returns: An AsyncPageIterator
+    """
+    if not can_paginate(func):
+        raise ValueError(f"Function '{func.__name__}' can't be paginated")
+
+    return AsyncPageIterator[T](func, op_kwargs=kwargs, page_size=page_size, starting_index=starting_index)
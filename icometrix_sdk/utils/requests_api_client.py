@@ -1,25 +1,38 @@
+import hashlib
 import json
 import logging
 import os
 import shutil
+import threading
+import time
 import uuid
-from typing import Optional, Type
-from urllib.parse import urljoin
+from typing import Optional, Sequence, Type, TypeVar
+from urllib.parse import urljoin, urlparse
 
 import requests
 from requests import Response, HTTPError, Session
-from requests.adapters import HTTPAdapter
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
 from urllib3.util import Retry
 
 from icometrix_sdk._version import __version__
 from icometrix_sdk.authentication import AuthenticationMethod
-from icometrix_sdk.exceptions import IcometrixHttpException, IcometrixParseException, IcometrixConfigException, \
-    IcometrixAuthException
+from icometrix_sdk.exceptions import IcometrixHttpException, IcometrixConfigException, IcometrixAuthException
 from icometrix_sdk.logger import logger_name
-from icometrix_sdk.utils.api_client import ApiClient
-from icometrix_sdk.utils.file_upload import create_multipart
+from icometrix_sdk.utils.api_client import ApiClient, with_fields
+from icometrix_sdk.utils.concurrency import SingleFlight, SingleFlightStats
+from icometrix_sdk.utils.file_download import DownloadWriter
+from icometrix_sdk.utils.file_upload import create_streaming_multipart
+from icometrix_sdk.utils.json_parser import loads, parse_json_as, convert_as
+from icometrix_sdk.utils.response_cache import ResponseCache, CachedResponse
+
+T = TypeVar("T")
 
 HTTP_TIMEOUT = os.getenv("HTTP_TIMEOUT", 120)
+# The amount of hosts with a connection pool, and the amount of connections kept per host
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", DEFAULT_POOLSIZE))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 64))
+# Wait for a free connection instead of opening a connection that is discarded afterwards
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
 
 logger = logging.getLogger(logger_name)
 
@@ -29,14 +42,33 @@ class RequestsApiClient(ApiClient):
     An implementation of the API client using the requests library
 
     Dev Note: Try not the expose requests logic, we might want to swap this later on
-    """
 
-    _auth_attempts = 0
+    The client can be shared between threads. Use at least as many connections per host (``pool_maxsize``) as
+    threads, otherwise connections are opened and discarded for every request above the limit (or the requests
+    wait for a free connection with ``pool_block``). When the session expires (401), the first thread to notice
+    authenticates again while the other threads wait, after which all of them retry their request once.
+
+    :param server: The icometrix server, e.g. https://icobrain-eu.icometrix.com
+    :param auth: The authentication method
+    :param cache: A cache for GET responses, see :mod:`~icometrix_sdk.utils.response_cache`
+    :param coalesce: Let identical GET requests that are made at the same time (from different threads) share one
+        request and its response
+    :param pool_connections: The amount of hosts to keep a connection pool for
+    :param pool_maxsize: The maximum amount of connections kept per host
+    :param pool_block: Wait for a free connection when all connections of a host are in use
+    :param keep_alive: Reuse connections between requests
+    :param raw: Skip the validation of the responses and return the entities as dicts, e.g. when reading many
+        entities (it can also be set per request, see :meth:`get_as`)
+    """
 
     _session: Session
     auth: Optional[AuthenticationMethod]
+    cache: Optional[ResponseCache]
 
-    def __init__(self, server: str, auth: Optional[AuthenticationMethod] = None):
+    def __init__(self, server: str, auth: Optional[AuthenticationMethod] = None,
+                 cache: Optional[ResponseCache] = None, coalesce: bool = True,
+                 pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 pool_block: bool = HTTP_POOL_BLOCK, keep_alive: bool = True, raw: bool = False):
         self.base_headers = {
             "User-Agent": "Python SDK v{}".format(__version__),
             "x-sdk-type": "Python",
@@ -47,28 +79,54 @@ class RequestsApiClient(ApiClient):
         }
         self.server = server
         self.auth = auth
+        self.cache = cache
+        self.raw = raw
+        self._single_flight = SingleFlight() if coalesce else None
+        if not keep_alive:
+            self.base_headers["Connection"] = "close"
 
         if not server:
             raise IcometrixConfigException("Server is required")
 
-        self._session = self._create_session()
+        # Incremented on every (re-)authentication, so threads can tell whether the session was already refreshed
+        self._auth_generation = 0
+        self._auth_lock = threading.Lock()
+        self._authenticating = threading.local()
+
+        self._session = self._create_session(pool_connections, pool_maxsize, pool_block)
         self._authenticate()
 
     def _authenticate(self):
         if self.auth:
             logger.info("Authenticating")
-            self._auth_attempts += 1
-            self.auth.connect(self)
-            self._auth_attempts = 0
-
-    def _refresh_token(self, resp: Response):
-        if self._auth_attempts > 0:
-            raise IcometrixAuthException("Failed to authenticate")
-        if resp.status_code == 401:
+            self._authenticating.active = True
+            try:
+                self.auth.connect(self)
+            finally:
+                self._authenticating.active = False
+            self._auth_generation += 1
+
+    def _can_refresh_token(self) -> bool:
+        # The requests of the authentication itself are never retried
+        return self.auth is not None and not getattr(self._authenticating, "active", False)
+
+    def _refresh_token(self, generation: int):
+        """
+        Authenticate again after a 401, unless another thread already did since the request was sent
+
+        :param generation: The authentication generation at the time the failed request was sent
+        """
+        with self._auth_lock:
+            if self._auth_generation != generation:
+                return
             logger.info("Fetching new token as the previous token expired")
-            self._authenticate()
+            try:
+                self._authenticate()
+            except IcometrixHttpException as e:
+                raise IcometrixAuthException("Failed to authenticate") from e
 
-    def _create_session(self) -> Session:
+    def _create_session(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                        pool_block: bool = HTTP_POOL_BLOCK) -> Session:
         """
         Create a new session
         """
@@ -78,7 +136,10 @@ class RequestsApiClient(ApiClient):
             backoff_factor=0.5,
             status_forcelist=[429, 502, 503, 504],
         )
-        session.mount('https://', HTTPAdapter(max_retries=retries))
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block,
+                              max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         session.headers.update(self.base_headers)
         return session
 
@@ -105,8 +166,9 @@ class RequestsApiClient(ApiClient):
         """
 
         full_url = urljoin(self.server, url)
-        try:
-            response = self._session.request(
+
+        def send() -> Response:
+            return self._session.request(
                 method=method,
                 url=full_url,
                 data=data,
@@ -117,11 +179,22 @@ class RequestsApiClient(ApiClient):
                 cookies=cookies,
                 stream=stream
             )
+
+        try:
+            generation = self._auth_generation
+            response = send()
+            if response.status_code == 401 and self._can_refresh_token():
+                response.close()
+                self._refresh_token(generation)
+                if hasattr(data, "seek"):
+                    data.seek(0)
+                response = send()
             response.raise_for_status()
         except HTTPError as e:
             response = e.response
-            status_code = response.status_code if response else None
-            response_text = response.text if response else str(e)
+            # An error response is falsy, compare with None
+            status_code = response.status_code if response is not None else None
+            response_text = response.text if response is not None else str(e)
             logger.exception("Exception received when sending an HTTP request")
             raise IcometrixHttpException(
                 message="An error occurred while making an HTTP request",
@@ -140,13 +213,110 @@ class RequestsApiClient(ApiClient):
         :param params: A dictionary containing query parameters.
         :returns: The API response as a dictionary.
         """
+        return content_to_dict(self._get_content(uri, **kwargs))
+
+    def get_as(self, uri: str, model_type: Type[T], raw: Optional[bool] = None,
+               fields: Optional[Sequence[str]] = None, **kwargs) -> T:
+        """
+        Submit a GET request to the API and validate the response body as a model.
+
+        The body is validated by pydantic directly, without parsing it into a dict first.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param model_type: The model type, e.g. ``StudyEntity`` or ``PaginatedResponse[StudyEntity]``
+        :param raw: Skip the validation and return the entities as dicts
+            (see :func:`~icometrix_sdk.utils.json_parser.raw_as`), defaults to the raw setting of the client
+        :param fields: Only request (and keep) these fields of the entities
+            (see :func:`~icometrix_sdk.utils.json_parser.project_as`)
+        :param params: A dictionary containing query parameters.
+        :returns: The validated model
+        """
+        raw = self.raw if raw is None else raw
+        if fields is not None:
+            kwargs = with_fields(kwargs, fields)
+        content = self._get_content(uri, **kwargs)
+        if not raw and fields is None:
+            return parse_json_as(content, model_type)
+        return convert_as(content_to_dict(content), model_type, raw, fields)
+
+    def _get_content(self, uri: str, **kwargs) -> bytes:
+        if self._single_flight is not None and set(kwargs) <= {"params"}:
+            params = kwargs.get("params")
+            key = (uri, tuple(sorted((k, str(v)) for k, v in params.items())) if params else ())
+            return self._single_flight.do(key, lambda: self._get(uri, **kwargs))
+        return self._get(uri, **kwargs)
+
+    def _get(self, uri: str, **kwargs) -> bytes:
+        if self.cache is not None and set(kwargs) <= {"params"}:
+            return self._cached_get(uri, kwargs.get("params"))
 
         resp = self._make_request(
             method="GET",
             url=uri,
             **kwargs
         )
-        return response_to_dict(resp)
+        return resp.content
+
+    def coalescing_stats(self) -> Optional[SingleFlightStats]:
+        """
+        The amount of GET requests made, and the amount of GET calls that shared the response of a concurrent
+        identical request (None when coalescing is disabled)
+        """
+        return self._single_flight.stats() if self._single_flight is not None else None
+
+    def _cached_get(self, uri: str, params: Optional[dict]) -> bytes:
+        """
+        A GET request that goes through the response cache
+        """
+        full_url = urljoin(self.server, uri)
+        rule = self.cache.rule_for(urlparse(full_url).path)
+        if rule is None:
+            return self._make_request(method="GET", url=uri, params=params).content
+
+        key = self.cache.key(full_url, params, self._cache_scope())
+        cached = self.cache.get(key)
+        if cached is not None and cached.is_fresh():
+            return cached.content
+
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        resp = self._make_request(method="GET", url=uri, params=params, headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            cached.expires_at = time.time() + rule.ttl
+            self.cache.set(cached)
+            return cached.content
+
+        no_store = "no-store" in resp.headers.get("Cache-Control", "")
+        if resp.status_code == 200 and not no_store and \
+                (rule.cacheable is None or rule.cacheable(content_to_dict(resp.content))):
+            self.cache.set(CachedResponse(key=key, content=resp.content, expires_at=time.time() + rule.ttl,
+                                          etag=resp.headers.get("ETag"),
+                                          last_modified=resp.headers.get("Last-Modified")))
+        elif cached is not None:
+            self.cache.delete(key)
+        return resp.content
+
+    def _cache_scope(self) -> Optional[str]:
+        """
+        The hashed identity of the user, so clients with other credentials don't share cached responses
+        """
+        if self.auth is None:
+            return None
+        identity = self.auth.identity() or self.base_headers["x-sdk-contextId"]
+        return hashlib.sha256(f"{type(self.auth).__name__}:{identity}".encode()).hexdigest()[:32]
+
+    def invalidate_cache(self, uri: str):
+        """
+        Remove the cached responses of an uri (for all query parameters)
+
+        :param uri: A relative URL of an API endpoint
+        """
+        if self.cache is not None:
+            self.cache.invalidate(urljoin(self.server, uri))
 
     def post(self, uri: str, data: dict, **kwargs) -> dict:
         """
@@ -164,6 +334,7 @@ class RequestsApiClient(ApiClient):
             data=json.dumps(data),
             **kwargs
         )
+        self.invalidate_cache(uri)
         return response_to_dict(resp)
 
     def put(self, uri: str, data: dict, **kwargs) -> dict:
@@ -182,6 +353,7 @@ class RequestsApiClient(ApiClient):
             data=json.dumps(data),
             **kwargs
         )
+        self.invalidate_cache(uri)
         return response_to_dict(resp)
 
     def delete(self, uri: str, **kwargs):
@@ -197,10 +369,14 @@ class RequestsApiClient(ApiClient):
             url=uri,
             **kwargs
         )
+        self.invalidate_cache(uri)
 
     def put_file(self, uri: str, fields, **kwargs):
         """
-        Submit a PUT request to the API.
+        Submit a multipart PUT request to the API.
+
+        The body is streamed, file objects in the fields are read in chunks while sending instead of being
+        loaded in memory.
 
         :param uri: A relative URL to specify the API endpoint
         :param fields: Dictionary of fields or list of (key, :class:`~urllib3.fields.RequestField`).
@@ -208,7 +384,7 @@ class RequestsApiClient(ApiClient):
 
         """
 
-        data, headers = create_multipart(fields)
+        data, headers = create_streaming_multipart(fields)
         self._make_request(
             method="PUT",
             url=uri,
@@ -217,15 +393,26 @@ class RequestsApiClient(ApiClient):
             **kwargs
         )
 
-    def stream_file(self, uri: str, out_path: str, **kwargs):
-        with self._make_request('GET', uri, stream=True) as r:
-            with open(out_path, 'wb') as f:
+    def stream_file(self, uri: str, out_path: str, **kwargs) -> int:
+        """
+        Download a file from the API.
+
+        The file is written to a temporary file and only moved to the out path once its size (and checksum, when
+        the server sends one) have been verified.
+
+        :param uri: A relative URL to specify the API endpoint
+        :param out_path: A path to write the file to
+        :returns: The size of the file
+        """
+        with self._make_request('GET', uri, stream=True, **kwargs) as r:
+            with DownloadWriter(out_path, r.headers) as f:
                 shutil.copyfileobj(r.raw, f)
+        return f.size
 
 
 def response_to_dict(response: Response) -> dict:
-    content = response.content
-    try:
-        return json.loads(content)
-    except ValueError as e:
-        raise IcometrixParseException("Failed to parse response to json: {}".format(e.args[0]))
+    return content_to_dict(response.content)
+
+
+def content_to_dict(content: bytes) -> dict:
+    return loads(content)
@@ -0,0 +1,319 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Set, Union
+from urllib.parse import urlencode
+
+from icometrix_sdk.logger import logger_name
+
+logger = logging.getLogger(logger_name)
+
+
+@dataclass
+class CachedResponse:
+    """
+    A cached response body, with the validators to revalidate it with a conditional request
+
+    :param key: The cache key, see :meth:`ResponseCache.key`
+    :param content: The raw response body
+    :param expires_at: The (unix) time until which the response is used without revalidating it
+    :param etag: The ETag header of the response
+    :param last_modified: The Last-Modified header of the response
+    """
+    key: str
+    content: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+@dataclass
+class CacheRule:
+    """
+    Which responses are cached, and for how long
+
+    :param pattern: A regex that is matched against the path of the request
+    :param ttl: How long (in seconds) a response is used without revalidating it
+    :param cacheable: Only cache a response when this returns True for the parsed body,
+        e.g. to only cache finished customer reports
+    """
+    pattern: Union[str, Pattern]
+    ttl: float
+    cacheable: Optional[Callable[[dict], bool]] = None
+
+    def matches(self, path: str) -> bool:
+        return re.search(self.pattern, path) is not None
+
+
+def _is_finished(body: dict) -> bool:
+    return body.get("status") == "Finished"
+
+
+# Single entities that rarely change once created
+DEFAULT_CACHE_RULES = [
+    CacheRule(r"/projects/[^/]+$", ttl=300),
+    CacheRule(r"/patients/[^/]+$", ttl=300),
+    CacheRule(r"/studies/[^/]+$", ttl=300),
+    CacheRule(r"/series/[^/]+$", ttl=300),
+    CacheRule(r"/customer-reports/[^/]+$", ttl=3600, cacheable=_is_finished),
+]
+
+
+class ResponseCache(ABC):
+    """
+    A cache of GET responses, used by the :class:`~icometrix_sdk.utils.requests_api_client.RequestsApiClient`
+
+    Only the requests matching one of the rules are cached. A cached response is returned without a request until
+    its TTL expires, after that it is revalidated with a conditional request (If-None-Match/If-Modified-Since)
+    when the server sent an ETag or Last-Modified header.
+
+    The responses are cached per identity (see :meth:`key`), so a cache can be shared by clients with different
+    credentials without one of them reading the responses of another.
+
+    :param rules: The cache rules, the first matching rule is used
+    """
+
+    def __init__(self, rules: Optional[List[CacheRule]] = None):
+        self.rules = DEFAULT_CACHE_RULES if rules is None else rules
+
+    def rule_for(self, path: str) -> Optional[CacheRule]:
+        return next((rule for rule in self.rules if rule.matches(path)), None)
+
+    @staticmethod
+    def key(path: str, params: Optional[dict] = None, scope: Optional[str] = None) -> str:
+        """
+        The cache key of a request
+
+        :param path: The url of the request
+        :param params: The query parameters
+        :param scope: The (hashed) identity of the user the response belongs to
+        """
+        key = f"{path}?{urlencode(sorted(params.items()), doseq=True)}" if params else path
+        return f"{key}#{scope}" if scope else key
+
+    @staticmethod
+    def url_of(key: str) -> str:
+        """
+        The url of a cache key, without the query parameters and identity
+        """
+        return key.partition("#")[0].partition("?")[0]
+
+    def invalidate(self, path: str):
+        """
+        Remove the cached responses of a path, for all query parameters and identities
+
+        This goes through all keys, backends should override it with a lookup of the keys of the path.
+        """
+        for key in list(self.keys()):
+            if self.url_of(key) == path:
+                self.delete(key)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        pass
+
+    @abstractmethod
+    def set(self, response: CachedResponse):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    An in-memory LRU response cache
+
+    :param rules: The cache rules
+    :param max_size: The maximum amount of cached responses
+    """
+
+    def __init__(self, rules: Optional[List[CacheRule]] = None, max_size: int = 1024):
+        super().__init__(rules)
+        self.max_size = max_size
+        self._responses: OrderedDict[str, CachedResponse] = OrderedDict()
+        # The keys of every url, so a url is invalidated without going through all keys
+        self._keys_by_url: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+            return response
+
+    def set(self, response: CachedResponse):
+        with self._lock:
+            self._responses[response.key] = response
+            self._responses.move_to_end(response.key)
+            self._keys_by_url[self.url_of(response.key)].add(response.key)
+            while len(self._responses) > self.max_size:
+                key, _ = self._responses.popitem(last=False)
+                self._remove_key(key)
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._responses.pop(key, None) is not None:
+                self._remove_key(key)
+
+    def invalidate(self, path: str):
+        with self._lock:
+            for key in self._keys_by_url.pop(path, ()):
+                del self._responses[key]
+
+    def _remove_key(self, key: str):
+        url = self.url_of(key)
+        keys = self._keys_by_url[url]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_url[url]
+
+    def keys(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._responses))
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+            self._keys_by_url.clear()
+
+
+# The files written by a DiskResponseCache: a directory per url (the sha256 of the url), containing the responses
+# (the sha256 of the key) and their temporary files
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+_TMP_FILE_RE = re.compile(r"^[0-9a-f]{64}\.[0-9a-f]{8}\.part$")
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    A response cache in a directory, shared between processes and kept between runs
+
+    Every response is a file: a JSON line with the metadata, followed by the body. Files are written to a
+    temporary file and moved in place, so concurrent readers never see a partial response. The responses of a url
+    are stored in the same subdirectory, so invalidating a url only touches its own files.
+
+    :param cache_dir: The directory of the cache, it is created when missing
+    :param rules: The cache rules
+    """
+
+    def __init__(self, cache_dir: str, rules: Optional[List[CacheRule]] = None):
+        super().__init__(rules)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _url_dir(self, url: str) -> str:
+        return os.path.join(self.cache_dir, _sha256(url))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._url_dir(self.url_of(key)), _sha256(key))
+
+    def _url_dirs(self) -> Iterator[str]:
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if _HASH_RE.match(name) and os.path.isdir(path):
+                yield path
+
+    @staticmethod
+    def _read(path: str, with_content: bool = True) -> Optional[CachedResponse]:
+        try:
+            with open(path, "rb") as fp:
+                metadata = json.loads(fp.readline())
+                content = fp.read() if with_content else b""
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(content=content, **metadata)
+
+    @staticmethod
+    def _remove_files(url_dir: str, include_tmp_files: bool = False):
+        """
+        Remove the (cached response) files of a url directory, and the directory once it is empty
+        """
+        try:
+            names = os.listdir(url_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if _HASH_RE.match(name) or (include_tmp_files and _TMP_FILE_RE.match(name)):
+                try:
+                    os.remove(os.path.join(url_dir, name))
+                except FileNotFoundError:
+                    pass
+        try:
+            os.rmdir(url_dir)
+        except OSError:
+            # Not empty, e.g. a response that is being written
+            pass
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        response = self._read(self._path(key))
+        # Guard against hash collisions
+        return response if response is not None and response.key == key else None
+
+    def set(self, response: CachedResponse):
+        metadata = asdict(response)
+        del metadata["content"]
+
+        path = self._path(response.key)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "xb") as fp:
+                fp.write(json.dumps(metadata).encode() + b"\n")
+                fp.write(response.content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write response cache {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self, path: str):
+        self._remove_files(self._url_dir(path))
+
+    def keys(self) -> Iterator[str]:
+        for url_dir in self._url_dirs():
+            for name in os.listdir(url_dir):
+                if not _HASH_RE.match(name):
+                    continue
+                response = self._read(os.path.join(url_dir, name), with_content=False)
+                if response is not None:
+                    yield response.key
+
+    def clear(self):
+        """
+        Remove the cached responses, other files in the cache directory are kept
+        """
+        for url_dir in list(self._url_dirs()):
+            self._remove_files(url_dir, include_tmp_files=True)
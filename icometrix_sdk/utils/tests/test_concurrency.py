@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from icometrix_sdk.exceptions import IcometrixHttpException
+from icometrix_sdk.utils.concurrency import bounded_map, bulk_map, SingleFlight
+
+
+def test_all_items_processed():
+    results = {item: future.result() for item, future in bounded_map(lambda x: x * 2, range(100), workers=4)}
+    assert results == {i: i * 2 for i in range(100)}
+
+
+def test_ordered():
+    def slow_first(x):
+        time.sleep(0.05 if x == 0 else 0)
+        return x
+
+    items = [item for item, _ in bounded_map(slow_first, range(20), workers=4, ordered=True)]
+    assert items == list(range(20))
+
+
+def test_items_consumed_lazily():
+    consumed = []
+    max_running = 0
+    running = 0
+    lock = threading.Lock()
+
+    def items():
+        for i in range(50):
+            consumed.append(i)
+            yield i
+
+    def work(x):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.001)
+        with lock:
+            running -= 1
+        return x
+
+    for item, _ in bounded_map(work, items(), workers=2, max_pending=4):
+        # Never more than max_pending items submitted, ahead of the consumer
+        assert len(consumed) - item <= 4 + 2
+    assert max_running <= 2
+
+
+def test_stop_on_error():
+    processed = []
+
+    def work(x):
+        processed.append(x)
+        if x == 3:
+            raise ValueError("failed")
+        return x
+
+    with pytest.raises(ValueError):
+        for _, future in bounded_map(work, range(1000), workers=2, ordered=True):
+            future.result()
+    assert len(processed) < 1000
+
+
+def test_single_flight():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {"id": "1234"}
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(single_flight.do, "a", slow_call)
+        started.wait()
+        followers = [pool.submit(single_flight.do, "a", slow_call) for _ in range(3)]
+        while single_flight.stats().coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+
+        results = [future.result() for future in [leader, *followers]]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats() == (1, 3)
+
+    # Once the call finished, the next call is made again
+    release.set()
+    single_flight.do("a", slow_call)
+    assert len(calls) == 2
+
+
+def test_single_flight_exception():
+    single_flight = SingleFlight()
+
+    def failing_call():
+        raise ValueError("Failed")
+
+    with pytest.raises(ValueError):
+        single_flight.do("a", failing_call)
+    assert single_flight.stats() == (1, 0)
+
+
+def test_bulk_map():
+    def fetch(x):
+        if x == 3:
+            raise IcometrixHttpException("Not found", status_code=404)
+        time.sleep(0.01 * (5 - x))
+        return x * 2
+
+    results = bulk_map(fetch, range(5), workers=5, complete_on_error=True)
+
+    assert [result.key for result in results] == [0, 1, 2, 3, 4]
+    assert [result.value for result in results] == [0, 2, 4, None, 8]
+    assert [result.ok for result in results] == [True, True, True, False, True]
+
+    with pytest.raises(IcometrixHttpException):
+        bulk_map(fetch, range(5), workers=5)
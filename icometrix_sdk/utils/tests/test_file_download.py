@@ -0,0 +1,54 @@
+import base64
+import hashlib
+import os
+
+import pytest
+
+from icometrix_sdk.exceptions import IcometrixIntegrityException
+from icometrix_sdk.utils.file_download import DownloadWriter
+
+CONTENT = b"DICM" * 1000
+
+
+def test_complete_download(tmp_path):
+    out_path = str(tmp_path / "report.pdf")
+    md5 = base64.b64encode(hashlib.md5(CONTENT).digest()).decode()
+    with DownloadWriter(out_path, {"Content-Length": str(len(CONTENT)), "Content-MD5": md5}) as f:
+        f.write(CONTENT[:100])
+        f.write(CONTENT[100:])
+
+    assert f.size == len(CONTENT)
+    with open(out_path, "rb") as fp:
+        assert fp.read() == CONTENT
+    assert os.listdir(tmp_path) == ["report.pdf"]
+
+
+def test_incomplete_download(tmp_path):
+    out_path = str(tmp_path / "report.pdf")
+    with pytest.raises(IcometrixIntegrityException):
+        with DownloadWriter(out_path, {"Content-Length": str(len(CONTENT))}) as f:
+            f.write(CONTENT[:100])
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_checksum_mismatch(tmp_path):
+    out_path = str(tmp_path / "report.pdf")
+    md5 = base64.b64encode(hashlib.md5(b"other").digest()).decode()
+    with pytest.raises(IcometrixIntegrityException):
+        with DownloadWriter(out_path, {"Content-MD5": md5}) as f:
+            f.write(CONTENT)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_download_keeps_existing_file(tmp_path):
+    out_path = tmp_path / "report.pdf"
+    out_path.write_bytes(b"previous")
+    with pytest.raises(ConnectionError):
+        with DownloadWriter(str(out_path)) as f:
+            f.write(CONTENT[:100])
+            raise ConnectionError()
+
+    assert out_path.read_bytes() == b"previous"
+    assert os.listdir(tmp_path) == ["report.pdf"]
@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from icometrix_sdk.utils.file_upload import create_multipart, create_streaming_multipart, MultipartEncoder
+
+BOUNDARY = "e4bf47cdf8b34c3b9d6e2a2e7f8c1a55"
+
+
+@pytest.fixture(scope="function")
+def file_content() -> bytes:
+    return bytes(range(256)) * 1000
+
+
+def test_same_body_as_urllib3(file_content: bytes):
+    expected, expected_headers = create_multipart({"file": ("IM-0001.dcm", file_content, "application/octet-stream"),
+                                                   "name": "value"}, BOUNDARY)
+    body, headers = create_streaming_multipart({"file": ("IM-0001.dcm", io.BytesIO(file_content),
+                                                         "application/octet-stream"),
+                                                "name": "value"}, BOUNDARY)
+
+    assert headers == expected_headers
+    assert len(body) == len(expected)
+    assert body.read() == expected
+
+
+def test_read_in_chunks(file_content: bytes):
+    expected, _ = create_multipart({"file": ("IM-0001.dcm", file_content)}, BOUNDARY)
+    body = MultipartEncoder({"file": ("IM-0001.dcm", io.BytesIO(file_content))}, BOUNDARY, chunk_size=1000)
+
+    chunks = list(body)
+    assert max(len(chunk) for chunk in chunks) == 1000
+    assert b"".join(chunks) == expected
+    assert body.read(10) == b""
+
+
+def test_rewind(file_content: bytes):
+    expected, _ = create_multipart({"file": ("IM-0001.dcm", file_content)}, BOUNDARY)
+    body = MultipartEncoder({"file": ("IM-0001.dcm", io.BytesIO(file_content))}, BOUNDARY)
+
+    body.read(5000)
+    assert body.tell() == 5000
+    body.seek(0)
+    assert body.read() == expected
+
+    body.seek(1234)
+    assert body.read() == expected[1234:]
+
+
+def test_file_changed_during_upload(file_content: bytes):
+    fp = io.BytesIO(file_content)
+    body = MultipartEncoder({"file": ("IM-0001.dcm", fp)}, BOUNDARY)
+    fp.truncate(10)
+
+    with pytest.raises(IOError):
+        body.read()
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from icometrix_sdk.authentication import AuthenticationMethod
+from icometrix_sdk.exceptions import IcometrixHttpException, IcometrixIntegrityException
+from icometrix_sdk.models.project_entity import ProjectEntity
+from icometrix_sdk.utils import httpx_api_client
+from icometrix_sdk.utils.httpx_api_client import HttpxApiClient
+
+SESSION_URI = "/authentication-service/api/v1/sessions"
+
+
+class FakeAuth(AuthenticationMethod):
+    def __init__(self):
+        self.connects = 0
+
+    async def connect(self, api):
+        self.connects += 1
+        return await api.post(SESSION_URI, data={})
+
+    def disconnect(self, api):
+        pass
+
+
+async def stream(data: bytes, chunk_size: int = 65536):
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+class FakeServer:
+    """
+    Answers 401 until a session is created, the first ``failures`` requests to other urls get a 503
+    """
+
+    def __init__(self, failures: int = 0, body: bytes = b""):
+        self.failures = failures
+        self.body = body
+        self.authenticated = False
+        self.requests = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        self.requests.append((request.method, request.url.path, content))
+        if request.url.path == SESSION_URI:
+            await asyncio.sleep(0.02)
+            self.authenticated = True
+            return httpx.Response(200, json={})
+        if not self.authenticated:
+            return httpx.Response(401, text="Unauthorized")
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503, text="Service unavailable")
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, text="Not found")
+        if request.url.path.endswith("/file"):
+            return httpx.Response(200, content=stream(self.body), headers={"Content-Length": str(len(self.body))})
+        return httpx.Response(200, json={"path": request.url.path})
+
+
+def create_client(server: FakeServer, auth: AuthenticationMethod = None) -> HttpxApiClient:
+    client = HttpxApiClient("https://api.test", auth or FakeAuth())
+    client._client = httpx.AsyncClient(headers=client.base_headers, transport=httpx.MockTransport(server.handle))
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    monkeypatch.setattr(httpx_api_client, "RETRY_BACKOFF_FACTOR", 0)
+
+
+def test_authenticates_once():
+    server = FakeServer()
+    auth = FakeAuth()
+    client = create_client(server, auth)
+
+    async def run():
+        return await asyncio.gather(*[client.get(f"/projects/{i}") for i in range(5)])
+
+    results = asyncio.run(run())
+
+    assert results == [{"path": f"/projects/{i}"} for i in range(5)]
+    assert auth.connects == 1
+    assert [path for _, path, _ in server.requests].count(SESSION_URI) == 1
+
+
+def test_refreshes_expired_session(tmp_path):
+    server = FakeServer()
+    auth = FakeAuth()
+    client = create_client(server, auth)
+    file_path = tmp_path / "IM-0001.dcm"
+    file_path.write_bytes(os.urandom(1000))
+
+    async def run():
+        await client.get("/projects/0")
+        # The session expires, the concurrent requests authenticate again once and are sent again
+        server.authenticated = False
+        with open(file_path, "rb") as fp:
+            return await asyncio.gather(
+                *[client.get(f"/projects/{i}") for i in range(5)],
+                client.put_file("/uploads/1", fields={"file": ("IM-0001.dcm", fp, "application/octet-stream")}))
+
+    results = asyncio.run(run())
+
+    assert results[:5] == [{"path": f"/projects/{i}"} for i in range(5)]
+    assert auth.connects == 2
+    uploads = [content for method, _, content in server.requests if method == "PUT"]
+    assert len(uploads) == 2 and file_path.read_bytes() in uploads[1]
+
+
+def test_error_raises_http_exception():
+    client = create_client(FakeServer())
+
+    with pytest.raises(IcometrixHttpException) as exc_info:
+        asyncio.run(client.get("/missing"))
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.response_text == "Not found"
+
+
+def test_retries_until_failing():
+    server = FakeServer(failures=10)
+    client = create_client(server)
+
+    with pytest.raises(IcometrixHttpException) as exc_info:
+        asyncio.run(client.get("/projects/1"))
+
+    assert exc_info.value.status_code == 503
+    assert len(server.requests) == 1 + httpx_api_client.RETRY_TOTAL + 1
+
+
+def test_put_file_rewinds_on_retry(tmp_path):
+    file_path = tmp_path / "IM-0001.dcm"
+    file_path.write_bytes(os.urandom(100_000))
+    server = FakeServer(failures=2)
+    client = create_client(server)
+
+    async def upload():
+        with open(file_path, "rb") as fp:
+            await client.put_file("/uploads/1", fields={"file": ("IM-0001.dcm", fp, "application/octet-stream")})
+
+    asyncio.run(upload())
+
+    bodies = [content for method, _, content in server.requests if method == "PUT"]
+    assert len(bodies) == 3
+    assert bodies[0] == bodies[1] == bodies[2]
+    assert file_path.read_bytes() in bodies[0]
+
+
+def test_get_as():
+    server = FakeServer()
+    client = create_client(server)
+    body = {"id": "1", "name": "Project", "abbrev": "PR", "country": "BE", "update_timestamp": None,
+            "creation_timestamp": None}
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        server.requests.append((request.method, request.url.path, request.url.params))
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    client.auth = None
+
+    project = asyncio.run(client.get_as("/projects/1", ProjectEntity))
+    assert isinstance(project, ProjectEntity) and project.id == "1"
+
+    raw = asyncio.run(client.get_as("/projects/1", ProjectEntity, raw=True))
+    assert raw == body
+
+    asyncio.run(client.get_as("/projects/1", ProjectEntity, fields=["id"]))
+    assert server.requests[-1][2]["fields"] == "id"
+
+
+def test_stream_file(tmp_path):
+    body = os.urandom(200_000)
+    client = create_client(FakeServer(body=body))
+    out_path = tmp_path / "report.pdf"
+
+    assert asyncio.run(client.stream_file("/reports/file", str(out_path))) == len(body)
+    assert out_path.read_bytes() == body
+    assert os.listdir(tmp_path) == ["report.pdf"]
+
+
+def test_stream_file_incomplete(tmp_path):
+    client = create_client(FakeServer())
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=stream(b"rep"), headers={"Content-Length": "6"})
+
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    client.auth = None
+
+    with pytest.raises(IcometrixIntegrityException):
+        asyncio.run(client.stream_file("/reports/file", str(tmp_path / "report.pdf")))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,61 @@
+import pytest
+from pydantic import ValidationError
+
+from icometrix_sdk.exceptions import IcometrixParseException
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.models.project_entity import ProjectEntity
+from icometrix_sdk.utils.json_parser import loads, parse_json_as, type_adapter, validate_as, raw_as, \
+    project_as
+
+PROJECT = b'{"id": "p1", "uri": "/projects/p1", "name": "Project", "update_timestamp": "2024-01-02T03:04:05.123456", ' \
+          b'"creation_timestamp": null, "abbrev": "P", "country": "BE"}'
+PAGE = b'{"meta_data": {"result_set": {"count": 3, "offset": 0, "limit": 1}}, "results": [' + PROJECT + b']}'
+
+
+def test_parse_json_as_matches_validate_as():
+    page = parse_json_as(PAGE, PaginatedResponse[ProjectEntity])
+
+    assert page == validate_as(loads(PAGE), PaginatedResponse[ProjectEntity])
+    assert page.has_next()
+    assert page[0].update_timestamp.tzinfo is not None
+
+
+def test_type_adapter_is_cached():
+    assert type_adapter(PaginatedResponse[ProjectEntity]) is type_adapter(PaginatedResponse[ProjectEntity])
+
+
+def test_invalid_json():
+    with pytest.raises(IcometrixParseException):
+        loads(b"<html>")
+    with pytest.raises(IcometrixParseException):
+        parse_json_as(b"<html>", ProjectEntity)
+
+
+def test_invalid_model():
+    with pytest.raises(ValidationError):
+        parse_json_as(b'{"uri": "/projects/p1"}', ProjectEntity)
+
+
+def test_raw_as():
+    data = loads(PAGE)
+    page = raw_as(data, PaginatedResponse[ProjectEntity])
+
+    assert isinstance(page, PaginatedResponse)
+    assert page.has_next()
+    assert page[0] is data["results"][0]
+    assert raw_as(loads(PROJECT), ProjectEntity) == loads(PROJECT)
+
+
+def test_project_as():
+    page = project_as(loads(PAGE), PaginatedResponse[ProjectEntity], ["id", "update_timestamp", "unknown"])
+
+    assert page.has_next()
+    assert page[0].id == "p1"
+    # The kept fields are validated
+    assert page[0].update_timestamp.tzinfo is not None
+    with pytest.raises(AttributeError):
+        page[0].name
+
+
+def test_project_as_raw():
+    assert project_as(loads(PROJECT), ProjectEntity, ["id", "name"], raw=True) == {"id": "p1", "name": "Project"}
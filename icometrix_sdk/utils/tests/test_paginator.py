@@ -0,0 +1,183 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from icometrix_sdk.exceptions import IcometrixHttpException
+from icometrix_sdk.models.base import PaginatedResponse
+from icometrix_sdk.utils.paginator import get_paginator, iter_items, get_async_paginator, AdaptivePageSize
+
+
+class FakeResource:
+    def __init__(self, count: int, delay: float = 0):
+        self.count = count
+        self.delay = delay
+        self.requested = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def get_all(self, project_id: str, **kwargs) -> PaginatedResponse[int]:
+        params = kwargs["params"]
+        with self._lock:
+            self.requested.append(params["pageIndex"])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+
+        offset = params["pageIndex"] * params["pageSize"]
+        results = list(range(offset, min(offset + params["pageSize"], self.count)))
+        return PaginatedResponse[int](
+            meta_data={"result_set": {"count": self.count, "offset": offset, "limit": params["pageSize"]}},
+            results=results)
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 4])
+@pytest.mark.parametrize("count", [0, 5, 10, 23])
+def test_pages_in_order(prefetch: int, count: int):
+    resource = FakeResource(count)
+    params = {"status": "Finished"}
+
+    pages = list(get_paginator(resource.get_all, page_size=5, prefetch=prefetch, project_id="p", params=params))
+
+    assert [item for page in pages for item in page] == list(range(count))
+    assert sorted(resource.requested) == list(range(max(1, -(-count // 5))))
+    # The params of the caller are not modified
+    assert params == {"status": "Finished"}
+
+
+def test_prefetch_in_parallel():
+    resource = FakeResource(100, delay=0.02)
+
+    pages = list(get_paginator(resource.get_all, page_size=5, prefetch=4, project_id="p"))
+
+    assert len(pages) == 20
+    assert resource.max_running == 4
+
+
+def test_close_cancels_prefetch():
+    resource = FakeResource(1000, delay=0.01)
+
+    with get_paginator(resource.get_all, page_size=5, prefetch=3, project_id="p") as paginator:
+        for page in paginator:
+            if page[0] >= 10:
+                break
+
+    time.sleep(0.05)
+    assert len(resource.requested) <= 3 + 3
+
+
+def test_iter_items():
+    resource = FakeResource(23)
+
+    assert list(iter_items(resource.get_all, page_size=5, project_id="p")) == list(range(23))
+
+
+def test_iter_items_limit():
+    resource = FakeResource(23)
+
+    assert list(iter_items(resource.get_all, page_size=5, limit=7, project_id="p")) == list(range(7))
+    assert resource.requested == [0, 1]
+
+
+def test_iter_items_take_while():
+    resource = FakeResource(23)
+
+    assert list(iter_items(resource.get_all, page_size=5, take_while=lambda i: i < 10, project_id="p")) == \
+           list(range(10))
+    assert resource.requested == [0, 1, 2]
+
+
+class SlowResource(FakeResource):
+    """
+    A resource that becomes slow, or fails, for large pages
+    """
+
+    def __init__(self, count: int, slow_page_size: int, fail_page_size: int = None):
+        super().__init__(count)
+        self.slow_page_size = slow_page_size
+        self.fail_page_size = fail_page_size
+        self.page_sizes = []
+
+    def get_all(self, project_id: str, **kwargs) -> PaginatedResponse[int]:
+        page_size = kwargs["params"]["pageSize"]
+        self.page_sizes.append(page_size)
+        if self.fail_page_size and page_size >= self.fail_page_size:
+            raise IcometrixHttpException("Payload too large", status_code=413)
+        self.delay = 0.02 if page_size >= self.slow_page_size else 0
+        return super().get_all(project_id, **kwargs)
+
+
+def test_adaptive_page_size():
+    resource = SlowResource(2000, slow_page_size=400)
+
+    items = list(iter_items(resource.get_all, page_size=50, adaptive=True, target_latency=0.01, project_id="p"))
+
+    assert items == list(range(2000))
+    assert max(resource.page_sizes) == 400
+    assert len(resource.page_sizes) < 2000 // 50
+
+
+def test_adaptive_page_size_shrinks_on_error():
+    resource = SlowResource(1000, slow_page_size=10000, fail_page_size=200)
+
+    items = list(iter_items(resource.get_all, page_size=50, adaptive=True, target_latency=1, project_id="p"))
+
+    assert items == list(range(1000))
+    assert resource.page_sizes.count(200) == 1
+    assert max(size for size in resource.page_sizes if size < 200) == 100
+
+
+def test_adaptive_odd_page_size_shrinks_on_error():
+    resource = SlowResource(1000, slow_page_size=10000, fail_page_size=25)
+
+    items = list(iter_items(resource.get_all, page_size=25, adaptive=True, target_latency=1, project_id="p"))
+
+    assert items == list(range(1000))
+    assert resource.page_sizes[:2] == [25, 12]
+    assert max(resource.page_sizes[1:]) < 25
+
+
+def test_adaptive_page_size_shrinks_to_divisor():
+    adaptive = AdaptivePageSize(page_size=50, max_page_size=1000, target_latency=1)
+
+    # Half of 50 doesn't divide the offset of 110, 22 is the largest divisor below 25
+    adaptive.shrink(offset=110, failed=True)
+    assert adaptive.page_size == 22
+    adaptive.shrink(offset=132)
+    assert adaptive.page_size == 11
+    adaptive.shrink(offset=7)
+    assert adaptive.page_size == 1
+    assert not adaptive.can_shrink()
+
+
+def test_adaptive_page_size_max():
+    resource = FakeResource(1000)
+
+    pages = list(get_paginator(resource.get_all, page_size=50, adaptive=True, max_page_size=200, project_id="p"))
+
+    assert [page[0] for page in pages] == [0, 50, 100, 200, 400, 600, 800]
+
+
+def test_adaptive_and_prefetch():
+    with pytest.raises(ValueError):
+        get_paginator(FakeResource(10).get_all, adaptive=True, prefetch=2, project_id="p")
+
+
+def test_async_paginator_keeps_params():
+    resource = FakeResource(10)
+    params = {"status": "Finished"}
+
+    async def get_all(project_id: str, **kwargs) -> PaginatedResponse[int]:
+        assert kwargs["params"]["status"] == "Finished"
+        return resource.get_all(project_id, **kwargs)
+
+    async def collect():
+        return [item async for page in get_async_paginator(get_all, page_size=3, project_id="p", params=params)
+                for item in page]
+
+    assert asyncio.run(collect()) == list(range(10))
+    assert params == {"status": "Finished"}
@@ -0,0 +1,128 @@
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from requests import Response
+
+from icometrix_sdk.authentication import AuthenticationMethod
+from icometrix_sdk.exceptions import IcometrixAuthException, IcometrixHttpException
+from icometrix_sdk.models.project_entity import ProjectEntity
+from icometrix_sdk.utils.requests_api_client import RequestsApiClient
+
+SESSION_URI = "/authentication-service/api/v1/sessions"
+
+
+def make_response(status_code: int, body=None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(body if body is not None else {}).encode()
+    response.raw = io.BytesIO()
+    return response
+
+
+class FakeAuth(AuthenticationMethod):
+    def __init__(self, valid=True):
+        self.valid = valid
+        self.connects = 0
+
+    def connect(self, api):
+        self.connects += 1
+        return api.post(SESSION_URI, data={"valid": self.valid})
+
+    def disconnect(self, api):
+        pass
+
+
+class FakeSession:
+    """
+    Answers 401 until a valid session is created
+    """
+
+    def __init__(self):
+        self.authenticated = False
+        self._lock = threading.Lock()
+
+    def request(self, method, url, data=None, **kwargs):
+        if url.endswith(SESSION_URI):
+            time.sleep(0.02)
+            self.authenticated = json.loads(data)["valid"]
+            return make_response(200 if self.authenticated else 401)
+        return make_response(200 if self.authenticated else 401, {"url": url})
+
+
+def create_client(auth: FakeAuth) -> RequestsApiClient:
+    client = RequestsApiClient("https://api.test", coalesce=False)
+    client._session = FakeSession()
+    client.auth = auth
+    return client
+
+
+def test_pool_settings():
+    client = RequestsApiClient("https://api.test", pool_connections=4, pool_maxsize=80, pool_block=True)
+
+    for prefix in ("https://", "http://"):
+        adapter = client._session.get_adapter(f"{prefix}api.test")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 80
+        assert adapter._pool_block
+
+
+def test_error_status_code():
+    client = RequestsApiClient("https://api.test")
+    client._session = type("Session", (), {"request": lambda *args, **kwargs: make_response(503)})()
+
+    with pytest.raises(IcometrixHttpException) as e:
+        client.get("/storage-service/api/v1/projects")
+    assert e.value.status_code == 503
+
+
+def test_refresh_once_for_concurrent_requests():
+    auth = FakeAuth()
+    client = create_client(auth)
+
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda i: client.get(f"/projects/{i}"), range(64)))
+
+    assert auth.connects == 1
+    assert [result["url"] for result in results] == [f"https://api.test/projects/{i}" for i in range(64)]
+
+
+def test_refresh_fails():
+    client = create_client(FakeAuth(valid=False))
+
+    with pytest.raises(IcometrixAuthException):
+        client.get("/projects/1")
+
+
+@pytest.mark.parametrize("client_raw, raw, is_raw", [
+    (False, None, False), (True, None, True), (False, True, True), (True, False, False)])
+def test_raw(client_raw, raw, is_raw):
+    body = {"id": "p1", "name": "Project", "abbrev": "P", "country": "BE",
+            "update_timestamp": "2024-01-02T03:04:05.123456", "creation_timestamp": None}
+    client = RequestsApiClient("https://api.test", raw=client_raw)
+    client._session = type("Session", (), {"request": lambda *args, **kwargs: make_response(200, body)})()
+
+    project = client.get_as("/storage-service/api/v1/projects/p1", ProjectEntity, raw=raw)
+
+    assert isinstance(project, dict) == is_raw
+
+
+def test_fields():
+    requests = []
+
+    def request(*args, params=None, **kwargs):
+        requests.append(params)
+        return make_response(200, {"id": "p1", "name": "Project", "abbrev": "P", "country": "BE"})
+
+    client = RequestsApiClient("https://api.test")
+    client._session = type("Session", (), {"request": staticmethod(request)})()
+
+    project = client.get_as("/storage-service/api/v1/projects/p1", ProjectEntity, fields=["id", "name"],
+                            params={"no-settings": "true"})
+
+    assert requests == [{"no-settings": "true", "fields": "id,name"}]
+    assert project.name == "Project"
+    assert "abbrev" not in project.__dict__
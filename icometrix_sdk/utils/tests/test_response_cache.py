@@ -0,0 +1,166 @@
+import json
+import os
+import time
+
+import pytest
+from requests import Response
+
+from icometrix_sdk.authentication import TokenAuthentication
+from icometrix_sdk.utils.requests_api_client import RequestsApiClient
+from icometrix_sdk.utils.response_cache import CachedResponse, CacheRule, MemoryResponseCache, DiskResponseCache
+
+PROJECT_URI = "/storage-service/api/v1/projects/1234"
+REPORT_URI = "/customer-reports-service/api/v2/customer-reports/5678"
+
+
+def make_response(status_code: int, body=None, headers=None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode() if body is not None else b""
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeServer:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return self.responses.pop(0)
+
+
+def create_client(cache, responses) -> RequestsApiClient:
+    client = RequestsApiClient("https://api.test", cache=cache)
+    client._make_request = FakeServer(responses)
+    return client
+
+
+@pytest.fixture(params=["memory", "disk"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryResponseCache()
+    return DiskResponseCache(str(tmp_path / "cache"))
+
+
+def test_cache_backend(cache):
+    cache.set(CachedResponse("https://api.test/a?x=1", b"{}", time.time() + 10, etag='"v1"'))
+    cache.set(CachedResponse("https://api.test/ab", b"[]", time.time() + 10))
+
+    cached = cache.get("https://api.test/a?x=1")
+    assert cached.content == b"{}"
+    assert cached.etag == '"v1"'
+    assert sorted(cache.keys()) == ["https://api.test/a?x=1", "https://api.test/ab"]
+
+    cache.invalidate("https://api.test/a")
+    assert cache.get("https://api.test/a?x=1") is None
+    assert cache.get("https://api.test/ab") is not None
+    assert list(cache.keys()) == ["https://api.test/ab"]
+
+    cache.clear()
+    assert list(cache.keys()) == []
+
+
+def test_memory_cache_lru():
+    cache = MemoryResponseCache(max_size=2)
+    for key in ("a", "b", "a", "c"):
+        cache.set(CachedResponse(key, b"{}", time.time() + 10))
+    assert sorted(cache.keys()) == ["a", "c"]
+
+    cache.invalidate("b")
+    cache.invalidate("c")
+    assert list(cache.keys()) == ["a"]
+
+
+def test_invalidate_only_reads_the_path(cache, monkeypatch):
+    for i in range(10):
+        cache.set(CachedResponse(f"https://api.test/{i}?x=1#user", b"{}", time.time() + 10))
+        cache.set(CachedResponse(f"https://api.test/{i}", b"{}", time.time() + 10))
+
+    def keys():
+        raise AssertionError("invalidate went through all keys")
+
+    monkeypatch.setattr(cache, "keys", keys)
+    cache.invalidate("https://api.test/3")
+    monkeypatch.undo()
+
+    assert len(list(cache.keys())) == 18
+    assert not any(cache.url_of(key) == "https://api.test/3" for key in cache.keys())
+
+
+def test_cached_get(cache):
+    client = create_client(cache, [make_response(200, {"id": "1234"})])
+
+    assert client.get(PROJECT_URI) == {"id": "1234"}
+    assert client.get(PROJECT_URI) == {"id": "1234"}
+    assert len(client._make_request.requests) == 1
+
+
+def test_uncached_uri(cache):
+    client = create_client(cache, [make_response(200, {"results": []})] * 2)
+
+    client.get("/storage-service/api/v2/projects")
+    client.get("/storage-service/api/v2/projects")
+    assert len(client._make_request.requests) == 2
+
+
+def test_revalidate(cache):
+    cache.rules = [CacheRule(r"/projects/[^/]+$", ttl=0)]
+    client = create_client(cache, [make_response(200, {"id": "1234"}, {"ETag": '"v1"'}),
+                                   make_response(304),
+                                   make_response(200, {"id": "1234", "name": "new"}, {"ETag": '"v2"'})])
+
+    assert client.get(PROJECT_URI) == {"id": "1234"}
+    assert client.get(PROJECT_URI) == {"id": "1234"}
+    assert client.get(PROJECT_URI) == {"id": "1234", "name": "new"}
+
+    conditional_headers = [kwargs["headers"] for _, _, kwargs in client._make_request.requests]
+    assert conditional_headers == [{}, {"If-None-Match": '"v1"'}, {"If-None-Match": '"v1"'}]
+
+
+def test_cacheable(cache):
+    client = create_client(cache, [make_response(200, {"status": "Processing"}),
+                                   make_response(200, {"status": "Finished"})])
+
+    assert client.get(REPORT_URI)["status"] == "Processing"
+    assert client.get(REPORT_URI)["status"] == "Finished"
+    assert client.get(REPORT_URI)["status"] == "Finished"
+    assert len(client._make_request.requests) == 2
+
+
+def test_invalidate_on_write(cache):
+    client = create_client(cache, [make_response(200, {"id": "1234"}),
+                                   make_response(200, {"id": "1234"}),
+                                   make_response(200, {"id": "1234", "name": "new"})])
+
+    client.get(PROJECT_URI)
+    client.put(PROJECT_URI, {"name": "new"})
+    assert client.get(PROJECT_URI) == {"id": "1234", "name": "new"}
+
+
+def test_cache_per_identity(cache):
+    first = create_client(cache, [make_response(200, {"id": "1234", "user": "first"})])
+    first.auth = TokenAuthentication("first-token")
+    second = create_client(cache, [make_response(200, {"id": "1234", "user": "second"})])
+    second.auth = TokenAuthentication("second-token")
+
+    assert first.get(PROJECT_URI)["user"] == "first"
+    assert second.get(PROJECT_URI)["user"] == "second"
+    assert first.get(PROJECT_URI)["user"] == "first"
+    # The token is not stored in the cache
+    assert not any("first-token" in key for key in cache.keys())
+
+
+def test_disk_cache_clear_keeps_other_files(tmp_path):
+    cache = DiskResponseCache(str(tmp_path))
+    (tmp_path / "notes.txt").write_text("Not a cached response")
+    (tmp_path / "reports").mkdir()
+    cache.set(CachedResponse(key=PROJECT_URI, content=b"{}", expires_at=time.time() + 60))
+    url_dir = os.path.dirname(cache._path(PROJECT_URI))
+    with open(os.path.join(url_dir, f"{'0' * 64}.1234abcd.part"), "wb"):
+        pass
+
+    cache.clear()
+
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt", "reports"]
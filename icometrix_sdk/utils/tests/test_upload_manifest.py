@@ -0,0 +1,239 @@
+import os
+import uuid
+
+import pytest
+
+from icometrix_sdk.exceptions import IcometrixConfigException, IcometrixHttpException
+from icometrix_sdk.models.upload_entity import StartUploadDto
+from icometrix_sdk.resources.uploads import Uploads
+from icometrix_sdk.utils.tests.utils import FakeApiClient
+from icometrix_sdk.utils.upload_manifest import UploadManifest, secure_filename, file_sha256
+
+UPLOAD_URI = "/uploads-service/api/v1/projects/p/dicom-uploads/u"
+
+
+def uploaded_as(file_path: str) -> str:
+    """
+    The name under which the upload service stores a file
+    """
+    return f"{uuid.uuid4()}_{secure_filename(file_path)}"
+
+
+@pytest.fixture(scope="function")
+def dicom_dir(tmp_path) -> str:
+    for sub_dir in ("a", "b"):
+        os.makedirs(tmp_path / "dicom" / sub_dir)
+        for name in ("IM-0001.dcm", "IM-0002.dcm"):
+            (tmp_path / "dicom" / sub_dir / name).write_bytes(f"{sub_dir}/{name}".encode())
+    return str(tmp_path / "dicom")
+
+
+def test_secure_filename():
+    assert secure_filename("Bold Digit 𝟏") == "Bold_Digit_1"
+    assert secure_filename("Ångström unit physics.pdf") == "Angstrom_unit_physics.pdf"
+    assert secure_filename("IM-0001.dcm") == "IM-0001.dcm"
+
+
+def test_resume_from_disk(dicom_dir: str, tmp_path):
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    file_path = os.path.join(dicom_dir, "a", "IM-0001.dcm")
+
+    manifest = UploadManifest.open(manifest_path, UPLOAD_URI)
+    assert manifest.needs_upload(file_path)
+    manifest.record(file_path, "uploaded", "hash")
+
+    manifest = UploadManifest.open(manifest_path)
+    assert manifest.upload_uri == UPLOAD_URI
+    assert not manifest.needs_upload(file_path)
+    assert manifest.needs_upload(os.path.join(dicom_dir, "a", "IM-0002.dcm"))
+
+
+def test_changed_file(dicom_dir: str, tmp_path):
+    file_path = os.path.join(dicom_dir, "a", "IM-0001.dcm")
+    manifest = UploadManifest.open(str(tmp_path / "manifest.jsonl"), UPLOAD_URI)
+    manifest.record(file_path, "uploaded")
+
+    with open(file_path, "ab") as fp:
+        fp.write(b"changed")
+    assert manifest.needs_upload(file_path)
+
+
+def test_touched_file(dicom_dir: str, tmp_path):
+    file_path = os.path.join(dicom_dir, "a", "IM-0001.dcm")
+    manifest = UploadManifest.open(str(tmp_path / "manifest.jsonl"), UPLOAD_URI)
+    manifest.record(file_path, "uploaded", file_sha256(file_path))
+
+    # Same size and content, only the modification time changed
+    os.utime(file_path, (0, 0))
+    assert not manifest.needs_upload(file_path)
+
+    with open(file_path, "r+b") as fp:
+        fp.write(b"b")
+    assert manifest.needs_upload(file_path)
+
+
+def test_other_upload(tmp_path):
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    UploadManifest.open(manifest_path, UPLOAD_URI)
+    with pytest.raises(IcometrixConfigException):
+        UploadManifest.open(manifest_path, "/other-upload")
+
+
+def test_partially_written_line(dicom_dir: str, tmp_path):
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    manifest = UploadManifest.open(manifest_path, UPLOAD_URI)
+    manifest.record(os.path.join(dicom_dir, "a", "IM-0001.dcm"), "uploaded")
+    with open(manifest_path, "a") as fp:
+        fp.write('{"path": "/a/IM-00')
+
+    assert len(UploadManifest.load(manifest_path).entries) == 1
+
+
+def test_reconcile(dicom_dir: str, tmp_path):
+    manifest = UploadManifest.open(str(tmp_path / "manifest.jsonl"), UPLOAD_URI)
+    a1, a2 = os.path.join(dicom_dir, "a", "IM-0001.dcm"), os.path.join(dicom_dir, "a", "IM-0002.dcm")
+    b1, b2 = os.path.join(dicom_dir, "b", "IM-0001.dcm"), os.path.join(dicom_dir, "b", "IM-0002.dcm")
+    manifest.record(a1, "uploaded")
+    manifest.record(a2, "uploaded")
+    manifest.record(b1, "pending")
+    manifest.record(b2, "failed")
+
+    # a/IM-0002.dcm got lost, b/IM-0001.dcm was sent but its upload was not confirmed
+    manifest.reconcile([uploaded_as(a1), uploaded_as(b1)])
+
+    assert not manifest.needs_upload(a1)
+    assert manifest.needs_upload(a2)
+    assert manifest.needs_upload(b1)
+    assert manifest.needs_upload(b2)
+
+    reloaded = UploadManifest.load(manifest.manifest_path)
+    assert {path: entry.status for path, entry in reloaded.entries.items()} == \
+           {path: entry.status for path, entry in manifest.entries.items()}
+
+
+def test_reconcile_same_name(dicom_dir: str, tmp_path):
+    manifest = UploadManifest.open(str(tmp_path / "manifest.jsonl"), UPLOAD_URI)
+    a1, a2 = os.path.join(dicom_dir, "a", "IM-0001.dcm"), os.path.join(dicom_dir, "a", "IM-0002.dcm")
+    manifest.record(a1, "uploaded", name="IM-0001.dcm")
+    manifest.record(a2, "uploaded", name="IM-0001.dcm")
+    manifest.record(os.path.join(dicom_dir, "b", "IM-0001.dcm"), "uploaded")
+
+    # Only one of the files sent as IM-0001.dcm reached the server
+    manifest.reconcile([uploaded_as("IM-0001.dcm"), uploaded_as(os.path.join(dicom_dir, "b", "IM-0001.dcm"))])
+
+    assert sorted(manifest.needs_upload(path) for path in (a1, a2)) == [False, True]
+
+
+def test_reconcile_unknown_names(dicom_dir: str, tmp_path):
+    manifest = UploadManifest.open(str(tmp_path / "manifest.jsonl"), UPLOAD_URI)
+    a1 = os.path.join(dicom_dir, "a", "IM-0001.dcm")
+    manifest.record(a1, "uploaded")
+
+    # The server names the files differently, the manifest is kept as is
+    manifest.reconcile([str(uuid.uuid4())])
+
+    assert not manifest.needs_upload(a1)
+
+
+def test_completed(dicom_dir: str, tmp_path):
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    UploadManifest.open(manifest_path, UPLOAD_URI).complete()
+
+    assert UploadManifest.load(manifest_path).completed
+    with pytest.raises(IcometrixConfigException):
+        list(Uploads(FakeUploadApi()).iter_upload_files_in_dir(UPLOAD_URI, dicom_dir, manifest_path=manifest_path))
+
+
+def create_upload(upload_uri: str) -> dict:
+    return {"id": "u", "uri": upload_uri, "folder_uri": f"{upload_uri}/folder", "type": "dicom", "logs": [],
+            "errors": [], "icobrain_report_type": "icobrain_ms", "project_id": "p", "update_timestamp": None,
+            "creation_timestamp": None}
+
+
+class FakeUploadApi(FakeApiClient):
+    """
+    Stores the names of the uploaded files like the upload service, files named in `fail` are rejected once
+    """
+
+    def __init__(self, fail: set = ()):
+        super().__init__()
+        self.fail = set(fail)
+        self.uploaded = []
+        self.sent = []
+        self.uploads = 0
+
+    def get(self, uri: str, **kwargs) -> dict:
+        if uri.endswith("/files"):
+            return {"files": list(self.uploaded)}
+        return create_upload(uri)
+
+    def post(self, uri: str, data: dict, **kwargs) -> dict:
+        if uri.endswith("/multi-upload"):
+            # A new upload
+            self.uploads += 1
+            self.uploaded = []
+            return create_upload(f"{UPLOAD_URI}-{self.uploads}")
+        return create_upload(uri)
+
+    def put_file(self, uri: str, fields, **kwargs):
+        file_name = fields["file"][0]
+        self.sent.append(file_name)
+        if os.path.basename(file_name) in self.fail:
+            self.fail.remove(os.path.basename(file_name))
+            raise IcometrixHttpException("Service unavailable", status_code=503)
+        self.uploaded.append(uploaded_as(file_name))
+
+
+def test_iter_upload_files_in_dir_resumes(dicom_dir: str, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dicom_dir = "dicom"
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    api = FakeUploadApi(fail={"IM-0002.dcm"})
+    uploads = Uploads(api)
+
+    results = list(uploads.iter_upload_files_in_dir(UPLOAD_URI, dicom_dir, complete_on_error=True,
+                                                    manifest_path=manifest_path, workers=1))
+    assert sorted(result.status for result in results) == ["failed", "uploaded", "uploaded", "uploaded"]
+    # Failed files are not counted, skipped files are
+    api.fail = {"IM-0002.dcm"}
+    assert uploads.upload_all_files_in_dir(UPLOAD_URI, dicom_dir, complete_on_error=True,
+                                           manifest_path=manifest_path) == 3
+
+    # The failed file is the only one sent again
+    api.sent.clear()
+    results = list(uploads.iter_upload_files_in_dir(UPLOAD_URI, dicom_dir, manifest_path=manifest_path))
+    assert sorted(result.status for result in results) == ["skipped", "skipped", "skipped", "uploaded"]
+    # The files are sent with the same (relative) name as without a manifest
+    assert len(api.sent) == 1 and api.sent[0] in (os.path.join("dicom", "a", "IM-0002.dcm"),
+                                                  os.path.join("dicom", "b", "IM-0002.dcm"))
+
+    # A file that was sent, but of which the upload was not confirmed, is sent again
+    manifest = UploadManifest.load(manifest_path)
+    manifest.record(api.sent[0], "pending")
+    api.sent.clear()
+    results = list(uploads.iter_upload_files_in_dir(UPLOAD_URI, dicom_dir, manifest_path=manifest_path))
+    assert sorted(result.status for result in results) == ["skipped", "skipped", "skipped", "uploaded"]
+    assert len(api.sent) == 1
+
+
+def test_upload_dicom_dir_resumes(dicom_dir: str, tmp_path):
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    api = FakeUploadApi(fail={"IM-0002.dcm"})
+    uploads = Uploads(api)
+    options = StartUploadDto(icobrain_report_type="icobrain_ms")
+
+    with pytest.raises(IcometrixHttpException):
+        uploads.upload_dicom_dir("p", dicom_dir, options, manifest_path=manifest_path, workers=1)
+    first_upload_uri = UploadManifest.load(manifest_path).upload_uri
+
+    # The unfinished upload is resumed and completed
+    upload = uploads.upload_dicom_dir("p", dicom_dir, options, manifest_path=manifest_path)
+    assert upload.uri == first_upload_uri
+    assert len(api.uploaded) == 4
+    assert UploadManifest.load(manifest_path).completed
+
+    # A completed upload is not resumed, all files are sent to a new upload
+    upload = uploads.upload_dicom_dir("p", dicom_dir, options, manifest_path=manifest_path)
+    assert upload.uri != first_upload_uri
+    assert len(api.uploaded) == 4
+    assert UploadManifest.load(manifest_path).upload_uri == upload.uri
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from icometrix_sdk.exceptions import WaitTimeoutException, WaitCancelledException, IcometrixHttpException
+from icometrix_sdk.utils.wait import Backoff, wait_for, async_wait_for, wait_for_many
+
+
+class FakeStatus:
+    """
+    Every key is finished after a number of checks
+    """
+
+    def __init__(self, checks_needed: dict, errors: dict = None):
+        self.checks_needed = checks_needed
+        self.errors = errors or {}
+        self.checks = {key: 0 for key in checks_needed}
+        self._lock = threading.Lock()
+
+    def check(self, key: str) -> str:
+        with self._lock:
+            self.checks[key] += 1
+            if self.errors.get(key):
+                self.errors[key] -= 1
+                raise IcometrixHttpException("Service unavailable", status_code=503)
+            return "Finished" if self.checks[key] >= self.checks_needed[key] else "Processing"
+
+
+def finished(status: str) -> bool:
+    return status == "Finished"
+
+
+def test_backoff():
+    backoff = Backoff(initial=1, maximum=10, jitter=0.5)
+    assert 0.5 <= backoff.delay(0) <= 1
+    assert 4 <= backoff.delay(3) <= 8
+    assert 5 <= backoff.delay(10) <= 10
+
+
+def test_wait_for_many():
+    status = FakeStatus({"a": 1, "b": 3, "c": 2})
+    done = []
+
+    results = wait_for_many(status.check, ["a", "b", "c"], finished, backoff=Backoff(0.01, 0.05),
+                            on_done=lambda key, value: done.append(key))
+
+    assert results == {"a": "Finished", "c": "Finished", "b": "Finished"}
+    assert list(results) == done == ["a", "c", "b"]
+    assert status.checks == {"a": 1, "b": 3, "c": 2}
+
+
+def test_wait_for_many_slow_on_done():
+    status = FakeStatus({"a": 1, "b": 3})
+    b_finished = threading.Event()
+
+    def on_done(key: str, value: str):
+        # A slow callback, e.g. a download, doesn't delay the checks of the other keys
+        if key == "a":
+            assert b_finished.wait(2)
+        else:
+            b_finished.set()
+
+    results = wait_for_many(status.check, ["a", "b"], finished, backoff=Backoff(0.01, 0.02), on_done=on_done,
+                            on_done_workers=2)
+
+    assert list(results) == ["a", "b"]
+
+
+def test_wait_for_many_on_done_error():
+    status = FakeStatus({"a": 1, "b": 1000})
+
+    def on_done(key: str, value: str):
+        raise IOError("Disk full")
+
+    with pytest.raises(IOError):
+        wait_for_many(status.check, ["a", "b"], finished, timeout=5, backoff=Backoff(0.01, 0.02), on_done=on_done)
+    assert status.checks["b"] < 1000
+
+
+def test_wait_for_many_timeout():
+    status = FakeStatus({"a": 1, "b": 1000})
+
+    with pytest.raises(WaitTimeoutException):
+        wait_for_many(status.check, ["a", "b"], finished, timeout=0.1, backoff=Backoff(0.01, 0.02))
+
+
+def test_wait_for_many_retries_errors():
+    status = FakeStatus({"a": 1}, errors={"a": 2})
+
+    assert wait_for_many(status.check, ["a"], finished, backoff=Backoff(0.01, 0.02)) == {"a": "Finished"}
+    assert status.checks["a"] == 3
+
+
+def test_wait_for_many_raises_errors():
+    def check(key: str):
+        raise IcometrixHttpException("Not found", status_code=404)
+
+    with pytest.raises(IcometrixHttpException):
+        wait_for_many(check, ["a"], finished, backoff=Backoff(0.01, 0.02))
+
+
+def test_wait_for_many_budget():
+    status = FakeStatus({key: 1 for key in "abcdef"})
+
+    start = time.monotonic()
+    wait_for_many(status.check, list("abcdef"), finished, backoff=Backoff(0.05, 0.05), max_requests_per_cycle=2)
+
+    # Three cycles of two checks
+    assert 0.1 <= time.monotonic() - start < 0.5
+
+
+def test_wait_for():
+    status = FakeStatus({"a": 3})
+
+    assert wait_for(status.check, finished, backoff=Backoff(0.01, 0.02), key="a") == "Finished"
+    assert status.checks["a"] == 3
+
+
+def test_wait_for_timeout():
+    status = FakeStatus({"a": 1000})
+
+    start = time.monotonic()
+    with pytest.raises(WaitTimeoutException):
+        wait_for(status.check, finished, timeout=0.1, backoff=Backoff(0.02, 0.05), key="a")
+    assert time.monotonic() - start < 0.2
+
+
+def test_wait_for_cancel():
+    status = FakeStatus({"a": 1000})
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+
+    with pytest.raises(WaitCancelledException):
+        wait_for(status.check, finished, backoff=Backoff(10, 10), cancel=cancel, key="a")
+
+
+def test_async_wait_for():
+    status = FakeStatus({"a": 3})
+
+    async def check(key: str) -> str:
+        return status.check(key)
+
+    assert asyncio.run(async_wait_for(check, finished, backoff=Backoff(0.01, 0.02), key="a")) == "Finished"
+
+
+def test_async_wait_for_cancel():
+    status = FakeStatus({"a": 1000})
+
+    async def check(key: str) -> str:
+        return status.check(key)
+
+    async def wait():
+        cancel = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, cancel.set)
+        await async_wait_for(check, finished, backoff=Backoff(10, 10), cancel=cancel, key="a")
+
+    with pytest.raises(WaitCancelledException):
+        asyncio.run(wait())
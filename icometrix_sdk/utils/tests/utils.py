@@ -0,0 +1,103 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from icometrix_sdk.exceptions import IcometrixHttpException
+from icometrix_sdk.utils.api_client import ApiClient, AsyncApiClient
+
+# A response, or a function of the request kwargs that returns the response
+Route = Union[Any, Callable[..., Any]]
+
+
+class FakeServer:
+    """
+    Answers the requests of the fake clients from routes and records them
+
+    A route is keyed on the uri for GET requests, and on "<METHOD> <uri>" for the other methods (POST, PUT,
+    DELETE, PUT_FILE and STREAM_FILE). GET requests without a route get a 404, other requests without a route
+    raise NotImplementedError.
+
+    :param routes: The responses by route key
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Route]] = None):
+        self.routes = dict(routes or {})
+        self.requests: List[Tuple[str, str, dict]] = []
+
+    def respond(self, method: str, uri: str, **kwargs) -> Any:
+        self.requests.append((method, uri, kwargs))
+        key = uri if method == "GET" else f"{method} {uri}"
+        if key not in self.routes:
+            if method == "GET":
+                raise IcometrixHttpException("Not found", status_code=404, url=uri)
+            raise NotImplementedError(f"No route for {method} {uri}")
+        route = self.routes[key]
+        return route(**kwargs) if callable(route) else route
+
+
+class FakeApiClient(ApiClient):
+    """
+    An ApiClient for tests, see :class:`FakeServer`. Override a method for behaviour that depends on state.
+
+    :param routes: The responses by route key
+    :param raw: Return the entities of get_as as dicts
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Route]] = None, raw: bool = False):
+        self.server = FakeServer(routes)
+        self.raw = raw
+
+    @property
+    def requests(self) -> List[Tuple[str, str, dict]]:
+        return self.server.requests
+
+    def get(self, uri: str, **kwargs) -> dict:
+        return self.server.respond("GET", uri, **kwargs)
+
+    def post(self, uri: str, data: dict, **kwargs) -> dict:
+        return self.server.respond("POST", uri, data=data, **kwargs)
+
+    def put(self, uri: str, data: dict, **kwargs) -> dict:
+        return self.server.respond("PUT", uri, data=data, **kwargs)
+
+    def delete(self, uri: str, **kwargs):
+        return self.server.respond("DELETE", uri, **kwargs)
+
+    def put_file(self, uri: str, fields, **kwargs):
+        return self.server.respond("PUT_FILE", uri, fields=fields, **kwargs)
+
+    def stream_file(self, uri: str, out_path: str, **kwargs):
+        return self.server.respond("STREAM_FILE", uri, out_path=out_path, **kwargs)
+
+
+class FakeAsyncApiClient(AsyncApiClient):
+    """
+    The asyncio counterpart of :class:`FakeApiClient`
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Route]] = None, raw: bool = False):
+        self.server = FakeServer(routes)
+        self.raw = raw
+
+    @property
+    def requests(self) -> List[Tuple[str, str, dict]]:
+        return self.server.requests
+
+    async def get(self, uri: str, **kwargs) -> dict:
+        return self.server.respond("GET", uri, **kwargs)
+
+    async def post(self, uri: str, data: dict, **kwargs) -> dict:
+        return self.server.respond("POST", uri, data=data, **kwargs)
+
+    async def put(self, uri: str, data: dict, **kwargs) -> dict:
+        return self.server.respond("PUT", uri, data=data, **kwargs)
+
+    async def delete(self, uri: str, **kwargs):
+        return self.server.respond("DELETE", uri, **kwargs)
+
+    async def put_file(self, uri: str, fields, **kwargs):
+        return self.server.respond("PUT_FILE", uri, fields=fields, **kwargs)
+
+    async def stream_file(self, uri: str, out_path: str, **kwargs):
+        return self.server.respond("STREAM_FILE", uri, out_path=out_path, **kwargs)
+
+    async def close(self):
+        pass
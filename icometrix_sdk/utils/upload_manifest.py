@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Literal, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from icometrix_sdk.exceptions import IcometrixConfigException
+from icometrix_sdk.logger import logger_name
+
+logger = logging.getLogger(logger_name)
+
+ManifestStatus = Literal["pending", "uploaded", "failed"]
+
+_COMPLETED_LINE = json.dumps({"completed": True}) + "\n"
+
+_FILENAME_STRIP_RE = re.compile(r"[^A-Za-z0-9_.-]")
+_UUID_PREFIX_RE = re.compile(r"([0-9a-fA-F]{8}(-?[0-9a-fA-F]{4}){3}-?[0-9a-fA-F]{12}[_.-]?)?")
+
+
+class UploadManifestEntry(BaseModel):
+    path: str
+    name: Optional[str] = None
+    size: int
+    mtime: float
+    sha256: Optional[str] = None
+    status: ManifestStatus = "pending"
+
+
+def secure_filename(filename: str) -> str:
+    """
+    Sanitize a file name the same way the upload service does,
+    see :meth:`~icometrix_sdk.resources.uploads.Uploads.get_uploaded_files`
+    """
+    filename = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    for sep in os.path.sep, os.path.altsep:
+        if sep:
+            filename = filename.replace(sep, " ")
+    return str(_FILENAME_STRIP_RE.sub("", "_".join(filename.split()))).strip("._")
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as fp:
+        while chunk := fp.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _is_uploaded_as(uploaded_file_name: str, name: str) -> bool:
+    # The upload service prepends a UUID to the sanitized name, nothing else may precede the name
+    if not uploaded_file_name.endswith(name):
+        return False
+    return _UUID_PREFIX_RE.fullmatch(uploaded_file_name[:-len(name)]) is not None
+
+
+class UploadManifest:
+    """
+    A local record of the files sent to an upload entry, used to resume an interrupted upload
+
+    The manifest is a JSON lines file: the first line holds the upload uri, every following line is an
+    :class:`UploadManifestEntry`. Entries are only appended, the last entry of a path wins. This keeps writing
+    cheap for uploads with many files, and a crash can at most lose the line that was being written. Once the
+    upload is completed a ``{"completed": true}`` line is appended, a completed upload can not be resumed.
+
+    Entries are keyed on the absolute path of the file, `name` is the file name it was sent with.
+
+    :param manifest_path: The path of the manifest file
+    :param upload_uri: The uri of the upload entry the files are sent to
+    """
+
+    def __init__(self, manifest_path: str, upload_uri: str):
+        self.manifest_path = manifest_path
+        self.upload_uri = upload_uri
+        self.entries: Dict[str, UploadManifestEntry] = {}
+        self.completed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, manifest_path: str) -> "UploadManifest":
+        """
+        Read an existing manifest
+        """
+        with open(manifest_path) as fp:
+            header = json.loads(fp.readline())
+            manifest = cls(manifest_path, header["upload_uri"])
+            for line in fp:
+                if line == _COMPLETED_LINE:
+                    manifest.completed = True
+                    continue
+                try:
+                    entry = UploadManifestEntry.model_validate_json(line)
+                except ValidationError:
+                    # A partially written line, of which the file will be uploaded again
+                    logger.warning(f"Skipping invalid line in upload manifest {manifest_path}")
+                    continue
+                manifest.entries[entry.path] = entry
+        return manifest
+
+    @classmethod
+    def open(cls, manifest_path: str, upload_uri: Optional[str] = None) -> "UploadManifest":
+        """
+        Load the manifest when it exists, or create a new one
+
+        :param manifest_path: The path of the manifest file
+        :param upload_uri: The uri of the upload entry, when given it should match the uri in an existing manifest
+        """
+        if os.path.exists(manifest_path):
+            manifest = cls.load(manifest_path)
+            if upload_uri and manifest.upload_uri != upload_uri:
+                raise IcometrixConfigException(
+                    f"Upload manifest {manifest_path} belongs to {manifest.upload_uri}, not to {upload_uri}")
+            return manifest
+
+        if not upload_uri:
+            raise IcometrixConfigException(f"Upload manifest {manifest_path} does not exist")
+        manifest = cls(manifest_path, upload_uri)
+        with open(manifest_path, "w") as fp:
+            fp.write(json.dumps({"upload_uri": upload_uri}) + "\n")
+        return manifest
+
+    def needs_upload(self, file_path: str) -> bool:
+        """
+        Returns True if the file was not uploaded yet, or changed since it was uploaded
+
+        Only when the modification time changed but the size did not, the file is read to compare its checksum.
+        """
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None or entry.status != "uploaded":
+            return True
+        stat = os.stat(file_path)
+        if entry.size != stat.st_size:
+            return True
+        if entry.mtime == stat.st_mtime:
+            return False
+        return entry.sha256 is None or entry.sha256 != file_sha256(file_path)
+
+    def record(self, file_path: str, status: ManifestStatus, sha256: Optional[str] = None,
+               name: Optional[str] = None) -> UploadManifestEntry:
+        """
+        Store the upload status of a file
+
+        :param file_path: The path of the file
+        :param status: The upload status
+        :param sha256: The checksum of the file
+        :param name: The file name the file is sent with, defaults to `file_path`
+        """
+        stat = os.stat(file_path)
+        entry = UploadManifestEntry(path=os.path.abspath(file_path), name=name or file_path, size=stat.st_size,
+                                    mtime=stat.st_mtime, sha256=sha256, status=status)
+        self._append([entry])
+        return entry
+
+    def reconcile(self, uploaded_file_names: Iterable[str]):
+        """
+        Compare the manifest with the files the upload service received
+        (:meth:`~icometrix_sdk.resources.uploads.Uploads.get_uploaded_files`).
+
+        Files that are marked as uploaded, but are missing on the server are reset to pending. Files that are not
+        confirmed as uploaded (pending or failed) are always sent again.
+
+        The server lists a sanitized version of the name a file was sent with, prefixed by a UUID. Sent names that
+        sanitize to the same name are matched by count. When none of the listed files match a sent name, the
+        server names its files differently and the manifest is kept as is.
+        """
+        uploaded_file_names = list(uploaded_file_names)
+        entries_by_name = defaultdict(list)
+        for entry in self.entries.values():
+            if entry.status == "uploaded":
+                entries_by_name[secure_filename(entry.name or entry.path)].append(entry)
+
+        available = Counter()
+        for name in entries_by_name:
+            available[name] = sum(1 for file_name in uploaded_file_names if _is_uploaded_as(file_name, name))
+
+        if uploaded_file_names and entries_by_name and not any(available.values()):
+            logger.warning(f"Upload manifest {self.manifest_path}: none of the uploaded files match a file in the "
+                           f"manifest, not reconciling")
+            return
+
+        changed = []
+        for name, entries in entries_by_name.items():
+            for entry in entries[available[name]:]:
+                changed.append(entry.model_copy(update={"status": "pending"}))
+
+        if changed:
+            logger.info(f"Upload manifest {self.manifest_path}: {len(changed)} files are missing on the server")
+            self._append(changed)
+
+    def complete(self):
+        """
+        Mark the upload as completed
+        """
+        with self._lock:
+            with open(self.manifest_path, "a") as fp:
+                fp.write(_COMPLETED_LINE)
+            self.completed = True
+
+    def _append(self, entries: Iterable[UploadManifestEntry]):
+        with self._lock:
+            with open(self.manifest_path, "a") as fp:
+                for entry in entries:
+                    self.entries[entry.path] = entry
+                    fp.write(entry.model_dump_json() + "\n")
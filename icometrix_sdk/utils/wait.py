@@ -1,19 +1,242 @@
-from time import sleep
-from typing import Callable, TypeVar
+import asyncio
+import heapq
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from itertools import count
+from time import sleep, monotonic
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, TypeVar
 
-from icometrix_sdk.exceptions import WaitTimeoutException
+from icometrix_sdk.exceptions import WaitTimeoutException, WaitCancelledException, IcometrixHttpException
+from icometrix_sdk.logger import logger_name
 
 T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
 
+# Status codes of a status check that are retried instead of raised
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+logger = logging.getLogger(logger_name)
+
+
+class Backoff:
+    """
+    Exponential backoff with jitter
+
+    The n-th delay is ``initial * factor ** n``, capped at ``maximum``, and reduced by a random fraction (up to
+    ``jitter``) so checks that were started together spread out over time.
+
+    :param initial: The first delay (in seconds)
+    :param maximum: The maximum delay (in seconds)
+    :param factor: The growth factor of the delay
+    :param jitter: The maximum fraction of the delay that is randomly removed, between 0 and 1
+    """
+
+    def __init__(self, initial: float = 2, maximum: float = 60, factor: float = 2, jitter: float = 0.5):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.maximum, self.initial * self.factor ** attempt)
+        return delay - random.uniform(0, self.jitter * delay)
+
+
+def _sleep(delay: float, cancel: Optional[threading.Event]):
+    if cancel is None:
+        sleep(delay)
+    elif cancel.wait(delay):
+        raise WaitCancelledException("The wait was cancelled")
+
+
+def _next_delay(backoff: Backoff, attempt: int, deadline: Optional[float], timeout: Optional[float]) -> float:
+    """
+    The delay before the next check, shortened to the deadline so the last check happens at the deadline
+    """
+    delay = backoff.delay(attempt)
+    if deadline is None:
+        return delay
+    remaining = deadline - monotonic()
+    if remaining <= 0:
+        raise WaitTimeoutException(f"The function took to long to complete (timeout {timeout}s)")
+    return min(delay, remaining)
+
+
+def wait_for(func: Callable[..., T], condition: Callable[[T], bool], timeout: Optional[float] = None,
+             backoff: Optional[Backoff] = None, cancel: Optional[threading.Event] = None, **kwargs) -> T:
+    """
+    Call a function until its result meets a condition
+
+    :param func: The function to call, e.g. a status check. It can raise to stop waiting (e.g. on a failed status)
+    :param condition: Returns True when the result of the function is final
+    :param timeout: The maximum time to wait (in seconds), raises a WaitTimeoutException when exceeded
+    :param backoff: The delays between two calls
+    :param cancel: An event to stop waiting from another thread, raises a WaitCancelledException when set
+    :param kwargs: The arguments of the function
+    :return: The first result that meets the condition
+    """
+    backoff = backoff or Backoff()
+    deadline = monotonic() + timeout if timeout is not None else None
+    attempt = 0
+    if cancel is not None and cancel.is_set():
+        raise WaitCancelledException("The wait was cancelled")
 
-def wait_for(func: Callable[..., T], condition: Callable[[T], bool], timeout: int, **kwargs) -> T:
-    pol = 5
-    duration = 0
     val = func(**kwargs)
     while not condition(val):
-        if timeout >= duration:
-            WaitTimeoutException("The function took to long to complete")
-        duration += pol
-        sleep(pol)
+        _sleep(_next_delay(backoff, attempt, deadline, timeout), cancel)
+        attempt += 1
         val = func(**kwargs)
     return val
+
+
+async def _async_sleep(delay: float, cancel: Optional[asyncio.Event]):
+    if cancel is None:
+        await asyncio.sleep(delay)
+        return
+    try:
+        await asyncio.wait_for(cancel.wait(), delay)
+    except asyncio.TimeoutError:
+        return
+    raise WaitCancelledException("The wait was cancelled")
+
+
+async def async_wait_for(func: Callable[..., Awaitable[T]], condition: Callable[[T], bool],
+                         timeout: Optional[float] = None, backoff: Optional[Backoff] = None,
+                         cancel: Optional[asyncio.Event] = None, **kwargs) -> T:
+    """
+    Async variant of :func:`wait_for`, set the cancel event (or cancel the task) to stop waiting
+    """
+    backoff = backoff or Backoff()
+    deadline = monotonic() + timeout if timeout is not None else None
+    attempt = 0
+    if cancel is not None and cancel.is_set():
+        raise WaitCancelledException("The wait was cancelled")
+
+    val = await func(**kwargs)
+    while not condition(val):
+        await _async_sleep(_next_delay(backoff, attempt, deadline, timeout), cancel)
+        attempt += 1
+        val = await func(**kwargs)
+    return val
+
+
+class CallbackPool:
+    """
+    Runs the callbacks of a waiter in their own threads, so a slow callback (e.g. a download) doesn't delay the
+    status checks. The error of a failed callback is raised by the next :meth:`check`, or by :meth:`join`.
+    When the waiter stops on an error, the queued callbacks are dropped and the running ones are waited for.
+
+    :param workers: The amount of callbacks that run at once
+    """
+
+    def __init__(self, workers: int = 1):
+        self._executor = ThreadPoolExecutor(workers)
+        self._running: List[Future] = []
+
+    def submit(self, func: Callable[..., None], *args):
+        self._running.append(self._executor.submit(func, *args))
+
+    def check(self):
+        """
+        Raise the error of a failed callback
+        """
+        running = []
+        for future in self._running:
+            if not future.done():
+                running.append(future)
+            elif future.exception() is not None:
+                raise future.exception()
+        self._running = running
+
+    def join(self):
+        """
+        Wait until all callbacks finished, raise the error of a failed callback
+        """
+        for future in self._running:
+            future.result()
+        self._running = []
+
+    def __enter__(self) -> "CallbackPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+
+def wait_for_many(func: Callable[[K], T], keys: Iterable[K], condition: Callable[[T], bool],
+                  timeout: Optional[float] = None, backoff: Optional[Backoff] = None, workers: int = 8,
+                  max_requests_per_cycle: Optional[int] = None,
+                  on_done: Optional[Callable[[K, T], None]] = None,
+                  cancel: Optional[threading.Event] = None, on_done_workers: int = 1) -> Dict[K, T]:
+    """
+    Wait until a condition holds for many keys, e.g. until a set of reports is finished
+
+    Every key is checked on its own schedule: after a check that doesn't meet the condition, the next check of that
+    key is delayed with an exponential backoff. The checks that are due are run concurrently, with at most
+    ``max_requests_per_cycle`` checks per cycle. When more checks are due than the budget allows, the next cycle
+    starts after the initial backoff delay. Checks failing with a 429 or 5xx status code are retried later.
+
+    :param func: The status check, called with a key
+    :param keys: The keys to wait for
+    :param condition: Returns True when the value of a check is final
+    :param timeout: The maximum time to wait (in seconds), None to wait forever
+    :param backoff: The delays between the checks of a key
+    :param workers: The amount of concurrent checks
+    :param max_requests_per_cycle: The maximum amount of checks per cycle, None for no limit
+    :param on_done: Called with the key and value as soon as the condition holds for a key. It runs in a separate
+        thread pool (see :class:`CallbackPool`), so it doesn't delay the checks. Once all keys are done, the
+        function returns when all callbacks finished, the timeout only applies to the checks.
+    :param cancel: An event to stop waiting from another thread, raises a WaitCancelledException when set
+    :param on_done_workers: The amount of `on_done` callbacks that run at once
+    :return: The final values by key, in the order they finished
+    """
+    backoff = backoff or Backoff()
+    deadline = monotonic() + timeout if timeout is not None else None
+    sequence = count()
+    now = monotonic()
+    # (due time, sequence, key, attempt), the sequence keeps the heap from comparing keys
+    schedule = [(now, next(sequence), key, 0) for key in keys]
+    heapq.heapify(schedule)
+
+    results: Dict[K, T] = {}
+    next_cycle = now
+    with ThreadPoolExecutor(workers) as pool, CallbackPool(on_done_workers) as callbacks:
+        while schedule:
+            callbacks.check()
+            now = monotonic()
+            if deadline is not None and now >= deadline:
+                raise WaitTimeoutException(f"{len(schedule)} of {len(schedule) + len(results)} "
+                                           f"not finished after {timeout}s")
+            wake_up = max(schedule[0][0], next_cycle)
+            if wake_up > now:
+                _sleep((wake_up if deadline is None else min(wake_up, deadline)) - now, cancel)
+                continue
+
+            due = []
+            while schedule and schedule[0][0] <= now and \
+                    (max_requests_per_cycle is None or len(due) < max_requests_per_cycle):
+                due.append(heapq.heappop(schedule))
+            if schedule and schedule[0][0] <= now:
+                # Out of budget for this cycle
+                next_cycle = now + backoff.initial
+
+            futures = {pool.submit(func, key): (key, attempt) for _, _, key, attempt in due}
+            for future in as_completed(futures):
+                key, attempt = futures[future]
+                try:
+                    value = future.result()
+                except IcometrixHttpException as e:
+                    if e.status_code not in RETRY_STATUS_CODES:
+                        raise
+                    logger.warning(f"Status check of {key} failed ({e.status_code}), retrying")
+                else:
+                    if condition(value):
+                        results[key] = value
+                        if on_done is not None:
+                            callbacks.submit(on_done, key, value)
+                        continue
+                heapq.heappush(schedule, (monotonic() + backoff.delay(attempt), next(sequence), key, attempt + 1))
+        callbacks.join()
+    return results